@@ -0,0 +1,58 @@
+"""Benchmark help lookups in an artifact for CLIs with an increasing number of commands.
+
+The lookup time should not depend on the number of commands. Opening the artifact
+only maps the file, so it should not depend on the size of the artifact either.
+"""
+
+import argparse
+import tempfile
+from pathlib import Path
+
+from bench_utils import report, sentence, time_call
+
+from sphinx_click.rst_to_ansi_formatter.artifact import (
+    ARTIFACT_WIDTHS,
+    HelpArtifact,
+    artifact_key,
+    write_help_artifact,
+)
+
+
+def make_entries(n_commands: int) -> dict[str, str]:
+    # Help text of a realistic size for each command, width and color mode
+    entries = {}
+    for i in range(n_commands):
+        help_text = f"Help for command {i}. {sentence(60, i)}"
+        for width in ARTIFACT_WIDTHS:
+            for monochrome in (False, True):
+                key = artifact_key(f"cli cmd{i}", width, monochrome, help_text)
+                entries[key] = help_text
+    return entries
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for n_commands in (10, 1000, 10000):
+            path = Path(tmp_dir) / f"help-{n_commands}.bin"
+            write_help_artifact(path, make_entries(n_commands))
+            size_mb = path.stat().st_size / 1e6
+            seconds = time_call(lambda: HelpArtifact(path), args.number, args.repeat)
+            report(f"open {n_commands} commands ({size_mb:.0f} MB)", seconds)
+            help_artifact = HelpArtifact(path)
+            help_text = f"Help for command {n_commands // 2}. "
+            help_text += sentence(60, n_commands // 2)
+            key = artifact_key(f"cli cmd{n_commands // 2}", 80, True, help_text)
+            assert help_artifact.lookup(key) == help_text
+            seconds = time_call(
+                lambda: help_artifact.lookup(key), args.number, args.repeat
+            )
+            report(f"lookup {n_commands} commands", seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""Benchmark the colored and the monochrome conversion paths."""
+
+import argparse
+
+from bench_utils import list_heavy_docstring, report, time_call
+
+from sphinx_click.rst_to_ansi_formatter.formatter import RstToAnsiConverter
+from sphinx_click.rst_to_ansi_formatter.textutils import ansiwrap_fill, plain_fill
+
+BASE_URL = "https://example.github.io/example/main/"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for n_lists, n_items in ((1, 10), (10, 100)):
+        docstring = list_heavy_docstring(n_lists, n_items)
+        for monochrome in (False, True):
+            mode = "monochrome" if monochrome else "colored"
+            converter = RstToAnsiConverter(docstring, BASE_URL, monochrome=monochrome)
+            doctree = converter.parse()
+            seconds = time_call(converter.convert, args.number, args.repeat)
+            report(f"convert {n_lists}x{n_items} {mode}", seconds)
+            seconds = time_call(
+                lambda: converter.render(doctree), args.number, args.repeat
+            )
+            report(f"render {n_lists}x{n_items} {mode}", seconds)
+
+    text = list_heavy_docstring(1, 50).replace("\n", " ")
+    for fill in (ansiwrap_fill, plain_fill):
+        seconds = time_call(lambda: fill(text, width=78), args.number, args.repeat)
+        report(f"{fill.__name__} {len(text)} chars", seconds)
+
+
+if __name__ == "__main__":
+    main()
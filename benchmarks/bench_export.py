@@ -0,0 +1,64 @@
+"""Benchmark exporting the help of a CLI to man pages and text files.
+
+Compares the export with one parse per help text to converting each format
+separately, and the export with several worker processes.
+"""
+
+import argparse
+import tempfile
+import typing
+from pathlib import Path
+
+import click
+from bench_utils import list_heavy_docstring, report, time_call
+
+from sphinx_click.rst_to_ansi_formatter import make_rst_to_ansi_formatter
+from sphinx_click.rst_to_ansi_formatter.export import export, render_man_page
+from sphinx_click.rst_to_ansi_formatter.formatter import FormatHelpMixin
+
+BASE_URL = "https://example.github.io/example/main/"
+
+
+def make_cli(n_commands: int) -> click.Group:
+    group_cls = make_rst_to_ansi_formatter(BASE_URL, group=True)
+    command_cls = make_rst_to_ansi_formatter(BASE_URL)
+    cli = group_cls(name="cli", help=list_heavy_docstring(2, 5))
+    for i in range(n_commands):
+        cli.add_command(command_cls(name=f"cmd{i}", help=list_heavy_docstring(2, 5)))
+    return typing.cast(click.Group, cli)
+
+
+def parse_per_format(cli: click.Group, directory: Path) -> None:
+    # Each format parses the help text again
+    for name, cmd in cli.commands.items():
+        mixin = typing.cast(FormatHelpMixin, cmd)
+        help_text = typing.cast(str, mixin.get_help_source())
+        ctx = click.Context(cmd, info_name=f"cli {name}")
+        doctree = mixin.make_converter(help_text, False, 80).parse()
+        page = render_man_page(ctx, f"cli {name}", mixin, doctree)
+        (directory / f"{name}.1").write_text(page)
+        for monochrome, suffix in ((True, ".txt"), (False, ".ansi")):
+            text = mixin.convert_help(help_text, monochrome, 80)
+            (directory / f"{name}{suffix}").write_text(text)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--commands", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    cli = make_cli(args.commands)
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        seconds = time_call(lambda: parse_per_format(cli, directory), 1, args.repeat)
+        report(f"{args.commands} commands, parse per format", seconds)
+        for workers in (1, 4):
+            seconds = time_call(
+                lambda: export(cli, directory, workers=workers), 1, args.repeat
+            )
+            report(f"{args.commands} commands, export, {workers} workers", seconds)
+
+
+if __name__ == "__main__":
+    main()
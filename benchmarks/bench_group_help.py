@@ -0,0 +1,56 @@
+"""Benchmark converting the help text of every command of a large group.
+
+The help texts are short, so the time per command is mostly the setup of a
+conversion, i.e. the colors, the docutils settings and the document of the visitor.
+Each command is created with its own call to ``make_rst_to_ansi_formatter()``, like in
+a CLI where the commands are defined in separate modules.
+"""
+
+import argparse
+import typing
+
+import click
+from bench_utils import report, sentence, time_call
+
+from sphinx_click.rst_to_ansi_formatter import make_rst_to_ansi_formatter
+from sphinx_click.rst_to_ansi_formatter.formatter import FormatHelpMixin
+
+BASE_URL = "https://example.github.io/example/main/"
+
+
+def make_cli(n_commands: int) -> click.Group:
+    group_cls = make_rst_to_ansi_formatter(BASE_URL, group=True)
+    cli = group_cls(name="cli", help="The *main* command.")
+    for i in range(n_commands):
+        command_cls = make_rst_to_ansi_formatter(BASE_URL)
+        cli.add_command(command_cls(name=f"cmd{i}", help=f"{sentence(12, i)}."))
+    return typing.cast(click.Group, cli)
+
+
+def convert_all(commands: list[FormatHelpMixin], monochrome: bool) -> None:
+    for cmd in commands:
+        cmd.convert_help(typing.cast(str, cmd.get_help_source()), monochrome, 80)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--commands", type=int, default=300)
+    parser.add_argument("--number", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    cli = make_cli(args.commands)
+    commands = typing.cast(list[FormatHelpMixin], list(cli.commands.values()))
+    for monochrome in (False, True):
+        label = "monochrome" if monochrome else "colored"
+        seconds = time_call(
+            lambda: convert_all(commands, monochrome), args.number, args.repeat
+        )
+        report(f"{args.commands} commands, {label}", seconds)
+        report(
+            f"{args.commands} commands, {label}, per command", seconds / len(commands)
+        )
+
+
+if __name__ == "__main__":
+    main()
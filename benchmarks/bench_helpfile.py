@@ -0,0 +1,70 @@
+"""Benchmark help text read from .rst files.
+
+Compares creating a CLI that reads every help file at import time with one that uses
+``help_file``, and the ``--help`` of a command with and without a cached conversion.
+"""
+
+import argparse
+import tempfile
+import time
+import typing
+from pathlib import Path
+
+import click
+from bench_utils import list_heavy_docstring, report
+
+import sphinx_click.rst_to_ansi_formatter.cache as cache
+from sphinx_click.rst_to_ansi_formatter import make_rst_to_ansi_formatter
+
+BASE_URL = "https://example.github.io/example/main/"
+
+
+def make_cli(help_dir: Path, n_commands: int, lazy: bool) -> click.Group:
+    group_cls = make_rst_to_ansi_formatter(BASE_URL, group=True, cache_dir=help_dir)
+    cli = group_cls(name="cli", help="The main command.")
+    for i in range(n_commands):
+        path = help_dir / f"cmd{i}.rst"
+        if lazy:
+            command_cls = make_rst_to_ansi_formatter(
+                BASE_URL, cache_dir=help_dir, help_file=path
+            )
+            cli.add_command(command_cls(name=f"cmd{i}"))
+        else:
+            command_cls = make_rst_to_ansi_formatter(BASE_URL, cache_dir=help_dir)
+            help_text = path.read_text(encoding="utf-8")
+            cli.add_command(command_cls(name=f"cmd{i}", help=help_text))
+    return typing.cast(click.Group, cli)
+
+
+def show_help(cli: click.Group) -> float:
+    start = time.perf_counter()
+    with click.Context(cli, info_name="cli", color=False) as ctx:
+        sub_cmd = cli.commands["cmd0"]
+        with click.Context(sub_cmd, info_name="cmd0", parent=ctx) as sub_ctx:
+            sub_cmd.get_help(sub_ctx)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--commands", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        help_dir = Path(tmp_dir)
+        for i in range(args.commands):
+            (help_dir / f"cmd{i}.rst").write_text(list_heavy_docstring(2, 5))
+        for lazy in (False, True):
+            start = time.perf_counter()
+            make_cli(help_dir, args.commands, lazy)
+            label = "help_file" if lazy else "read at import"
+            report(f"create CLI, {label}", time.perf_counter() - start)
+        cache._caches.clear()
+        report("--help, help_file, not cached", show_help(make_cli(help_dir, 1, True)))
+        # Like a new process, only the on-disk cache is available
+        cache._caches.clear()
+        report("--help, help_file, cached", show_help(make_cli(help_dir, 1, True)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Benchmark the cold and warm cost of syntax highlighting literal blocks."""
+
+import argparse
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from bench_utils import report, time_call
+
+from sphinx_click.rst_to_ansi_formatter.cache import HelpCache
+from sphinx_click.rst_to_ansi_formatter.formatter import RstToAnsiConverter
+from sphinx_click.rst_to_ansi_formatter.highlight import Highlighter
+
+BASE_URL = "https://example.github.io/example/main/"
+CODE = "\n".join(
+    f"def function_{i}(x):\n    return [y * {i} for y in range(x)]" for i in range(20)
+)
+DOCSTRING = (
+    "Example code:\n\n.. code-block:: python\n\n"
+    + "\n".join("    " + line for line in CODE.splitlines())
+    + "\n"
+)
+
+
+def first_call() -> None:
+    # Run in a fresh process: measures the cost of the first highlighted block
+    # including the import of Pygments
+    with tempfile.TemporaryDirectory() as cache_dir:
+        start = time.perf_counter()
+        Highlighter("dark", HelpCache(Path(cache_dir))).highlight(CODE, "python")
+        print(time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--first-call", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.first_call:
+        first_call()
+        return
+
+    output = subprocess.run(
+        [sys.executable, __file__, "--first-call"],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    report("cold: first call in a new process", float(output))
+
+    def cold() -> None:
+        Highlighter("dark", HelpCache(None)).highlight(CODE, "python")
+
+    report("cold: highlight (Pygments imported)", time_call(cold, 5, args.repeat))
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        highlighter = Highlighter("dark", HelpCache(Path(cache_dir)))
+        highlighter.highlight(CODE, "python")
+        seconds = time_call(
+            lambda: highlighter.highlight(CODE, "python"), args.number, args.repeat
+        )
+        report("warm: memory cache", seconds)
+
+        def disk() -> None:
+            Highlighter("dark", HelpCache(Path(cache_dir))).highlight(CODE, "python")
+
+        report("warm: disk cache", time_call(disk, args.number, args.repeat))
+
+        for highlight in (False, True):
+            converter = RstToAnsiConverter(
+                DOCSTRING, BASE_URL, highlight=highlight, cache_dir=cache_dir
+            )
+            seconds = time_call(converter.convert, args.number, args.repeat)
+            report(f"convert, highlight={highlight} (warm)", seconds)
+
+
+if __name__ == "__main__":
+    main()
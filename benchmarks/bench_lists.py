@@ -0,0 +1,73 @@
+"""Benchmark RstToAnsiConverter.convert() on list-heavy docstrings.
+
+The render time of the current visitor (B) is compared with the visitor that collected
+its output in a stack of io.StringIO buffers (A), see buffer_stack_visitor.py.
+"""
+
+import argparse
+
+import docutils.nodes
+import docutils.utils
+from bench_utils import list_heavy_docstring, nested_list_docstring, report, time_call
+from buffer_stack_visitor import BufferStackVisitor
+
+from sphinx_click.rst_to_ansi_formatter.formatter import (
+    QUIET_REPORT_LEVEL,
+    RstToAnsiConverter,
+    parser_settings,
+)
+
+BASE_URL = "https://example.github.io/example/main/"
+# Both visitors wrap the text for this terminal width
+WIDTH = 80
+
+
+def render_buffer_stack(
+    converter: RstToAnsiConverter, doctree: docutils.nodes.document
+) -> str:
+    # Like RstToAnsiConverter.render(), with the visitor from before the flat part list
+    visitor = BufferStackVisitor(
+        docutils.utils.new_document("<string>", parser_settings(QUIET_REPORT_LEVEL)),
+        converter.colors,
+        # click's format_help() adds 2 extra spaces at the beginning of each line
+        WIDTH - 2,
+    )
+    doctree.walkabout(visitor)
+    visitor.finalize()
+    return visitor.astext()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for n_lists, n_items in ((1, 10), (10, 10), (10, 100), (50, 100)):
+        docstring = list_heavy_docstring(n_lists, n_items)
+        converter = RstToAnsiConverter(docstring, BASE_URL, width=WIDTH)
+        seconds = time_call(converter.convert, args.number, args.repeat)
+        report(f"convert {n_lists} lists x {n_items} items", seconds)
+        # Time the visitor alone, without the docutils parse
+        doctree = converter.parse()
+        seconds = time_call(
+            lambda: render_buffer_stack(converter, doctree), args.number, args.repeat
+        )
+        report(f"render {n_lists} lists x {n_items} items (A)", seconds)
+        seconds = time_call(lambda: converter.render(doctree), args.number, args.repeat)
+        report(f"render {n_lists} lists x {n_items} items (B)", seconds)
+
+    # The render time per item should not grow with the nesting depth
+    for depth in (5, 20, 40):
+        n_items = 5
+        converter = RstToAnsiConverter(nested_list_docstring(depth, n_items), BASE_URL)
+        doctree = converter.parse()
+        seconds = time_call(lambda: converter.render(doctree), args.number, args.repeat)
+        report(f"render depth {depth} nested lists", seconds)
+        report(
+            f"render depth {depth} nested lists, per item", seconds / (depth * n_items)
+        )
+
+
+if __name__ == "__main__":
+    main()
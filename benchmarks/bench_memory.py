@@ -0,0 +1,163 @@
+"""Benchmark the memory use of each stage of the conversion with tracemalloc.
+
+For generated docstrings from 1 KB up to 1 MB (10 MB with ``--full``), reports per
+stage the peak memory, and the memory and number of memory blocks that are still
+allocated when the stage has finished, i.e. the size of its result:
+
+* dedent: RstToAnsiConverter(), which dedents the docstring
+* preprocess: preprocess_docstring(), which resolves the Sphinx roles
+* doctree: parse_preprocessed(), which parses the preprocessed docstring into the
+  docutils document tree
+* visitor: rendering the document tree, including the wrapping of the text
+* wrap: the ansiwrap_fill() calls of the visitor on their own
+
+The run fails with exit status 1 if the peak memory of a stage per byte of docstring
+exceeds the limit in PEAK_LIMITS, for docstrings of at least 100 KB. Smaller
+docstrings are not checked, their peak memory is mostly fixed overhead.
+"""
+
+import argparse
+import gc
+import sys
+import tracemalloc
+from typing import Any, Callable
+
+from bench_utils import list_heavy_docstring
+
+from sphinx_click.rst_to_ansi_formatter import textutils
+from sphinx_click.rst_to_ansi_formatter.formatter import RstToAnsiConverter
+
+BASE_URL = "https://example.github.io/example/main/"
+
+SIZES = (1_000, 10_000, 100_000, 1_000_000)
+FULL_SIZES = (*SIZES, 10_000_000)
+# Only docstrings of at least this size are checked against PEAK_LIMITS
+CHECKED_SIZE = 100_000
+# The maximum peak memory of each stage, in bytes per byte of docstring. The measured
+# values are at most about half of these
+PEAK_LIMITS = {
+    "dedent": 5.0,
+    "preprocess": 5.0,
+    "doctree": 55.0,
+    "visitor": 15.0,
+    "wrap": 5.0,
+}
+
+
+def make_docstring(size: int) -> str:
+    # A list-heavy docstring with Sphinx roles, repeated until it is at least size
+    # characters long, and cut at the end of a line
+    part = list_heavy_docstring(4, 5) + "\nSee :doc:`usage` and :doc:`api/index`.\n\n"
+    docstring = part * (size // len(part) + 1)
+    return docstring[: docstring.index("\n", size)]
+
+
+def blocks() -> int:
+    # The number of allocated memory blocks
+    snapshot = tracemalloc.take_snapshot()
+    return sum(stat.count for stat in snapshot.statistics("filename"))
+
+
+def measure(func: Callable[[], Any]) -> tuple[Any, int, int, int]:
+    """Call func, return its result, the peak and retained bytes and blocks."""
+    gc.collect()
+    blocks_before = blocks()
+    current_before, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    result = func()
+    current_after, peak = tracemalloc.get_traced_memory()
+    gc.collect()
+    return (
+        result,
+        peak - current_before,
+        current_after - current_before,
+        blocks() - blocks_before,
+    )
+
+
+def recorded_fill_calls(converter: RstToAnsiConverter, doctree: Any) -> list[Any]:
+    # The arguments of the ansiwrap_fill() calls of the visitor
+    calls = []
+    fill = textutils.ansiwrap_fill
+
+    def recording_fill(*args: Any, **kwargs: Any) -> str:
+        calls.append((args, kwargs))
+        return fill(*args, **kwargs)
+
+    textutils.ansiwrap_fill = recording_fill
+    try:
+        converter.render(doctree)
+    finally:
+        textutils.ansiwrap_fill = fill
+    return calls
+
+
+def measure_stages(docstring: str) -> dict[str, tuple[int, int, int]]:
+    results = {}
+    converter, *results["dedent"] = measure(
+        lambda: RstToAnsiConverter(docstring, BASE_URL, width=80)
+    )
+    preprocessed, *results["preprocess"] = measure(converter.preprocess_docstring)
+    # RstToAnsiConverter.parse() without the preprocessing measured above
+    doctree, *results["doctree"] = measure(
+        lambda: converter.parse_preprocessed(preprocessed)
+    )
+    _, *results["visitor"] = measure(lambda: converter.render(doctree))
+    calls = recorded_fill_calls(converter, doctree)
+    _, *results["wrap"] = measure(
+        lambda: [textutils.ansiwrap_fill(*args, **kwargs) for args, kwargs in calls]
+    )
+    return {
+        stage: (peak, size, count) for stage, (peak, size, count) in results.items()
+    }
+
+
+def format_bytes(n: int) -> str:
+    for unit in ("B", "KB", "MB"):
+        if abs(n) < 1024:
+            return f"{n:.0f} {unit}"
+        n //= 1024
+    return f"{n:.0f} GB"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--full", action="store_true", help="also measure 10 MB")
+    parser.add_argument(
+        "--limit-scale",
+        type=float,
+        default=1.0,
+        help="multiply the limits in PEAK_LIMITS by this factor",
+    )
+    args = parser.parse_args()
+
+    tracemalloc.start()
+    failures = []
+    print(
+        f"{'size':>8} {'stage':<11}{'peak':>10}{'peak/byte':>11}"
+        f"{'retained':>10}{'blocks':>10}"
+    )
+    for size in FULL_SIZES if args.full else SIZES:
+        docstring = make_docstring(size)
+        for stage, (peak, retained, count) in measure_stages(docstring).items():
+            ratio = peak / len(docstring)
+            print(
+                f"{format_bytes(len(docstring)):>8} {stage:<11}"
+                f"{format_bytes(peak):>10}{ratio:>11.2f}"
+                f"{format_bytes(retained):>10}{count:>10}"
+            )
+            limit = PEAK_LIMITS[stage] * args.limit_scale
+            if len(docstring) >= CHECKED_SIZE and ratio > limit:
+                failures.append(
+                    f"{stage}: {ratio:.2f} bytes per byte of a "
+                    f"{format_bytes(len(docstring))} docstring, limit {limit:.2f}"
+                )
+    tracemalloc.stop()
+    for failure in failures:
+        print(f"Peak memory limit exceeded, {failure}", file=sys.stderr)
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Benchmark building, loading and querying the help search index."""
+
+import argparse
+import tempfile
+import time
+import typing
+
+import click
+from bench_utils import report, sentence, time_call
+
+import sphinx_click.rst_to_ansi_formatter.cache as cache
+from sphinx_click.rst_to_ansi_formatter import make_rst_to_ansi_formatter
+from sphinx_click.rst_to_ansi_formatter.search import get_search_index
+
+BASE_URL = "https://example.github.io/example/main/"
+
+
+def make_cli(n_commands: int, cache_dir: str) -> click.Group:
+    group_cls = make_rst_to_ansi_formatter(
+        BASE_URL, group=True, cache_dir=cache_dir, help_search=True
+    )
+    command_cls = make_rst_to_ansi_formatter(BASE_URL, cache_dir=cache_dir)
+    cli = group_cls(name="cli", help="The main command.")
+    for i in range(n_commands):
+        help_text = (
+            f"Command {i} does {sentence(40, i)}.\n\n"
+            f"EXAMPLES\n========\n\nRun ``cli cmd{i}`` with {sentence(20, i + 3)}.\n"
+        )
+        cli.add_command(command_cls(name=f"cmd{i}", help=help_text))
+    return typing.cast(click.Group, cli)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--commands", type=int, default=300)
+    parser.add_argument("--number", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cli = make_cli(args.commands, cache_dir)
+        start = time.perf_counter()
+        get_search_index(cli)
+        report(f"build index, {args.commands} commands", time.perf_counter() - start)
+
+        def load() -> None:
+            # Like a new process, the index is read from the cache directory
+            cache._caches.clear()
+            get_search_index(cli)
+
+        report("load index from cache", time_call(load, 1, args.repeat))
+        index = get_search_index(cli)
+        for query in ("lorem", "tempor incididunt", "cmd150"):
+            seconds = time_call(lambda: index.search(query), args.number, args.repeat)
+            report(f"query {query!r}", seconds)
+
+
+if __name__ == "__main__":
+    main()
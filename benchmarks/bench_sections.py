@@ -0,0 +1,54 @@
+"""Benchmark converting a single section against converting the whole help text.
+
+The cost of converting a section should depend on the size of the section, not on the
+number of sections in the help text.
+"""
+
+import argparse
+
+from bench_utils import report, sentence, time_call
+
+from sphinx_click.rst_to_ansi_formatter.formatter import RstToAnsiConverter
+from sphinx_click.rst_to_ansi_formatter.sections import find_section
+
+BASE_URL = "https://example.github.io/example/main/"
+
+
+def sectioned_docstring(n_sections: int) -> str:
+    parts = ["Generated ``sectioned`` docstring.\n"]
+    for i in range(n_sections):
+        title = f"SECTION {i}"
+        parts.append(f"{title}\n{'=' * len(title)}\n")
+        for j in range(3):
+            parts.append(f"Paragraph {j} with *emphasis* and {sentence(40, i + j)}.\n")
+        parts.append("Example::\n\n    $ command --option\n")
+    return "\n".join(parts)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    for n_sections in (10, 100, 500):
+        docstring = sectioned_docstring(n_sections)
+        seconds = time_call(
+            lambda: RstToAnsiConverter(docstring, BASE_URL).convert(),
+            args.number,
+            args.repeat,
+        )
+        report(f"whole help, {n_sections} sections", seconds)
+        name = f"section {n_sections // 2}"
+        seconds = time_call(
+            lambda: RstToAnsiConverter(
+                find_section(docstring, name) or "", BASE_URL
+            ).convert(),
+            args.number,
+            args.repeat,
+        )
+        report(f"one section, {n_sections} sections", seconds)
+
+
+if __name__ == "__main__":
+    main()
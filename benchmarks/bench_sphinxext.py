@@ -0,0 +1,84 @@
+"""Benchmark Sphinx builds that show the help text of many commands.
+
+Measures a full build, a rebuild without changes, and a rebuild after the help text
+of one command has changed.
+"""
+
+import argparse
+import io
+import sys
+import tempfile
+import time
+import typing
+from pathlib import Path
+
+import click
+from bench_utils import list_heavy_docstring, report
+from sphinx.application import Sphinx
+from sphinx.util.docutils import docutils_namespace
+
+from sphinx_click.rst_to_ansi_formatter import make_rst_to_ansi_formatter
+
+BASE_URL = "https://example.github.io/example/main/"
+
+# The CLI shown by the documents, see make_cli()
+cli: click.Group
+
+
+def make_cli(n_commands: int) -> click.Group:
+    group_cls = make_rst_to_ansi_formatter(BASE_URL, group=True)
+    command_cls = make_rst_to_ansi_formatter(BASE_URL)
+    group = group_cls(name="cli", help=list_heavy_docstring(2, 5))
+    for i in range(n_commands):
+        group.add_command(command_cls(name=f"cmd{i}", help=list_heavy_docstring(2, 5)))
+    return typing.cast(click.Group, group)
+
+
+def build(src: Path, parallel: int) -> float:
+    start = time.perf_counter()
+    with docutils_namespace():
+        app = Sphinx(
+            str(src),
+            str(src),
+            str(src / "_build" / "text"),
+            str(src / "_build" / "doctrees"),
+            "text",
+            status=None,
+            warning=io.StringIO(),
+            parallel=parallel,
+        )
+        app.build()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    global cli
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--commands", type=int, default=50)
+    parser.add_argument("--docs", type=int, default=10)
+    parser.add_argument("-j", "--parallel", type=int, default=1)
+    args = parser.parse_args()
+
+    cli = make_cli(args.commands)
+    # The directive imports the CLI from this module
+    sys.modules["bench_sphinxext"] = sys.modules[__name__]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        src = Path(tmp_dir)
+        (src / "conf.py").write_text(
+            'extensions = ["sphinx_click.rst_to_ansi_formatter.sphinxext"]\n'
+        )
+        for i in range(args.docs):
+            (src / f"doc{i}.rst").write_text(
+                f":orphan:\n\nDoc {i}\n======\n\n"
+                ".. click-help-preview:: bench_sphinxext:cli\n   :nested:\n"
+            )
+        (src / "index.rst").write_text("Index\n=====\n")
+        n_previews = args.docs * (args.commands + 1)
+        report(f"full build, {n_previews} previews", build(src, args.parallel))
+        report("rebuild, no changes", build(src, args.parallel))
+        cli.commands["cmd0"].help = "Changed help text."
+        report("rebuild, one help text changed", build(src, args.parallel))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""Benchmark the rendering of tables with an increasing number of rows.
+
+The render time per row should stay roughly constant, i.e. scale linearly.
+"""
+
+import argparse
+
+from bench_utils import report, sentence, time_call
+
+from sphinx_click.rst_to_ansi_formatter.formatter import RstToAnsiConverter
+
+BASE_URL = "https://example.github.io/example/main/"
+
+
+def table_docstring(n_rows: int) -> str:
+    border = "========  ========  " + "=" * 60
+    lines = ["A table:", "", border, "Name      Type      Description", border]
+    for i in range(n_rows):
+        name = f"opt{i}"
+        lines.append(f"{name:<8}  ``int``   {sentence(10 + i % 7, i)}")
+    lines.append(border)
+    return "\n".join(lines) + "\n"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    for n_rows in (100, 1000, 5000):
+        converter = RstToAnsiConverter(table_docstring(n_rows), BASE_URL)
+        doctree = converter.parse()
+        seconds = time_call(lambda: converter.render(doctree), args.number, args.repeat)
+        report(f"render {n_rows} rows", seconds)
+        report(f"render {n_rows} rows, per row", seconds / n_rows)
+
+
+if __name__ == "__main__":
+    main()
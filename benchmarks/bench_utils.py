@@ -0,0 +1,57 @@
+"""Helpers shared by the benchmark scripts in this directory.
+
+The benchmarks are plain scripts, run them from the repository root, e.g.::
+
+    python benchmarks/bench_lists.py
+"""
+
+import statistics
+import timeit
+from typing import Callable
+
+WORDS = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod "
+    "tempor incididunt ut labore et dolore magna aliqua"
+).split()
+
+
+def sentence(n_words: int, offset: int = 0) -> str:
+    return " ".join(WORDS[(offset + i) % len(WORDS)] for i in range(n_words))
+
+
+def list_heavy_docstring(n_lists: int, n_items: int) -> str:
+    """Generate a docstring with ``n_lists`` bullet lists of ``n_items`` items each."""
+    parts = ["Generated ``list-heavy`` docstring.\n"]
+    for i in range(n_lists):
+        parts.append(f"Paragraph {i} with *emphasis* and {sentence(30, i)}.\n")
+        for j in range(n_items):
+            parts.append(f"* Item {j} uses ``code`` and {sentence(25, j)}.")
+        parts.append("")
+    return "\n".join(parts)
+
+
+def nested_list_docstring(depth: int, n_items: int) -> str:
+    """Generate a docstring with bullet and enumerated lists nested ``depth`` levels.
+
+    Each level has ``n_items`` items, the last item contains the next level.
+    """
+    lines = ["Generated ``nested-list`` docstring.", ""]
+    for level in range(depth):
+        indent = " " * (3 * level)
+        marker = "*" if level % 2 == 0 else "#."
+        for i in range(n_items):
+            lines.append(
+                f"{indent}{marker:<2} Item {i} on level {level}, {sentence(12, i)}."
+            )
+            lines.append("")
+    return "\n".join(lines)
+
+
+def time_call(func: Callable[[], object], number: int, repeat: int) -> float:
+    """Return the median time in seconds of a single call to ``func``."""
+    timings = timeit.repeat(func, number=number, repeat=repeat)
+    return statistics.median(timings) / number
+
+
+def report(label: str, seconds: float) -> None:
+    print(f"{label:<40} {seconds * 1000:10.3f} ms")
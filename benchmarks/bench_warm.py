@@ -0,0 +1,57 @@
+"""Benchmark the first ``--help`` of a command, with and without warm().
+
+Each measurement uses a new CLI, such that nothing is cached from a previous run.
+"""
+
+import argparse
+import time
+import typing
+
+import click
+from bench_utils import list_heavy_docstring, report
+
+from sphinx_click.rst_to_ansi_formatter import make_rst_to_ansi_formatter
+from sphinx_click.rst_to_ansi_formatter.warm import warm
+
+BASE_URL = "https://example.github.io/example/main/"
+
+
+def make_cli(n_commands: int) -> click.Group:
+    group_cls = make_rst_to_ansi_formatter(BASE_URL, group=True)
+    command_cls = make_rst_to_ansi_formatter(BASE_URL)
+    cli = group_cls(name="cli", help=list_heavy_docstring(2, 5))
+    for i in range(n_commands):
+        cli.add_command(command_cls(name=f"cmd{i}", help=list_heavy_docstring(2, 5)))
+    return typing.cast(click.Group, cli)
+
+
+def first_help(cli: click.Group) -> float:
+    start = time.perf_counter()
+    with click.Context(cli, info_name="cli", color=False) as ctx:
+        sub_cmd = cli.commands["cmd0"]
+        with click.Context(sub_cmd, info_name="cmd0", parent=ctx) as sub_ctx:
+            sub_cmd.get_help(sub_ctx)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--commands", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    cold = min(first_help(make_cli(args.commands)) for _ in range(args.repeat))
+    report("first --help, cold", cold)
+    warmed = []
+    for _ in range(args.repeat):
+        cli = make_cli(args.commands)
+        start = time.perf_counter()
+        warm(cli, widths=(80,), monochrome=(True,), background=False)
+        warm_seconds = time.perf_counter() - start
+        warmed.append(first_help(cli))
+    report(f"warm() of {args.commands + 1} commands", warm_seconds)
+    report("first --help, after warm()", min(warmed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Benchmark the help text cache for changing terminal widths.
+
+Simulates ``--help`` requests from terminals with different widths, e.g. from users
+with different window sizes, or one user resizing a window. The help text is cached
+per (help text, colors, width), so each new width is a cache miss. Compares the hit
+rate for exact widths to the hit rate with width buckets, see terminal.help_width().
+"""
+
+import argparse
+import random
+import shutil
+
+from bench_utils import list_heavy_docstring, report, time_call
+
+from sphinx_click.rst_to_ansi_formatter.formatter import RstToAnsiConverter
+from sphinx_click.rst_to_ansi_formatter.terminal import terminal_width
+from sphinx_click.rst_to_ansi_formatter.textutils import width_bucket
+
+BASE_URL = "https://example.github.io/example/main/"
+
+
+def random_widths(n: int, low: int, high: int, seed: int) -> list[int]:
+    # A random walk, like a window that is resized a few columns at a time, with some
+    # jumps, like a request from another terminal
+    rng = random.Random(seed)
+    widths = [rng.randint(low, high)]
+    for _ in range(n - 1):
+        if rng.random() < 0.1:
+            width = rng.randint(low, high)
+        else:
+            width = widths[-1] + rng.randint(-3, 3)
+        widths.append(min(high, max(low, width)))
+    return widths
+
+
+def hit_rate(keys: list[int]) -> float:
+    seen: set[int] = set()
+    hits = 0
+    for key in keys:
+        hits += key in seen
+        seen.add(key)
+    return hits / len(keys)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    for low, high in ((60, 100), (60, 200), (40, 300)):
+        widths = random_widths(args.requests, low, high, args.seed)
+        exact = hit_rate(widths)
+        bucketed = hit_rate([width_bucket(width) for width in widths])
+        print(
+            f"widths {low}-{high}: hit rate exact {exact:6.1%}, "
+            f"bucketed {bucketed:6.1%}"
+        )
+
+    converter = RstToAnsiConverter(list_heavy_docstring(2, 5), BASE_URL, width=80)
+    report("conversion, i.e. cost of a miss", time_call(converter.convert, 10, 3))
+    report(
+        "shutil.get_terminal_size()",
+        time_call(lambda: shutil.get_terminal_size(fallback=(80, 20)), 10000, 3),
+    )
+    report("terminal_width(), cached", time_call(terminal_width, 10000, 3))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""The PlainTextVisitor from before its output was collected in a flat part list.
+
+Each paragraph and list item was written to its own io.StringIO buffer, and the
+buffers were kept on a stack. bench_lists.py renders the same doctree with this
+visitor and with the current one, for an A/B comparison of the two ways to collect
+the output. Only the nodes of the generated list-heavy docstrings are supported.
+"""
+
+import io
+
+import docutils.nodes
+
+from sphinx_click.rst_to_ansi_formatter import textutils
+from sphinx_click.rst_to_ansi_formatter.colors import Colors
+
+
+class BufferStackVisitor(docutils.nodes.NodeVisitor):
+    CLICK_PARAGRAPH_NOWRAP_MARKER = "\b\n"
+
+    def __init__(
+        self, document: docutils.nodes.document, colors: Colors, wrap_width: int
+    ) -> None:
+        docutils.nodes.NodeVisitor.__init__(self, document)
+        # Main content buffer: Collect the modified docstring here
+        self.main_buffer: io.StringIO = io.StringIO()
+        self.urls: list[str] = []  # Store URLs to be listed at the end of the docstring
+        # Temporary buffer to store the current list item
+        self.current_list_item: io.StringIO = io.StringIO()
+        self.current_paragraph: io.StringIO = io.StringIO()
+        self.current_buffer: io.StringIO = (
+            self.main_buffer
+        )  # Initially points to the main buffer
+        self.buffer_stack: list[io.StringIO] = []  # Stack to store buffers
+        self.push_buffer_stack(self.main_buffer)
+        self.in_literal = (
+            False  # Flag to indicate if we're inside a literal block (quoted text)
+        )
+        self.in_bullet_list = False  # Flag to indicate if we're inside a bullet list
+        self.colors = colors
+        self.wrap_width = wrap_width
+
+    def astext(self) -> str:
+        return self.main_buffer.getvalue().strip()
+
+    def color_heading(self, txt: str) -> str:
+        return self.colors.color_heading(txt)
+
+    def color_url(self, txt: str) -> str:
+        return self.colors.color_url(txt)
+
+    def color_code(self, txt: str) -> str:
+        return self.colors.color_code(txt)
+
+    def depart_bullet_list(self, node: docutils.nodes.bullet_list) -> None:
+        self.in_bullet_list = False
+
+    def depart_list_item(self, node: docutils.nodes.list_item) -> None:
+        # Process the accumulated list item content now that we've traversed the whole item
+        text = "• " + self.current_list_item.getvalue()
+        # Replace newlines with spaces to avoid premature line breaks in the wrapped text
+        text = text.replace("\n", " ")
+        wrapped_text = textutils.ansiwrap_fill(
+            text, width=self.wrap_width, subsequent_indent="  "
+        )
+        parent_buffer = self.pop_buffer_stack()
+        parent_buffer.write(wrapped_text + "\n")
+        self.current_buffer = parent_buffer  # Switch back to using the parent buffer
+
+    def depart_literal(self, node: docutils.nodes.literal) -> None:
+        self.in_literal = False  # Exiting a literal block
+
+    def depart_paragraph(self, node: docutils.nodes.paragraph) -> None:
+        if not self.in_bullet_list:
+            text = self.current_paragraph.getvalue()
+            # Replace newlines with spaces to avoid premature line breaks in the wrapped text
+            text = text.replace("\n", " ")
+            wrapped_text = textutils.ansiwrap_fill(
+                text, width=self.wrap_width, subsequent_indent=""
+            )
+            parent_buffer = self.pop_buffer_stack()
+            parent_buffer.write(
+                "\n" + self.CLICK_PARAGRAPH_NOWRAP_MARKER + wrapped_text
+            )
+            self.current_buffer = (
+                parent_buffer  # Switch back to using the parent buffer
+            )
+
+    # At the end of processing, append all URLs:
+    def finalize(self) -> None:
+        if self.urls:
+            self.main_buffer.write(
+                "\n\n" + self.color_heading("Referenced URLs:") + "\n\n\b\n"
+            )
+            for index, url in enumerate(self.urls, start=1):
+                self.main_buffer.write(self.color_url(f"{index}.") + f" {url}\n")
+
+    def pop_buffer_stack(self) -> io.StringIO:
+        self.buffer_stack.pop()
+        return self.buffer_stack[-1]
+
+    def push_buffer_stack(self, buffer: io.StringIO) -> None:
+        self.buffer_stack.append(buffer)
+
+    def process_url(self, url: str) -> str:
+        if url not in self.urls:
+            self.urls.append(url)
+            idx = len(self.urls)
+        else:
+            idx = self.urls.index(url) + 1
+        # Replace the URL with a placeholder
+        replacement_txt = f"[{idx}]"
+        return replacement_txt
+
+    def visit_bullet_list(self, node: docutils.nodes.bullet_list) -> None:
+        # Prepend with backspace and a newline to ensure the list is not rewrapped by Click
+        # and to maintain the desired spacing
+        self.in_bullet_list = True
+        self.current_buffer.write("\n\n\b\n")
+
+    def visit_emphasis(self, node: docutils.nodes.emphasis) -> None:
+        txt = node.astext()
+        # check if the emphasis is a URL
+        if txt.startswith("http://") or txt.startswith("https://"):
+            # Check if the URL is already in the list
+            replacement_idx = self.process_url(txt)
+            txt = replacement_idx
+        # Prepend and append the emphasis with ANSI color codes
+        self.current_buffer.write(self.color_code(txt))
+        raise docutils.nodes.SkipNode
+
+    def visit_list_item(self, node: docutils.nodes.list_item) -> None:
+        self.current_list_item = io.StringIO()
+        self.current_buffer = (
+            self.current_list_item
+        )  # Switch to using the list item buffer
+        self.push_buffer_stack(self.current_list_item)
+
+    def visit_literal(self, node: docutils.nodes.literal) -> None:
+        self.in_literal = True  # Entering a literal block
+
+    def visit_paragraph(self, node: docutils.nodes.paragraph) -> None:
+        if not self.in_bullet_list:
+            self.current_paragraph = io.StringIO()
+            self.current_buffer = (
+                self.current_paragraph
+            )  # Switch to using the paragraph buffer
+            self.push_buffer_stack(self.current_paragraph)
+
+    def visit_Text(self, node: docutils.nodes.Text) -> None:
+        txt = node.astext()
+        if self.in_literal:
+            # Wrap the text in ANSI codes for bright cyan
+            self.current_buffer.write(self.color_code(txt))
+        else:
+            self.current_buffer.write(txt)
+
+    def unknown_visit(self, node: docutils.nodes.Node) -> None:
+        # This method is called for nodes for which no visit_ method exists.
+        pass
+
+    def unknown_departure(self, node: docutils.nodes.Node) -> None:
+        # This method is called for nodes for which no depart_ method exists.
+        pass
@@ -0,0 +1,234 @@
+"""Load test: the latency of showing the help of commands, under concurrent load.
+
+Drives ``format_help()`` of the commands of a synthetic CLI from several threads or
+processes, with cold and warm caches and for several terminal widths, and reports the
+p50, p95 and p99 latency, the throughput and the peak RSS of each scenario. Run it from
+the repository root, e.g.::
+
+    python benchmarks/loadtest.py --output loadtest.json
+    python benchmarks/loadtest.py --compare loadtest.json
+
+With ``--compare`` the results are compared with a previous run, and the script exits
+with status 1 if the p95 or p99 latency of a scenario got worse by more than the
+``--threshold`` factor.
+"""
+
+import argparse
+import json
+import multiprocessing
+import platform
+import resource
+import statistics
+import sys
+import tempfile
+import time
+import typing
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import click
+from bench_utils import list_heavy_docstring
+
+import sphinx_click.rst_to_ansi_formatter.cache as cache
+from sphinx_click.rst_to_ansi_formatter import make_rst_to_ansi_formatter
+from sphinx_click.rst_to_ansi_formatter.formatter import FormatHelpMixin
+from sphinx_click.rst_to_ansi_formatter.warm import warm
+
+BASE_URL = "https://example.github.io/example/main/"
+
+# The CLI used by the worker processes. It is created before the processes are forked
+_cli: click.Group | None = None
+
+
+def make_cli(n_commands: int, cache_dir: str) -> click.Group:
+    group_cls = make_rst_to_ansi_formatter(BASE_URL, group=True, cache_dir=cache_dir)
+    command_cls = make_rst_to_ansi_formatter(BASE_URL, cache_dir=cache_dir)
+    cli = group_cls(name="cli", help=list_heavy_docstring(1, 3))
+    for i in range(n_commands):
+        help_text = list_heavy_docstring(1 + i % 3, 3 + i % 5)
+        cli.add_command(command_cls(name=f"cmd{i}", help=help_text))
+    return typing.cast(click.Group, cli)
+
+
+def max_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux, and in bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def run_requests(
+    cli: click.Group, width: int, n_requests: int, offset: int, cold: bool
+) -> list[float]:
+    """Show the help of n_requests commands and return the latency of each.
+
+    If cold is True, the converted help text of each command is dropped before its
+    help is shown, such that requests that wrap around the commands are not warm.
+    """
+    commands = list(cli.commands.values())
+    latencies = []
+    for i in range(n_requests):
+        cmd = commands[(offset + i) % len(commands)]
+        if cold:
+            typing.cast(FormatHelpMixin, cmd).converted.clear()
+        start = time.perf_counter()
+        # The help is converted for the terminal width of the context, see
+        # terminal.help_width()
+        ctx = click.Context(cmd, info_name=cmd.name, color=False, terminal_width=width)
+        formatter = ctx.make_formatter()
+        cmd.format_help(ctx, formatter)
+        formatter.getvalue()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def process_worker(args: tuple[int, int, int, bool]) -> tuple[list[float], float]:
+    assert _cli is not None
+    return run_requests(_cli, *args), max_rss_mb()
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    idx = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[idx]
+
+
+def run_scenario(
+    mode: str, cache_state: str, width: int, workers: int, requests: int, commands: int
+) -> dict[str, Any]:
+    global _cli
+    with tempfile.TemporaryDirectory() as cache_dir:
+        # Cold: Nothing is cached in memory or on disk
+        cache._caches.clear()
+        cli = make_cli(commands, cache_dir)
+        if cache_state == "warm":
+            warm(cli, widths=(width,), monochrome=(True,), background=False)
+        # Each worker starts at a different command
+        cold = cache_state == "cold"
+        jobs = [(width, requests, k * requests, cold) for k in range(workers)]
+        start = time.perf_counter()
+        if mode == "thread":
+            with ThreadPoolExecutor(workers) as executor:
+                results = [
+                    (latencies, 0.0)
+                    for latencies in executor.map(
+                        lambda job: run_requests(cli, *job), jobs
+                    )
+                ]
+            rss = max_rss_mb()
+        else:
+            _cli = cli
+            with multiprocessing.get_context("fork").Pool(workers) as pool:
+                results = pool.map(process_worker, jobs)
+            _cli = None
+            rss = max(worker_rss for _, worker_rss in results)
+        elapsed = time.perf_counter() - start
+    latencies = sorted(value for worker, _ in results for value in worker)
+    return {
+        "mode": mode,
+        "cache": cache_state,
+        "width": width,
+        "workers": workers,
+        "requests": len(latencies),
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "mean_ms": statistics.fmean(latencies) * 1000,
+        "throughput_rps": len(latencies) / elapsed,
+        "max_rss_mb": rss,
+    }
+
+
+def run_isolated(*args: Any) -> dict[str, Any]:
+    """Run run_scenario() in a forked child process and return its results.
+
+    ru_maxrss is the peak RSS over the lifetime of a process, so each scenario runs in
+    a new process, such that its peak RSS is not one of an earlier scenario.
+    """
+    context = multiprocessing.get_context("fork")
+    queue = context.Queue()
+    child = context.Process(target=lambda: queue.put(run_scenario(*args)))
+    child.start()
+    result: dict[str, Any] = queue.get()
+    child.join()
+    return result
+
+
+def scenario_key(scenario: dict[str, Any]) -> tuple[Any, ...]:
+    return tuple(scenario[name] for name in ("mode", "cache", "width", "workers"))
+
+
+def compare(baseline: dict[str, Any], results: dict[str, Any], threshold: float) -> int:
+    """Print the change of each scenario, return the number of regressions."""
+    previous = {scenario_key(s): s for s in baseline["scenarios"]}
+    regressions = 0
+    for scenario in results["scenarios"]:
+        old = previous.get(scenario_key(scenario))
+        if old is None:
+            continue
+        ratios = {
+            name: scenario[name] / old[name]
+            for name in ("p50_ms", "p95_ms", "p99_ms", "throughput_rps")
+        }
+        regressed = max(ratios["p95_ms"], ratios["p99_ms"]) > threshold
+        regressions += regressed
+        label = "{} {} w={} x{}".format(*scenario_key(scenario))
+        changes = "  ".join(f"{name} x{ratio:.2f}" for name, ratio in ratios.items())
+        print(f"{label:<24} {changes}{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+
+def comma_separated(value: str) -> list[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--commands", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=200, help="per worker")
+    parser.add_argument("--workers", default="1,4", help="e.g. 1,4,8")
+    parser.add_argument("--modes", default="thread,process")
+    parser.add_argument("--caches", default="cold,warm")
+    parser.add_argument("--widths", default="60,80,120")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument(
+        "--compare", help="JSON file with the results of a previous run"
+    )
+    parser.add_argument("--threshold", type=float, default=1.2)
+    args = parser.parse_args()
+
+    results: dict[str, Any] = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "commands": args.commands,
+        "scenarios": [],
+    }
+    print(
+        f"{'mode':<8}{'cache':<6}{'width':>6}{'workers':>8}"
+        f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'req/s':>9}{'RSS MB':>8}"
+    )
+    for mode in comma_separated(args.modes):
+        for cache_state in comma_separated(args.caches):
+            for width in map(int, comma_separated(args.widths)):
+                for workers in map(int, comma_separated(args.workers)):
+                    s = run_isolated(
+                        mode, cache_state, width, workers, args.requests, args.commands
+                    )
+                    results["scenarios"].append(s)
+                    print(
+                        f"{mode:<8}{cache_state:<6}{width:>6}{workers:>8}"
+                        f"{s['p50_ms']:>9.3f}{s['p95_ms']:>9.3f}{s['p99_ms']:>9.3f}"
+                        f"{s['throughput_rps']:>9.0f}{s['max_rss_mb']:>8.0f}"
+                    )
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fh:
+            baseline = json.load(fh)
+        if compare(baseline, results, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
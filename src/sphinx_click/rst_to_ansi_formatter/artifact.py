@@ -0,0 +1,189 @@
+"""Precomputed help text stored in a memory-mapped file.
+
+The artifact is a binary file with the converted help text of every command of a CLI,
+for a set of terminal widths and for colored and monochrome output. It has the
+following layout, all integers are little-endian:
+
+* Header: The magic bytes ``SCRAHELP``, the format version (u32), the number of slots
+  in the hash table (u32, a power of two) and the number of entries (u32), padded to
+  32 bytes.
+* Hash table: One slot per entry, with the 64-bit hash of the key (u64, zero for empty
+  slots) and the offset of the record (u64). Collisions are resolved with linear
+  probing, and at most half of the slots are used.
+* Records: The length of the key (u32), the length of the value (u32), the UTF-8
+  encoded key and the UTF-8 encoded value.
+
+A lookup hashes the key, probes a few slots and decodes a single record, so its cost
+does not depend on the number of commands. The file is memory-mapped read-only, so
+processes that use the same artifact share its pages.
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+from pathlib import Path
+
+import click
+
+from .cache import write_atomic
+from .commands import iter_commands
+from .textutils import width_bucket
+
+ARTIFACT_MAGIC = b"SCRAHELP"
+ARTIFACT_VERSION = 2
+HEADER = struct.Struct("<8sIII12x")
+SLOT = struct.Struct("<QQ")
+RECORD_HEADER = struct.Struct("<II")
+
+# The default terminal widths the help text is rendered for
+ARTIFACT_WIDTHS = tuple(range(40, 201, 10))
+
+
+def artifact_key(
+    command_path: str, width: int, monochrome: bool, help_text: str
+) -> str:
+    # The key includes a hash of the reST help text, such that an artifact that was
+    # built from an older version of the docstring is not used
+    help_hash = hashlib.sha256(help_text.encode("utf-8")).hexdigest()[:16]
+    mode = "plain" if monochrome else "ansi"
+    return f"{command_path}\0{width_bucket(width)}\0{mode}\0{help_hash}"
+
+
+def key_hash(key: bytes) -> int:
+    # The lowest bit is always set, such that zero can be used for empty slots
+    digest = hashlib.blake2b(key, digest_size=8).digest()
+    return int.from_bytes(digest, "little") | 1
+
+
+def write_help_artifact(path: str | os.PathLike[str], entries: dict[str, str]) -> None:
+    """Write an artifact with the given entries (key -> help text) to path."""
+    slot_count = 1 << max(3, (2 * len(entries) - 1).bit_length())
+    mask = slot_count - 1
+    slots = bytearray(SLOT.size * slot_count)
+    used = [False] * slot_count
+    records = bytearray()
+    records_start = HEADER.size + len(slots)
+    for key, value in entries.items():
+        key_bytes = key.encode("utf-8")
+        value_bytes = value.encode("utf-8")
+        offset = records_start + len(records)
+        records += RECORD_HEADER.pack(len(key_bytes), len(value_bytes))
+        records += key_bytes + value_bytes
+        hash_value = key_hash(key_bytes)
+        slot = hash_value & mask
+        while used[slot]:
+            slot = (slot + 1) & mask
+        used[slot] = True
+        SLOT.pack_into(slots, slot * SLOT.size, hash_value, offset)
+    header = HEADER.pack(ARTIFACT_MAGIC, ARTIFACT_VERSION, slot_count, len(entries))
+    write_atomic(Path(path), header + slots + records)
+
+
+def build_help_artifact(
+    cli: click.Command,
+    path: str | os.PathLike[str],
+    widths: tuple[int, ...] = ARTIFACT_WIDTHS,
+) -> int:
+    """Render the help text of all commands of cli and write it to an artifact.
+
+    Only commands created with ``make_rst_to_ansi_formatter()`` are included. The help
+    text is rendered for each terminal width in widths, both colored and monochrome.
+
+    :return: The number of entries in the artifact.
+    """
+    # Import here to avoid a circular import, the formatter module uses this module
+    from .formatter import FormatHelpMixin
+
+    entries = {}
+    for path_name, cmd in iter_commands(cli):
+        # Help files are cached separately, see FormatHelpMixin.convert_help_file()
+        if not isinstance(cmd, FormatHelpMixin) or cmd.help_file is not None:
+            continue
+        help_text = cmd.get_help_source()
+        if help_text is None:
+            continue
+        # Like click, the help text is shown up to the first form feed, see
+        # FormatHelpMixin.format_help_text()
+        help_text = help_text.partition("\f")[0]
+        for width in sorted({width_bucket(width) for width in widths}):
+            for monochrome in (False, True):
+                key = artifact_key(path_name, width, monochrome, help_text)
+                entries[key] = cmd.convert_help(help_text, monochrome, width)
+    write_help_artifact(path, entries)
+    return len(entries)
+
+
+class HelpArtifact:
+    """Read-only access to a help artifact, see the module documentation."""
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        with open(path, "rb") as fh:
+            self.data = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.slot_count, self.entry_count = HEADER.unpack_from(
+            self.data, 0
+        )
+        if magic != ARTIFACT_MAGIC:
+            raise ValueError(f"{path} is not a help artifact.")
+        if version != ARTIFACT_VERSION:
+            raise ValueError(
+                f"{path} is a help artifact of version {version}, expected version "
+                f"{ARTIFACT_VERSION}."
+            )
+        # The slot count is a power of two, and the slots must fit in the file. The
+        # records are checked when they are looked up
+        slots_end = HEADER.size + self.slot_count * SLOT.size
+        count = self.slot_count
+        if not count or count & (count - 1) or len(self.data) < slots_end:
+            raise ValueError(f"{path} is a truncated or corrupt help artifact.")
+
+    def lookup(self, key: str) -> str | None:
+        """Return the value of key, or None if it is not found.
+
+        None is also returned if the record of the key is truncated or corrupt, the
+        help text is then converted as usual.
+        """
+        key_bytes = key.encode("utf-8")
+        hash_value = key_hash(key_bytes)
+        mask = self.slot_count - 1
+        slot = hash_value & mask
+        # Each slot is probed at most once, also if a corrupt table has no empty slot
+        for _ in range(self.slot_count):
+            slot_hash, offset = SLOT.unpack_from(
+                self.data, HEADER.size + slot * SLOT.size
+            )
+            if slot_hash == 0:
+                return None
+            if slot_hash == hash_value:
+                try:
+                    key_len, value_len = RECORD_HEADER.unpack_from(self.data, offset)
+                except struct.error:
+                    return None
+                start = offset + RECORD_HEADER.size
+                if self.data[start : start + key_len] == key_bytes:
+                    value = self.data[start + key_len : start + key_len + value_len]
+                    if len(value) != value_len:
+                        return None
+                    try:
+                        return value.decode("utf-8")
+                    except UnicodeDecodeError:
+                        return None
+            slot = (slot + 1) & mask
+        return None
+
+
+# Artifacts are opened at most once per process. None is stored for artifacts that
+# could not be opened, such that we do not try again for every command
+_artifacts: dict[Path, HelpArtifact | None] = {}
+
+
+def get_artifact(path: str | os.PathLike[str]) -> HelpArtifact | None:
+    key = Path(path)
+    if key not in _artifacts:
+        try:
+            _artifacts[key] = HelpArtifact(key)
+        except (OSError, ValueError, struct.error):
+            # A missing or broken artifact should not break the help output, the help
+            # text is then converted as usual
+            _artifacts[key] = None
+    return _artifacts[key]
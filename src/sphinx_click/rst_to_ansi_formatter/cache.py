@@ -0,0 +1,126 @@
+import functools
+import hashlib
+import importlib.metadata
+import os
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+# Name of the folder inside the user's cache directory where we store our files
+CACHE_FOLDER_NAME = "sphinx-click-rst-to-ansi-formatter"
+# The name of this package's distribution, see package_version()
+DISTRIBUTION_NAME = "sphinx-click-rst-to-ansi-formatter"
+
+
+@functools.cache
+def distribution_version(name: str) -> str:
+    # The installed version of a distribution, looked up once per process. The
+    # package is not imported. "unknown" if it is not installed, e.g. when this package
+    # is used from a source checkout
+    try:
+        return importlib.metadata.version(name)
+    except importlib.metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def package_version() -> str:
+    return distribution_version(DISTRIBUTION_NAME)
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """Write ``data`` to ``path``, creating the parent directory if needed.
+
+    The data is written to a temporary file first, which then replaces ``path``, such
+    that other processes never see a partially written file. The temporary file is
+    removed if writing fails.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+def default_cache_dir() -> Path:
+    # Use the standard per-user cache folder for the platform. On Linux we follow the
+    # XDG base directory specification
+    if sys.platform == "win32":  # pragma: no cover
+        base = os.environ.get("LOCALAPPDATA") or str(Path.home() / "AppData" / "Local")
+    elif sys.platform == "darwin":  # pragma: no cover
+        base = str(Path.home() / "Library" / "Caches")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(base) / CACHE_FOLDER_NAME
+
+
+class HelpCache:
+    """Cache for rendered text with an in-memory and an on-disk level.
+
+    Values are first looked up in memory, then in the cache directory, which is shared
+    between processes. Keys are created with :meth:`make_key`, they include the version
+    of this package, such that values from an older version are not used.
+
+    The in-memory level holds at most ``max_entries`` values. The cache directory is
+    not limited in size, there is one small file per converted help text and terminal
+    width. Old files are never removed, the directory can be deleted at any time.
+    """
+
+    def __init__(self, directory: Path | None, max_entries: int = 1024) -> None:
+        # If directory is None, only the in-memory level is used
+        self.directory = directory
+        self.max_entries = max_entries
+        self.memory: dict[str, str] = {}
+        # The cache is shared by the threads of the process, see set_memory()
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        key = "\0".join((package_version(), *parts))
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        value = self.memory.get(key)
+        if value is None and self.directory is not None:
+            try:
+                value = (self.directory / key).read_text(encoding="utf-8")
+            except OSError:
+                return None
+            self.set_memory(key, value)
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        self.set_memory(key, value)
+        if self.directory is not None:
+            try:
+                write_atomic(self.directory / key, value.encode("utf-8"))
+            except OSError:
+                # The disk cache is an optimization, we can do without it if the cache
+                # directory is not writable
+                pass
+
+    def set_memory(self, key: str, value: str) -> None:
+        # Without the lock, two threads could evict the same entry
+        with self.lock:
+            if len(self.memory) >= self.max_entries:
+                # Evict the oldest entry
+                del self.memory[next(iter(self.memory))]
+            self.memory[key] = value
+
+
+# Caches are shared by all commands in the process that use the same cache directory
+_caches: dict[Path, HelpCache] = {}
+
+
+def get_cache(cache_dir: str | os.PathLike[str] | None = None) -> HelpCache:
+    directory = (Path(cache_dir) if cache_dir else default_cache_dir()) / "help"
+    if directory not in _caches:
+        _caches[directory] = HelpCache(directory)
+    return _caches[directory]
@@ -1,3 +1,7 @@
+import functools
+import os
+import sys
+
 from colorama import Fore, Style
 
 from .types import ColorDict
@@ -29,3 +33,20 @@ class Colors:
 
     def color_code(self, txt: str) -> str:
         return self.apply_color(txt, "code")
+
+
+class MonochromeColors(Colors):
+    # Used when the output should not contain any ANSI escape codes, see
+    # colors_enabled() below
+    def apply_color(self, txt: str, color: str) -> str:
+        return txt
+
+
+# Decide once per process if the help text should be colored. We do not color the
+# output if the NO_COLOR environment variable is set (see https://no-color.org/) or
+# if stdout is not a terminal, e.g. if the output is piped to a pager or to a file.
+@functools.lru_cache(maxsize=None)
+def colors_enabled() -> bool:
+    if os.environ.get("NO_COLOR", ""):
+        return False
+    return sys.stdout.isatty()
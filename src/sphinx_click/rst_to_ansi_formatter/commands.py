@@ -0,0 +1,39 @@
+from typing import Iterator
+
+import click
+
+
+def command_path(ctx: click.Context) -> str:
+    """Return the names of the commands from the root command to ctx's command.
+
+    Unlike ``ctx.command_path`` this does not depend on the name of the program, so it
+    can be used as a stable key for a command, e.g. ``"cli sub-command"``.
+    """
+    names = []
+    current: click.Context | None = ctx
+    while current is not None:
+        names.append(current.command.name or current.info_name or "")
+        current = current.parent
+    return " ".join(reversed(names))
+
+
+def iter_commands(cli: click.Command) -> Iterator[tuple[str, click.Command]]:
+    """Walk the command tree of cli and yield ``(command path, command)`` tuples.
+
+    The command path is the same as returned by :func:`command_path` when the command
+    is invoked. Subcommands are found with ``list_commands()`` and ``get_command()``, so
+    groups that load their commands lazily are also supported.
+    """
+
+    def walk(
+        cmd: click.Command, names: list[str], parent: click.Context | None
+    ) -> Iterator[tuple[str, click.Command]]:
+        yield " ".join(names), cmd
+        if isinstance(cmd, click.Group):
+            ctx = click.Context(cmd, info_name=cmd.name, parent=parent)
+            for name in cmd.list_commands(ctx):
+                sub_cmd = cmd.get_command(ctx, name)
+                if sub_cmd is not None:
+                    yield from walk(sub_cmd, names + [sub_cmd.name or name], ctx)
+
+    yield from walk(cli, [cli.name or ""], None)
@@ -0,0 +1,112 @@
+"""Render settings shared by all commands created with the same configuration.
+
+Every command class created by ``make_rst_to_ansi_formatter()`` gets a RenderContext
+from get_render_context(). It holds what does not change between conversions, the
+color tables, the syntax highlighter and the Sphinx inventory, such that they are
+created once and not for every conversion of every command. Commands created by
+several calls to the factory with the same arguments share the same RenderContext.
+"""
+
+import functools
+import os
+from pathlib import Path
+
+from .cache import get_cache
+from .colors import Colors, MonochromeColors
+from .highlight import Highlighter
+from .inventory import Inventory, get_inventory
+from .types import ColorDict
+
+
+class RenderContext:
+    """The settings of a converter that are the same for all help texts.
+
+    A RenderContext is shared by many commands, possibly from several threads, so it
+    must not be modified. Use get_render_context() to create one.
+    """
+
+    def __init__(
+        self,
+        base_url: str | None,
+        colors: ColorDict | None = None,
+        inventory: str | os.PathLike[str] | None = None,
+        cache_dir: str | os.PathLike[str] | None = None,
+        highlight: bool = False,
+        highlight_theme: str = "dark",
+    ) -> None:
+        self.base_url = base_url
+        self.colors = colors
+        self.inventory_path = inventory
+        self.cache_dir = cache_dir
+        self.highlight = highlight
+        self.highlight_theme = highlight_theme
+        # The color tables are stateless, so one of each is enough
+        self.color_table = Colors(colors)
+        self.monochrome_table = MonochromeColors()
+        # Identifies the settings that change the converted help text, e.g. in the
+        # keys of converted help text in the help cache. The cache directory is not
+        # part of it, it does not change the output
+        self.key = repr(
+            (
+                base_url,
+                colors,
+                str(inventory) if inventory is not None else None,
+                highlight,
+                highlight_theme,
+            )
+        )
+
+    def cache_key(self) -> str:
+        """Return the key of the settings in the keys of the help cache.
+
+        Unlike ``key``, it changes when the inventory file changes, like
+        Inventory.index_path(), such that help text that was converted with an older
+        inventory is not used.
+        """
+        if self.inventory_path is None:
+            return self.key
+        try:
+            stat = os.stat(self.inventory_path)
+        except OSError:
+            return f"{self.key}\0missing"
+        return f"{self.key}\0{stat.st_size}\0{stat.st_mtime_ns}"
+
+    def colors_for(self, monochrome: bool) -> Colors:
+        return self.monochrome_table if monochrome else self.color_table
+
+    # The inventory and the highlighter are created the first time they are needed,
+    # such that creating a command class at import time stays cheap
+
+    @functools.cached_property
+    def inventory(self) -> Inventory | None:
+        # The Sphinx inventory (objects.inv) used to resolve roles like :ref: and
+        # :func:. It is not read before a role needs to be looked up
+        if self.inventory_path is None:
+            return None
+        return get_inventory(self.inventory_path, self.cache_dir)
+
+    @functools.cached_property
+    def highlighter(self) -> Highlighter | None:
+        # Syntax highlighting of code blocks is opt-in
+        if not self.highlight:
+            return None
+        return Highlighter(self.highlight_theme, get_cache(self.cache_dir))
+
+
+# Render contexts by (RenderContext.key, cache directory)
+_contexts: dict[tuple[str, Path | None], RenderContext] = {}
+
+
+def get_render_context(
+    base_url: str | None,
+    colors: ColorDict | None = None,
+    inventory: str | os.PathLike[str] | None = None,
+    cache_dir: str | os.PathLike[str] | None = None,
+    highlight: bool = False,
+    highlight_theme: str = "dark",
+) -> RenderContext:
+    context = RenderContext(
+        base_url, colors, inventory, cache_dir, highlight, highlight_theme
+    )
+    key = (context.key, Path(cache_dir) if cache_dir else None)
+    return _contexts.setdefault(key, context)
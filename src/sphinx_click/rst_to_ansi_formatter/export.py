@@ -0,0 +1,338 @@
+"""Export the help of all commands of a CLI to man pages and text files.
+
+The help text of each command is parsed once, and the document tree is rendered to
+all requested formats: a troff man page (``.1``), plain text (``.txt``) and text with
+ANSI colors (``.ansi``). The text files contain the whole help page, like
+``--help``. Each file is written as soon as it is rendered. Run this module, e.g.
+when building a package::
+
+    python -m sphinx_click.rst_to_ansi_formatter.export my_package.cli:main man/
+"""
+
+import copy
+import functools
+import itertools
+import multiprocessing
+import typing
+from collections.abc import Iterator, Sequence
+from pathlib import Path
+from typing import Any
+
+import click
+import docutils.core
+import docutils.frontend
+import docutils.nodes
+import docutils.readers.doctree
+import docutils.utils
+import docutils.writers.manpage
+
+from .commands import iter_commands
+from .formatter import QUIET_REPORT_LEVEL, FormatHelpMixin, parser_settings
+from .lint import load_command
+
+# File name suffix of each export format
+EXPORT_FORMATS = {"man": ".1", "txt": ".txt", "ansi": ".ansi"}
+
+
+class ExportJob(typing.NamedTuple):
+    command_path: str
+    cmd: FormatHelpMixin
+
+
+# Parsed help text by command, see parse_help()
+Doctrees = dict[click.Command, docutils.nodes.document]
+
+
+@functools.lru_cache(maxsize=None)
+def manpage_settings() -> Any:
+    # Like parser_settings(), the settings of the man page writer are created once
+    settings = docutils.frontend.get_default_settings(
+        docutils.readers.doctree.Reader, docutils.writers.manpage.Writer
+    )
+    settings._update_loose(
+        {
+            "_disable_config": True,
+            "report_level": QUIET_REPORT_LEVEL,
+            "halt_level": 5,
+            "warning_stream": False,
+        }
+    )
+    return settings
+
+
+def file_stem(command_path: str) -> str:
+    # The files of "cli sub" are named "cli-sub.1", "cli-sub.txt", etc.
+    return command_path.replace(" ", "-")
+
+
+def make_context(command_path: str, cmd: click.Command, width: int) -> click.Context:
+    # The info name is the whole command path, such that the usage line is complete
+    return click.Context(
+        cmd,
+        info_name=command_path,
+        terminal_width=width,
+        max_content_width=width,
+    )
+
+
+def render_page(ctx: click.Context, cmd: FormatHelpMixin, text: str) -> str:
+    # Like click's Command.format_help(), but with the given converted help text
+    command = typing.cast(click.Command, cmd)
+    formatter = ctx.make_formatter()
+    command.format_usage(ctx, formatter)
+    cmd.write_help_text(formatter, text)
+    command.format_options(ctx, formatter)
+    command.format_epilog(ctx, formatter)
+    return formatter.getvalue()
+
+
+def definition_list(items: list[tuple[str, str]]) -> docutils.nodes.definition_list:
+    return docutils.nodes.definition_list(
+        "",
+        *(
+            docutils.nodes.definition_list_item(
+                "",
+                docutils.nodes.term("", term),
+                docutils.nodes.definition("", docutils.nodes.paragraph("", definition)),
+            )
+            for term, definition in items
+        ),
+    )
+
+
+def man_section(title: str, *children: docutils.nodes.Node) -> docutils.nodes.section:
+    return docutils.nodes.section("", docutils.nodes.title("", title), *children)
+
+
+def short_help(command: click.Command, doctree: docutils.nodes.document | None) -> str:
+    # The first sentence of the help text without the reST markup, unless the command
+    # has a short help
+    paragraph = (
+        next(iter(doctree.findall(docutils.nodes.paragraph)), None)
+        if doctree is not None
+        else None
+    )
+    if command.short_help or paragraph is None:
+        return command.get_short_help_str(limit=80)
+    return click.utils.make_default_short_help(paragraph.astext(), 80)
+
+
+def parse_help(
+    cmd: click.Command, width: int, doctrees: Doctrees
+) -> docutils.nodes.document | None:
+    # The parsed help text of a command, None if it has no reST help text. A group
+    # parses the help text of its subcommands for their short help in the COMMANDS
+    # section. It is kept in doctrees until the subcommand itself is exported, such
+    # that each help text is parsed once
+    if cmd in doctrees:
+        return doctrees.pop(cmd)
+    if not isinstance(cmd, FormatHelpMixin):
+        return None
+    help_text = cmd.get_help_source()
+    if help_text is None:
+        return None
+    return cmd.make_converter(help_text.partition("\f")[0], False, width).parse()
+
+
+def render_man_page(
+    ctx: click.Context,
+    command_path: str,
+    cmd: FormatHelpMixin,
+    doctree: docutils.nodes.document | None,
+    doctrees: Doctrees | None = None,
+) -> str:
+    """Render a man page with the usage, the parsed help text and the options.
+
+    The parsed help text of the subcommands of a group is stored in doctrees, see
+    parse_help().
+    """
+    command = typing.cast(click.Command, cmd)
+    document = docutils.utils.new_document(
+        command_path, parser_settings(QUIET_REPORT_LEVEL)
+    )
+    # The title and subtitle are the NAME section, the docinfo field the section of
+    # the manual, see docutils' manpage writer
+    document += docutils.nodes.title("", file_stem(command_path))
+    document += docutils.nodes.subtitle("", short_help(command, doctree))
+    document += docutils.nodes.docinfo(
+        "",
+        docutils.nodes.field(
+            "",
+            docutils.nodes.field_name("", "manual_section"),
+            docutils.nodes.field_body("", docutils.nodes.paragraph("", "1")),
+        ),
+    )
+    usage = " ".join(command.collect_usage_pieces(ctx))
+    document += man_section(
+        "Synopsis", docutils.nodes.literal_block("", f"{command_path} {usage}")
+    )
+    if doctree is not None:
+        # The man page writer changes the nodes, and the same doctree is also
+        # rendered to text, so the man page gets a copy. Sections of the help text
+        # become subsections of the description
+        document += man_section(
+            "Description", *(copy.deepcopy(node) for node in doctree.children)
+        )
+    options = [
+        record
+        for param in command.get_params(ctx)
+        if (record := param.get_help_record(ctx)) is not None
+    ]
+    if options:
+        document += man_section("Options", definition_list(options))
+    if isinstance(command, click.Group):
+        doctrees = {} if doctrees is None else doctrees
+        width = ctx.terminal_width or 80
+        subcommands = []
+        for name in command.list_commands(ctx):
+            sub = command.get_command(ctx, name)
+            if sub is not None and not sub.hidden:
+                sub_doctree = parse_help(sub, width, doctrees)
+                if sub_doctree is not None:
+                    doctrees[sub] = sub_doctree
+                subcommands.append((name, short_help(sub, sub_doctree)))
+        if subcommands:
+            document += man_section("Commands", definition_list(subcommands))
+    output = docutils.core.publish_from_doctree(
+        document,
+        writer=docutils.writers.manpage.Writer(),
+        settings=copy.copy(manpage_settings()),
+    )
+    return typing.cast(bytes, output).decode("utf-8")
+
+
+def export_command(
+    job: ExportJob,
+    directory: Path,
+    formats: Sequence[str],
+    width: int,
+    doctrees: Doctrees,
+) -> list[Path]:
+    """Render the help of one command to the formats and write the files."""
+    command = typing.cast(click.Command, job.cmd)
+    ctx = make_context(job.command_path, command, width)
+    help_text = job.cmd.get_help_source()
+    if help_text is not None:
+        help_text = help_text.partition("\f")[0]
+    # The only parse of the help text, it is rendered to all formats
+    doctree = parse_help(command, width, doctrees)
+    paths = []
+    for name in formats:
+        if name == "man":
+            page = render_man_page(ctx, job.command_path, job.cmd, doctree, doctrees)
+        else:
+            text = ""
+            if help_text is not None and doctree is not None:
+                converter = job.cmd.make_converter(help_text, name == "txt", width)
+                text = converter.render(doctree)
+            page = render_page(ctx, job.cmd, text)
+        path = directory / (file_stem(job.command_path) + EXPORT_FORMATS[name])
+        path.write_text(page, encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+def export_jobs(cli: click.Command) -> list[ExportJob]:
+    # Only commands created with make_rst_to_ansi_formatter() have reST help text
+    return [
+        ExportJob(command_path, cmd)
+        for command_path, cmd in iter_commands(cli)
+        if isinstance(cmd, FormatHelpMixin)
+    ]
+
+
+# The arguments of export_command() in a worker process, see init_worker()
+_worker_args: tuple[list[ExportJob], Path, Sequence[str], int, Doctrees] | None = None
+
+
+def init_worker(
+    jobs: list[ExportJob], directory: Path, formats: Sequence[str], width: int
+) -> None:  # pragma: no cover
+    # Runs in the worker process. The worker is forked, so the arguments, including
+    # the commands, are inherited and not pickled. Each worker has its own doctrees,
+    # a subcommand that is exported by another worker than its group is parsed again
+    global _worker_args
+    _worker_args = (jobs, directory, formats, width, {})
+
+
+def run_job(index: int) -> list[Path]:  # pragma: no cover
+    # Runs in the worker process
+    assert _worker_args is not None
+    jobs, directory, formats, width, doctrees = _worker_args
+    return export_command(jobs[index], directory, formats, width, doctrees)
+
+
+def iter_export(
+    cli: click.Command,
+    directory: str | Path,
+    formats: Sequence[str] = tuple(EXPORT_FORMATS),
+    width: int = 80,
+    workers: int = 1,
+) -> Iterator[Path]:
+    """Export the help of cli and its subcommands, and yield the written files.
+
+    :param cli: The root command, only commands created with
+        ``make_rst_to_ansi_formatter()`` are exported.
+    :param directory: The files are written to this directory, it is created if it
+        does not exist.
+    :param formats: The formats to export, see EXPORT_FORMATS.
+    :param width: The width of the text files.
+    :param workers: The number of worker processes. The workers are forked, so more
+        than one worker is only used on platforms that support fork.
+    """
+    unknown = set(formats) - set(EXPORT_FORMATS)
+    if unknown:
+        raise ValueError(f"Unknown export formats: {', '.join(sorted(unknown))}")
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    jobs = export_jobs(cli)
+    if workers > 1 and "fork" in multiprocessing.get_all_start_methods():
+        pool = multiprocessing.get_context("fork").Pool(
+            workers, initializer=init_worker, initargs=(jobs, directory, formats, width)
+        )
+        with pool:
+            # The files of a command are yielded as soon as a worker has written them
+            results = pool.imap(run_job, range(len(jobs)))
+            yield from itertools.chain.from_iterable(results)
+    else:
+        doctrees: Doctrees = {}
+        for job in jobs:
+            yield from export_command(job, directory, formats, width, doctrees)
+
+
+def export(
+    cli: click.Command,
+    directory: str | Path,
+    formats: Sequence[str] = tuple(EXPORT_FORMATS),
+    width: int = 80,
+    workers: int = 1,
+) -> list[Path]:
+    """Like iter_export(), but return the list of written files."""
+    return list(iter_export(cli, directory, formats, width, workers))
+
+
+@click.command()
+@click.argument("cli", metavar="MODULE:ATTRIBUTE")
+@click.argument("directory", type=click.Path(file_okay=False))
+@click.option(
+    "--format",
+    "formats",
+    type=click.Choice(list(EXPORT_FORMATS)),
+    multiple=True,
+    help="Export only this format, can be repeated. Default: all formats.",
+)
+@click.option("--width", type=int, default=80, show_default=True)
+@click.option("--workers", type=int, default=1, show_default=True)
+def main(
+    cli: str, directory: str, formats: tuple[str, ...], width: int, workers: int
+) -> None:
+    """Export the help of the click command CLI and its subcommands to DIRECTORY."""
+    paths = iter_export(
+        load_command(cli), directory, formats or tuple(EXPORT_FORMATS), width, workers
+    )
+    for path in paths:
+        click.echo(str(path))
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -1,20 +1,118 @@
+import copy
 import docutils.core
+import docutils.frontend
 import docutils.nodes
+import docutils.parsers.rst
+import docutils.readers.standalone
 import docutils.utils
-import io
+import functools
+import os
 import re
-import shutil
 import textwrap
+import threading
 import typing
 from typing import Any
 
 import click
 
-from .colors import Colors
+from .artifact import artifact_key, get_artifact
+from .cache import get_cache
+from .colors import Colors, colors_enabled
+from .commands import command_path
+from .context import RenderContext, get_render_context
+from .helpfile import HelpFile, HelpSource
+from .highlight import Highlighter
+from .roles import RoleResolver
+from .sections import find_section, section_titles
+from .terminal import help_width, terminal_width
 from .types import ColorDict
 from sphinx_click.rst_to_ansi_formatter import textutils
 
 
+# Roman numerals used by format_enumerator()
+ROMAN_NUMERALS = (
+    (1000, "M"),
+    (900, "CM"),
+    (500, "D"),
+    (400, "CD"),
+    (100, "C"),
+    (90, "XC"),
+    (50, "L"),
+    (40, "XL"),
+    (10, "X"),
+    (9, "IX"),
+    (5, "V"),
+    (4, "IV"),
+    (1, "I"),
+)
+
+
+def format_enumerator(number: int, enumtype: str) -> str:
+    # Format the number of an item in an enumerated list, enumtype is the "enumtype"
+    # attribute of the docutils enumerated_list node
+    if enumtype in ("loweralpha", "upperalpha") and 1 <= number <= 26:
+        letter = chr(ord("a") + number - 1)
+        return letter if enumtype == "loweralpha" else letter.upper()
+    if enumtype in ("lowerroman", "upperroman") and number >= 1:
+        roman = ""
+        for value, numeral in ROMAN_NUMERALS:
+            count, number = divmod(number, value)
+            roman += numeral * count
+        return roman.lower() if enumtype == "lowerroman" else roman
+    return str(number)
+
+
+# Docutils' report level that suppresses all system messages. This is used when the
+# help text is shown, problems with the reST markup are reported by lint.py instead
+QUIET_REPORT_LEVEL = 5
+
+# Settings for docutils.core.publish_doctree()
+PARSER_SETTINGS: dict[str, Any] = {
+    "input_encoding": "unicode",
+    # We do the syntax highlighting of code blocks ourselves, see
+    # PlainTextVisitor.visit_literal_block(). So there is no need for
+    # docutils to split the code into tokens
+    "syntax_highlight": "none",
+    # Never halt, and do not format and write system messages to stderr. Messages at
+    # or above the report level are added to the document tree, see lint.py
+    "halt_level": 5,
+    "warning_stream": False,
+    # Do not look for docutils.conf configuration files
+    "_disable_config": True,
+    # The document title, subtitle and bibliographic fields are not used in help
+    # text, so the transforms that create them are turned off
+    "doctitle_xform": False,
+    "docinfo_xform": False,
+    "sectsubtitle_xform": False,
+    # The help text should not read files or contain raw output
+    "file_insertion_enabled": False,
+    "raw_enabled": False,
+}
+
+
+@functools.lru_cache(maxsize=None)
+def parser_settings(report_level: int) -> Any:
+    # Creating the docutils settings, i.e. running docutils' option parser, takes
+    # about as long as parsing a short help text. So the settings are created once per
+    # report level, and RstToAnsiConverter.parse() passes a copy to publish_doctree()
+    settings = docutils.frontend.get_default_settings(
+        docutils.parsers.rst.Parser, docutils.readers.standalone.Reader
+    )
+    settings._update_loose({**PARSER_SETTINGS, "report_level": report_level})
+    return settings
+
+
+class ListState:
+    # State of a bullet list or an enumerated list that is being rendered, see
+    # PlainTextVisitor.push_list()
+    def __init__(self, indent: str, markers: list[str]) -> None:
+        self.indent = indent  # Indentation of the item markers
+        self.markers = markers  # The marker of each item, e.g. "•" or "1."
+        self.next_item = 0  # Index of the next item
+        # The item text is indented by the width of the widest marker plus a space
+        self.marker_width = max(len(marker) for marker in markers) + 1
+
+
 # Visitor that will transform the document tree into plain text
 class PlainTextVisitor(docutils.nodes.NodeVisitor):
     # Marker to indicate that a paragraph should not be rewrapped by Click
@@ -25,29 +123,84 @@ class PlainTextVisitor(docutils.nodes.NodeVisitor):
     # NOTE: Refer to the Click documentation for more information:
     #       https://click.palletsprojects.com/en/8.1.x/api/#click.wrap_text
     CLICK_PARAGRAPH_NOWRAP_MARKER = "\b\n"
+    # Two or more empty (or whitespace only) lines
+    EMPTY_LINES_RE = re.compile(r"\n(?:[ \t]*\n){2,}")
+    # Encloses the text of literal blocks in the output when there are no no-rewrap
+    # markers, such that astext() does not collapse the empty lines inside them
+    VERBATIM = "\0"
+    # Indentation of the definition of a term in a definition list
+    DEFINITION_INDENT = "    "
+    # Bullets for bullet lists, by nesting depth
+    BULLETS = ("•", "◦", "▪")
+    # Minimum width of wrapped text in deeply indented blocks. If the indentation
+    # leaves less room than this, the lines will be longer than the terminal width
+    MIN_TEXT_WIDTH = 20
+    # Separator between the columns of tables and field lists
+    COLUMN_SEPARATOR = "  "
 
-    def __init__(self, document: docutils.nodes.document, colors: Colors):
+    def __init__(
+        self,
+        document: docutils.nodes.document,
+        colors: Colors,
+        monochrome: bool = False,
+        highlighter: Highlighter | None = None,
+        width: int | None = None,
+        nowrap_markers: bool = True,
+    ):
         docutils.nodes.NodeVisitor.__init__(self, document)
-        # Main content buffer: Collect the modified docstring here
-        self.main_buffer: io.StringIO = io.StringIO()
+        # Output fragments: Collect the modified docstring here. Text is appended to
+        # this list and the result is created by a single "".join() in astext()
+        self.parts: list[str] = []
+        # Start indices into self.parts for the blocks (paragraphs and list items)
+        # that are currently being collected. When a block is departed, its
+        # fragments are joined, wrapped and put back as a single part.
+        self.block_stack: list[int] = []
         self.urls: list[str] = []  # Store URLs to be listed at the end of the docstring
-        # Temporary buffer to store the current list item
-        self.current_list_item: io.StringIO = io.StringIO()
-        self.current_paragraph: io.StringIO = io.StringIO()
-        self.current_buffer: io.StringIO = (
-            self.main_buffer
-        )  # Initially points to the main buffer
-        self.buffer_stack: list[io.StringIO] = []  # Stack to store buffers
-        self.push_buffer_stack(self.main_buffer)
         self.in_literal = (
             False  # Flag to indicate if we're inside a literal block (quoted text)
         )
-        self.in_bullet_list = False  # Flag to indicate if we're inside a bullet list
+        # Stack with the state of the bullet lists and enumerated lists we are inside
+        self.list_stack: list[ListState] = []
+        # The indentation and marker of the current list item, e.g. "  • ". This is
+        # used as the start of the first line of the item's first paragraph
+        self.item_prefix: str | None = None
+        # Indentation of the current block, e.g. inside the definition of a term
+        self.indent = ""
+        # Greater than zero while rendering a table cell, see render_inline()
+        self.inline_depth = 0
         self.colors = colors
-        # Dynamically set wrap width based on terminal size
-        terminal_width = shutil.get_terminal_size(fallback=(80, 20)).columns
+        # Text without ANSI escape codes can be wrapped by the cheaper plain_fill()
+        self.fill = textutils.plain_fill if monochrome else textutils.ansiwrap_fill
+        # If given, used for syntax highlighting of code blocks with a language
+        self.highlighter = highlighter
+        # The output is either meant to be passed through click's wrap_text(), which
+        # needs a marker in front of each block, or to be written as is, see
+        # FormatHelpMixin.format_help_text(). In the latter case the marker line is
+        # replaced by an empty line, and runs of empty lines are collapsed in astext()
+        self.nowrap_markers = nowrap_markers
+        self.nowrap_marker = (
+            self.CLICK_PARAGRAPH_NOWRAP_MARKER if nowrap_markers else "\n"
+        )
+        # Wrap for the terminal width, unless a width is given, see terminal.py
+        if width is None:
+            width = terminal_width()
         # click's format_help() adds 2 extra spaces at the beginning of each line
-        self.wrap_width = terminal_width - 2
+        self.wrap_width = width - 2
+
+    def astext(self) -> str:
+        text = "".join(self.parts).strip()
+        if not self.nowrap_markers:
+            # Collapse the empty lines between blocks, the odd segments are the
+            # text of literal blocks
+            segments = text.split(self.VERBATIM)
+            segments[::2] = [
+                self.EMPTY_LINES_RE.sub("\n\n", segment) for segment in segments[::2]
+            ]
+            text = "".join(segments)
+        return text
+
+    def begin_block(self) -> None:
+        self.block_stack.append(len(self.parts))
 
     def color_heading(self, txt: str) -> str:
         return self.colors.color_heading(txt)
@@ -59,7 +212,10 @@ class PlainTextVisitor(docutils.nodes.NodeVisitor):
         return self.colors.color_code(txt)
 
     def depart_bullet_list(self, node: docutils.nodes.bullet_list) -> None:
-        self.in_bullet_list = False
+        self.list_stack.pop()
+
+    def depart_definition(self, node: docutils.nodes.definition) -> None:
+        self.indent = self.indent[: -len(self.DEFINITION_INDENT)]
 
     def depart_emphasis(
         self, node: docutils.nodes.emphasis
@@ -68,17 +224,14 @@ class PlainTextVisitor(docutils.nodes.NodeVisitor):
         #       a docutils.nodes.SkipNode exception at the end
         pass
 
+    def depart_enumerated_list(self, node: docutils.nodes.enumerated_list) -> None:
+        self.list_stack.pop()
+
     def depart_list_item(self, node: docutils.nodes.list_item) -> None:
-        # Process the accumulated list item content now that we've traversed the whole item
-        text = "• " + self.current_list_item.getvalue()
-        # Replace newlines with spaces to avoid premature line breaks in the wrapped text
-        text = text.replace("\n", " ")
-        wrapped_text = textutils.ansiwrap_fill(
-            text, width=self.wrap_width, subsequent_indent="  "
-        )
-        parent_buffer = self.pop_buffer_stack()
-        parent_buffer.write(wrapped_text + "\n")
-        self.current_buffer = parent_buffer  # Switch back to using the parent buffer
+        # The paragraphs of the item have already been wrapped, see depart_paragraph()
+        self.item_prefix = None
+        if not self.inline_depth:
+            self.indent = self.list_stack[-1].indent
 
     def depart_literal_block(
         self, node: docutils.nodes.literal_block
@@ -91,20 +244,32 @@ class PlainTextVisitor(docutils.nodes.NodeVisitor):
         self.in_literal = False  # Exiting a literal block
 
     def depart_paragraph(self, node: docutils.nodes.paragraph) -> None:
-        if not self.in_bullet_list:
-            text = self.current_paragraph.getvalue()
+        if self.inline_depth:
+            # Paragraphs in a table cell are joined into a single line
+            self.parts.append(" ")
+        elif self.indent:
+            # A paragraph in a list item or in the definition of a term. The first
+            # paragraph of a list item starts with the item's marker. Each paragraph
+            # is wrapped exactly once, at the indentation of the item or definition
+            text = self.end_block().replace("\n", " ")
+            first_line_prefix = self.item_prefix or self.indent
+            self.item_prefix = None
+            wrapped_text = self.fill(
+                first_line_prefix + text,
+                width=max(self.wrap_width, len(self.indent) + self.MIN_TEXT_WIDTH),
+                subsequent_indent=self.indent,
+            )
+            # Add an empty line to separate the paragraph from a previous paragraph
+            # (or a nested list) in the same item or definition
+            if node.parent.children[0] is not node:
+                self.parts.append("\n" + self.nowrap_marker)
+            self.parts.append(wrapped_text + "\n")
+        else:
+            text = self.end_block()
             # Replace newlines with spaces to avoid premature line breaks in the wrapped text
             text = text.replace("\n", " ")
-            wrapped_text = textutils.ansiwrap_fill(
-                text, width=self.wrap_width, subsequent_indent=""
-            )
-            parent_buffer = self.pop_buffer_stack()
-            parent_buffer.write(
-                "\n" + self.CLICK_PARAGRAPH_NOWRAP_MARKER + wrapped_text
-            )
-            self.current_buffer = (
-                parent_buffer  # Switch back to using the parent buffer
-            )
+            wrapped_text = self.fill(text, width=self.wrap_width, subsequent_indent="")
+            self.parts.append("\n" + self.nowrap_marker + wrapped_text)
 
     def depart_reference(
         self, node: docutils.nodes.reference
@@ -124,21 +289,25 @@ class PlainTextVisitor(docutils.nodes.NodeVisitor):
         #       a docutils.nodes.SkipNode exception at the end
         pass
 
+    def end_block(self) -> str:
+        # Remove the fragments of the innermost block from self.parts and return
+        # them as a single string
+        start = self.block_stack.pop()
+        text = "".join(self.parts[start:])
+        del self.parts[start:]
+        return text
+
     # At the end of processing, append all URLs:
     def finalize(self) -> None:
         if self.urls:
-            self.main_buffer.write(
-                "\n\n" + self.color_heading("Referenced URLs:") + "\n\n\b\n"
+            self.parts.append(
+                "\n\n"
+                + self.color_heading("Referenced URLs:")
+                + "\n\n"
+                + self.nowrap_marker
             )
             for index, url in enumerate(self.urls, start=1):
-                self.main_buffer.write(self.color_url(f"{index}.") + f" {url}\n")
-
-    def pop_buffer_stack(self) -> io.StringIO:
-        self.buffer_stack.pop()
-        return self.buffer_stack[-1]
-
-    def push_buffer_stack(self, buffer: io.StringIO) -> None:
-        self.buffer_stack.append(buffer)
+                self.parts.append(self.color_url(f"{index}.") + f" {url}\n")
 
     def process_url(self, url: str) -> str:
         if url not in self.urls:
@@ -150,13 +319,89 @@ class PlainTextVisitor(docutils.nodes.NodeVisitor):
         replacement_txt = f"[{idx}]"
         return replacement_txt
 
+    def push_list(self, markers: list[str]) -> None:
+        # Called when entering a bullet list or an enumerated list. The list's items
+        # are indented relative to the current block, e.g. the enclosing list item
+        if not self.list_stack and not self.inline_depth:
+            # Prepend with backspace and a newline to ensure the list is not rewrapped
+            # by Click and to maintain the desired spacing. See comment for
+            # visit_literal_block() for more information. Nested lists are part of the
+            # outermost list's block
+            self.parts.append("\n\n" + self.nowrap_marker)
+        self.list_stack.append(ListState(self.indent, markers))
+
+    def render_inline(self, node: docutils.nodes.Element) -> str:
+        # Render the children of node as a single line of text without wrapping it.
+        # This is used for table cells and the fields of field lists
+        self.inline_depth += 1
+        self.begin_block()
+        for child in node.children:
+            child.walkabout(self)
+        self.inline_depth -= 1
+        return self.end_block().replace("\n", " ").strip()
+
+    def render_table(
+        self,
+        rows: list[list[str]],
+        header_rows: int = 0,
+        col_spans: dict[tuple[int, int], int] | None = None,
+    ) -> None:
+        # col_spans maps (row, column) of cells that span several columns to the
+        # number of columns they span. The cells covered by the span are empty
+        col_spans = col_spans or {}
+        # Measure the natural width (the longest line) and the minimum width (the
+        # longest word) of each column in a single pass over the cells. Cells that
+        # span several columns are not measured, they use the width of the columns
+        num_cols = max(len(row) for row in rows)
+        natural = [0] * num_cols
+        minimum = [0] * num_cols
+        for row_idx, row in enumerate(rows):
+            for col, cell in enumerate(row):
+                if (row_idx, col) in col_spans:
+                    continue
+                natural[col] = max(natural[col], textutils.display_width(cell))
+                for word in cell.split():
+                    minimum[col] = max(minimum[col], textutils.display_width(word))
+        separator = self.COLUMN_SEPARATOR
+        available = self.wrap_width - len(self.indent) - len(separator) * (num_cols - 1)
+        widths = textutils.fit_column_widths(natural, minimum, available)
+        lines = []
+        for row_idx, row in enumerate(rows):
+            wrapped_cells = []
+            cell_widths = []
+            col = 0
+            while col < num_cols:
+                span = col_spans.get((row_idx, col), 1)
+                width = sum(widths[col : col + span]) + len(separator) * (span - 1)
+                wrapped_cells.append(self.fill(row[col], width=width).split("\n"))
+                cell_widths.append(width)
+                col += span
+            for line_idx in range(max(len(cell) for cell in wrapped_cells)):
+                line_parts = []
+                for cell_lines, width in zip(wrapped_cells, cell_widths):
+                    txt = cell_lines[line_idx] if line_idx < len(cell_lines) else ""
+                    padding = width - textutils.display_width(txt)
+                    line_parts.append(txt + " " * max(padding, 0))
+                lines.append(self.indent + separator.join(line_parts).rstrip())
+            if row_idx == header_rows - 1:
+                # Underline the header
+                lines.append(self.indent + separator.join("-" * w for w in widths))
+        self.parts.append("\n\n" + self.nowrap_marker + "\n".join(lines) + "\n\n")
+
     def visit_bullet_list(self, node: docutils.nodes.bullet_list) -> None:
-        # Prepend with backspace and a newline to ensure the list is not rewrapped by Click
-        # and to maintain the desired spacing. See comment for visit_literal_block() for
-        # more information.
-        self.in_bullet_list = True
-        self.current_buffer.write("\n\n\b\n")
-        pass
+        bullet = self.BULLETS[len(self.list_stack) % len(self.BULLETS)]
+        self.push_list([bullet] * len(node.children))
+
+    def visit_classifier(self, node: docutils.nodes.classifier) -> None:
+        # The classifiers are rendered by visit_term()
+        raise docutils.nodes.SkipNode
+
+    def visit_definition(self, node: docutils.nodes.definition) -> None:
+        self.indent += self.DEFINITION_INDENT
+
+    def visit_definition_list(self, node: docutils.nodes.definition_list) -> None:
+        # Do not let Click rewrap the definition list, see visit_literal_block()
+        self.parts.append("\n\n" + self.nowrap_marker)
 
     def visit_emphasis(self, node: docutils.nodes.emphasis) -> None:
         # This method is called for each emphasis node in the document. That is, for
@@ -168,39 +413,78 @@ class PlainTextVisitor(docutils.nodes.NodeVisitor):
             replacement_idx = self.process_url(txt)
             txt = replacement_idx
         # Prepend and append the emphasis with ANSI color codes
-        self.current_buffer.write(self.color_code(txt))
+        self.parts.append(self.color_code(txt))
         # Skip further processing of children by docutils since we've manually
         #  processed the text
         raise docutils.nodes.SkipNode
 
+    def visit_enumerated_list(self, node: docutils.nodes.enumerated_list) -> None:
+        start = node.get("start", 1)
+        enumtype = node.get("enumtype", "arabic")
+        prefix = node.get("prefix", "")
+        suffix = node.get("suffix", ".")
+        self.push_list(
+            [
+                prefix + format_enumerator(start + i, enumtype) + suffix
+                for i in range(len(node.children))
+            ]
+        )
+
+    def visit_field_list(self, node: docutils.nodes.field_list) -> None:
+        # Render the field list as a table with the field names in the first column
+        rows = []
+        for field in node.children:
+            name, body = typing.cast(list[docutils.nodes.Element], field.children)
+            rows.append([self.render_inline(name) + ":", self.render_inline(body)])
+        self.render_table(rows)
+        raise docutils.nodes.SkipNode
+
     def visit_list_item(self, node: docutils.nodes.list_item) -> None:
         # This method is called for each list item node in the document.
         # For example, for each item in a bullet list (unordered list
         # in reStructuredText).
-        self.current_list_item = io.StringIO()
-        self.current_buffer = (
-            self.current_list_item
-        )  # Switch to using the list item buffer
-        self.push_buffer_stack(self.current_list_item)
+        state = self.list_stack[-1]
+        marker = state.markers[state.next_item]
+        state.next_item += 1
+        if self.inline_depth:
+            # A list item in a table cell
+            self.parts.append(marker + " ")
+            return
+        self.item_prefix = state.indent + marker.ljust(state.marker_width)
+        self.indent = state.indent + " " * state.marker_width
+        if not node.children or not isinstance(node[0], docutils.nodes.paragraph):
+            # The item does not start with a paragraph, put the marker on its own line
+            self.parts.append(self.item_prefix.rstrip() + "\n")
+            self.item_prefix = None
 
     def visit_literal(self, node: docutils.nodes.literal) -> None:
         self.in_literal = True  # Entering a literal block
 
     def visit_literal_block(self, node: docutils.nodes.literal_block) -> None:
         txt = node.astext()
-        self.current_buffer.write(
-            "\n\n" + self.CLICK_PARAGRAPH_NOWRAP_MARKER + self.color_code(txt) + "\n\n"
-        )
+        if self.inline_depth:
+            # A literal block in a table cell
+            self.parts.append(self.color_code(txt))
+            raise docutils.nodes.SkipNode
+        highlighted_txt = None
+        # The code directive, e.g. ".. code-block:: python", sets the classes
+        # ["code", language]. Literal blocks created with "::" have no language
+        classes: list[str] = node.get("classes", [])
+        if self.highlighter and len(classes) > 1 and classes[0] == "code":
+            highlighted_txt = self.highlighter.highlight(txt, classes[1])
+        if highlighted_txt is None:
+            highlighted_txt = self.color_code(txt)
+        if self.indent:
+            highlighted_txt = textwrap.indent(highlighted_txt, self.indent)
+        if not self.nowrap_markers:
+            highlighted_txt = self.VERBATIM + highlighted_txt + self.VERBATIM
+        self.parts.append("\n\n" + self.nowrap_marker + highlighted_txt + "\n\n")
         # Prevent further processing of child nodes, as we've already processed the text
         raise docutils.nodes.SkipNode
 
     def visit_paragraph(self, node: docutils.nodes.paragraph) -> None:
-        if not self.in_bullet_list:
-            self.current_paragraph = io.StringIO()
-            self.current_buffer = (
-                self.current_paragraph
-            )  # Switch to using the paragraph buffer
-            self.push_buffer_stack(self.current_paragraph)
+        if not self.inline_depth:
+            self.begin_block()
 
     def visit_reference(self, node: docutils.nodes.reference) -> None:
         # This method is called for each reference node in the document. That is, for
@@ -209,29 +493,91 @@ class PlainTextVisitor(docutils.nodes.NodeVisitor):
         txt = node.astext()
         if txt.startswith("http://") or txt.startswith("https://"):
             # No special colors for URLs yet
-            self.current_buffer.write(txt)
+            self.parts.append(txt)
         else:
             # No special colors for internal references yet
             if "refuri" in node:
                 replacement_idx = self.process_url(node["refuri"])
-                self.current_buffer.write(f'"{txt}"')  # pragma: no cover
-                self.current_buffer.write(f" {self.color_code(replacement_idx)}")
+                self.parts.append(f'"{txt}"')  # pragma: no cover
+                self.parts.append(f" {self.color_code(replacement_idx)}")
             else:
-                self.current_buffer.write(txt)  # pragma: no cover
+                self.parts.append(txt)  # pragma: no cover
+        raise docutils.nodes.SkipNode
+
+    def visit_system_message(self, node: docutils.nodes.system_message) -> None:
+        # Problems with the reST markup are not shown in the help text, see lint.py
+        raise docutils.nodes.SkipNode
+
+    def visit_table(self, node: docutils.nodes.table) -> None:
+        # Render grid tables and simple tables. Cells that span several columns or
+        # rows are put in the first column and row of the span
+        rows: list[list[str]] = []
+        col_spans: dict[tuple[int, int], int] = {}
+        header_rows = 0
+        title = ""
+        for child in node.children:
+            if isinstance(child, docutils.nodes.title):
+                title = self.color_heading(child.astext())
+            if not isinstance(child, docutils.nodes.tgroup):
+                continue
+            num_cols = child["cols"]
+            # Number of rows that are still covered by a cell spanning several rows
+            row_spans = [0] * num_cols
+            for row in child.findall(docutils.nodes.row):
+                entries = iter(row.children)
+                cells: list[str] = []
+                while len(cells) < num_cols:
+                    col = len(cells)
+                    if row_spans[col]:
+                        row_spans[col] -= 1
+                        cells.append("")
+                        continue
+                    entry = typing.cast(docutils.nodes.Element, next(entries))
+                    cell = self.render_inline(entry)
+                    if isinstance(row.parent, docutils.nodes.thead):
+                        cell = self.color_heading(cell) if cell else cell
+                    cells.append(cell)
+                    span = min(entry.get("morecols", 0) + 1, num_cols - col)
+                    if span > 1:
+                        col_spans[(len(rows), col)] = span
+                        cells.extend([""] * (span - 1))
+                    for span_col in range(col, col + span):
+                        row_spans[span_col] = entry.get("morerows", 0)
+                if isinstance(row.parent, docutils.nodes.thead):
+                    header_rows = len(rows) + 1
+                rows.append(cells)
+        if title:
+            self.parts.append("\n\n" + self.nowrap_marker + title)
+        self.render_table(rows, header_rows, col_spans)
+        raise docutils.nodes.SkipNode
+
+    def visit_term(self, node: docutils.nodes.term) -> None:
+        # Render the term and its classifiers on a single line
+        txt = self.render_inline(node)
+        for sibling in node.parent.children:
+            if isinstance(sibling, docutils.nodes.classifier):
+                txt += " : " + self.render_inline(sibling)
+        self.parts.append(self.indent + txt + "\n")
         raise docutils.nodes.SkipNode
 
     def visit_Text(self, node: docutils.nodes.Text) -> None:
         txt = node.astext()
         if self.in_literal:
             # Wrap the text in ANSI codes for bright cyan
-            self.current_buffer.write(self.color_code(txt))
+            self.parts.append(self.color_code(txt))
         else:
-            self.current_buffer.write(txt)
+            self.parts.append(txt)
 
     def visit_title(self, node: docutils.nodes.title) -> None:
         # This method processes the section titles.
         txt = node.astext()
-        self.current_buffer.write("\n\b\n" + self.color_heading(txt) + "\n\b\n")
+        self.parts.append(
+            "\n"
+            + self.nowrap_marker
+            + self.color_heading(txt)
+            + "\n"
+            + self.nowrap_marker
+        )
         raise docutils.nodes.SkipNode
 
     def visit_title_reference(self, node: docutils.nodes.title_reference) -> None:
@@ -239,7 +585,7 @@ class PlainTextVisitor(docutils.nodes.NodeVisitor):
         # For example text in backticks (`text`).
         txt = node.astext()
         # TODO: How to color the text in backticks?
-        self.current_buffer.write(txt)
+        self.parts.append(txt)
         # Prevent further processing of child nodes, as we've already processed the text
         raise docutils.nodes.SkipNode
 
@@ -255,7 +601,18 @@ class PlainTextVisitor(docutils.nodes.NodeVisitor):
 
 class RstToAnsiConverter:
     def __init__(
-        self, docstring: str, base_url: str | None, colors: ColorDict | None = None
+        self,
+        docstring: str,
+        base_url: str | None,
+        colors: ColorDict | None = None,
+        monochrome: bool = False,
+        inventory: str | os.PathLike[str] | None = None,
+        cache_dir: str | os.PathLike[str] | None = None,
+        highlight: bool = False,
+        highlight_theme: str = "dark",
+        width: int | None = None,
+        nowrap_markers: bool = True,
+        context: RenderContext | None = None,
     ) -> None:
         # In reStructuredText (reST), indentation is significant, so if we want
         # to keep the docstring nicely formatted, i.e. with indentation according to
@@ -285,26 +642,65 @@ class RstToAnsiConverter:
         # fix_first_line_indentation():
         docstring = RstToAnsiConverter.fix_first_line_indentation(docstring)
         self.docstring = textwrap.dedent(docstring).strip()
-        self.base_url = base_url
-        self.colors = Colors(colors)
+        # The settings that are the same for all help texts, shared with the other
+        # converters of the same configuration, see context.py. If a context is
+        # given, the other settings arguments are ignored
+        if context is None:
+            context = get_render_context(
+                base_url, colors, inventory, cache_dir, highlight, highlight_theme
+            )
+        self.context = context
+        self.base_url = context.base_url
+        # If monochrome is True, the output will not contain any ANSI escape codes
+        self.monochrome = monochrome
+        self.colors = context.colors_for(monochrome)
+        self.inventory = context.inventory
+        # Syntax highlighting is not used for monochrome output
+        self.highlighter = context.highlighter if not monochrome else None
+        # The terminal width to render for. If None, the current terminal size is used
+        self.width = width
+        # If False, the output does not contain click's no-rewrap markers, see
+        # PlainTextVisitor
+        self.nowrap_markers = nowrap_markers
 
     def convert(self) -> str:
-        preprocessed_docstring = self.preprocess_docstring()
-        # Parse the reST docstring into a document tree
+        return self.render(self.parse())
+
+    def parse(self, report_level: int = QUIET_REPORT_LEVEL) -> docutils.nodes.document:
+        return self.parse_preprocessed(self.preprocess_docstring(), report_level)
+
+    def parse_preprocessed(
+        self, preprocessed_docstring: str, report_level: int = QUIET_REPORT_LEVEL
+    ) -> docutils.nodes.document:
+        # Parse the reST docstring into a document tree. Separate from parse(), such
+        # that the parse can be measured on its own, see benchmarks/bench_memory.py
         doctree = docutils.core.publish_doctree(
             source=preprocessed_docstring,
             source_path=None,
-            settings=None,
-            settings_overrides={"input_encoding": "unicode"},
+            # publish_doctree() modifies the settings, so each parse gets a copy
+            settings=copy.copy(parser_settings(report_level)),
         )
+        return typing.cast(docutils.nodes.document, doctree)
 
-        # Create a new document for the visitor to populate
-        visitor = PlainTextVisitor(docutils.utils.new_document("<string>"), self.colors)
+    def render(self, doctree: docutils.nodes.document) -> str:
+        # The visitor only needs the reporter of its document. The document is
+        # created with the cached settings, creating new settings would take longer
+        # than rendering a short help text
+        visitor = PlainTextVisitor(
+            docutils.utils.new_document(
+                "<string>", parser_settings(QUIET_REPORT_LEVEL)
+            ),
+            self.colors,
+            self.monochrome,
+            self.highlighter,
+            self.width,
+            self.nowrap_markers,
+        )
         doctree.walkabout(visitor)
         # Call finalize to append URLs
         visitor.finalize()
         # Join the collected parts into a single string
-        return visitor.main_buffer.getvalue().strip()
+        return visitor.astext()
 
     @staticmethod
     def fix_first_line_indentation(docstring: str) -> str:
@@ -329,62 +725,250 @@ class RstToAnsiConverter:
         adjusted_docstring = "\n".join(lines)
         return adjusted_docstring
 
-    # The sphinx :doc: role is used to link to other documentation files. It is not part
-    # of the reStructuredText standard, but is commonly used in Sphinx projects. Since we
-    # are using docutils to parse the docstrings, we need to preprocess the docstrings to
-    # handle the :doc: role. This function preprocesses the docstring to replace
-    # :doc:`path` and :doc:`text <path>` with
-    # URLs to the documentation files. The URLs are constructed based on the base URL and the
-    # path to the documentation file.
+    # Sphinx roles like :doc:, :ref: and :func: are used to link to other parts of
+    # the documentation. They are not part of the reStructuredText standard, but are
+    # commonly used in Sphinx projects. Since we are using docutils to parse the
+    # docstrings, we need to preprocess the docstrings to replace the roles with
+    # URLs to the documentation. See RoleResolver for more information.
     def preprocess_docstring(self) -> str:
-        # This pattern matches :doc:`text <path>` and captures "text" and "path" separately.
-        # It also matches :doc:`path` directly when there's no "text <path>" format.
-        pattern = r":doc:`(?:([^`<]+)<)?([^`>]+)>?`"
-
-        def replace_with_url(match: re.Match) -> str:  # type: ignore
-            text = match.group(1)  # "text" part or None if not present
-            path = match.group(2).lstrip(
-                "/"
-            )  # "path" part, leading slash removed if present
-
-            # Construct full URL
-            doc_url = self.base_url + path + ".html"
-
-            # If there was descriptive text, insert it in double quotes
-            if text:
-                display_text = '"' + text.strip() + '" '
-            else:
-                display_text = ""
-
-            # Return formatted string with "text" followed by the URL in emphasis
-            return f"{display_text}*{doc_url}*"
-
-        # Replace :doc:`some-text` or :doc:`text <path>` with formatted string
-        processed_docstring = re.sub(pattern, replace_with_url, self.docstring)
-        return processed_docstring
+        return RoleResolver(self.base_url, self.inventory).resolve(self.docstring)
 
 
 class FormatHelpMixin:
-    def __init__(self, base_url: str | None = None, colors: ColorDict | None = None):
+    # The number of converted help texts kept per command, e.g. 16 terminal widths in
+    # color and monochrome
+    MAX_CONVERTED = 32
+
+    def __init__(
+        self,
+        base_url: str | None = None,
+        colors: ColorDict | None = None,
+        inventory: str | os.PathLike[str] | None = None,
+        cache_dir: str | os.PathLike[str] | None = None,
+        highlight: bool = False,
+        highlight_theme: str = "dark",
+        artifact: str | os.PathLike[str] | None = None,
+        help_file: HelpSource | None = None,
+        render_context: RenderContext | None = None,
+    ):
         self.base_url = base_url
         self.colors = colors
+        self.inventory = inventory
+        self.cache_dir = cache_dir
+        self.highlight = highlight
+        self.highlight_theme = highlight_theme
+        self.artifact = artifact
+        # Converted help text, by (help text, monochrome, width). It is filled when
+        # the help is shown, or in advance by warm(), see warm.py. It holds at most
+        # MAX_CONVERTED entries, see cached_convert_help()
+        self.converted: dict[tuple[str, bool, int], str] = {}
+        self.converted_lock = threading.Lock()
+        # If given, the help text is read from this file instead of the help attribute
+        self.help_file = HelpFile(help_file) if help_file is not None else None
+        # Shared by the commands with the same settings, make_rst_to_ansi_formatter()
+        # creates it once for all commands of a class
+        self.render_context = render_context or get_render_context(
+            base_url, colors, inventory, cache_dir, highlight, highlight_theme
+        )
 
-    def format_help(self, ctx: click.Context, formatter: click.HelpFormatter) -> None:
-        # Assume that the click command superclass has a help attribute
-        # See click source code:
+    def get_help_source(self) -> str | None:
+        # The reST help text. Assume that the click command superclass has a help
+        # attribute, see click source code:
         # https://github.com/pallets/click/blob/f8857cb03268b5b952b88b2acb3e11d9f0f7b6e4/src/click/core.py#L1042
+        # The help attribute is also used if the help file cannot be read
+        if self.help_file is not None:
+            text = self.help_file.read()
+            if text is not None:
+                return text
+        return typing.cast(str | None, getattr(self, "help", None))
+
+    def make_converter(
+        self, help_text: str, monochrome: bool, width: int | None = None
+    ) -> RstToAnsiConverter:
+        return RstToAnsiConverter(
+            help_text,
+            self.base_url,
+            self.colors,
+            monochrome=monochrome,
+            inventory=self.inventory,
+            cache_dir=self.cache_dir,
+            highlight=self.highlight,
+            highlight_theme=self.highlight_theme,
+            width=width,
+            # The help text is written as is, see format_help_text()
+            nowrap_markers=False,
+            context=self.render_context,
+        )
+
+    def convert_help(
+        self, help_text: str, monochrome: bool, width: int | None = None
+    ) -> str:
+        return self.make_converter(help_text, monochrome, width).convert()
+
+    def cached_convert_help(self, help_text: str, monochrome: bool, width: int) -> str:
+        key = (help_text, monochrome, width)
+        text = self.converted.get(key)
+        if text is None:
+            text = self.convert_help(help_text, monochrome, width)
+            # Like HelpCache.set_memory(), the oldest entry is evicted under a lock,
+            # the help can be shown from several threads
+            with self.converted_lock:
+                if len(self.converted) >= self.MAX_CONVERTED:
+                    del self.converted[next(iter(self.converted))]
+                self.converted[key] = text
+        return text
+
+    def convert_help_file(
+        self, help_file: HelpFile, monochrome: bool, width: int
+    ) -> str | None:
+        # The converted help file is stored in the help cache, with the modification
+        # time and size of the file in the key. A new process then only needs to stat
+        # the file, it is not read or parsed again unless it has changed. Returns None
+        # if the file cannot be read
+        try:
+            stamp = help_file.stamp()
+        except OSError:
+            return None
+        if stamp is None:
+            # A resource that is not a file, it does not change
+            help_text = help_file.read()
+            if help_text is None:
+                return None
+            return self.cached_convert_help(
+                help_text.partition("\f")[0], monochrome, width
+            )
+        cache = get_cache(self.cache_dir)
+        key = cache.make_key(
+            "help-file",
+            str(help_file.path),
+            *map(str, stamp),
+            str(monochrome),
+            str(width),
+            self.render_context.cache_key(),
+        )
+        text = cache.get(key)
+        if text is None:
+            help_text = help_file.read()
+            if help_text is None:
+                return None
+            text = self.cached_convert_help(
+                help_text.partition("\f")[0], monochrome, width
+            )
+            cache.set(key, text)
+        return text
+
+    def lookup_artifact(
+        self, ctx: click.Context, help_text: str, monochrome: bool, width: int
+    ) -> str | None:
+        # Look up the precomputed help text in the artifact, see artifact.py
+        artifact = get_artifact(self.artifact) if self.artifact else None
+        if artifact is None or width != textutils.width_bucket(width):
+            # The artifact has the help text for the width buckets of terminals, not
+            # for other widths set in the click context, see terminal.help_width()
+            return None
+        return artifact.lookup(
+            artifact_key(command_path(ctx), width, monochrome, help_text)
+        )
+
+    def format_help_section(self, ctx: click.Context, name: str) -> str:
+        """Convert only the section of the help text with the title name.
+
+        The section is found without parsing the rest of the help text, see
+        sections.py. Raises click.BadParameter if there is no such section.
+        """
+        help_text = textwrap.dedent(
+            RstToAnsiConverter.fix_first_line_indentation(
+                (self.get_help_source() or "").partition("\f")[0]
+            )
+        )
+        section = find_section(help_text, name)
+        if section is None:
+            titles = ", ".join(section_titles(help_text)) or "none"
+            raise click.BadParameter(
+                f"No section {name!r} in the help text. Sections: {titles}."
+            )
+        color = ctx.color if ctx.color is not None else colors_enabled()
+        return self.cached_convert_help(section, not color, help_width(ctx))
+
+    def format_help_text(
+        self, ctx: click.Context, formatter: click.HelpFormatter
+    ) -> None:
+        # This replaces click's Command.format_help_text(), see click source code:
+        # https://github.com/pallets/click/blob/f8857cb03268b5b952b88b2acb3e11d9f0f7b6e4/src/click/core.py#L1042
+        # The converted help text is already wrapped and indented, so it is written
+        # directly to the formatter instead of being rewrapped by click's wrap_text().
+        # The help attribute is not modified, such that the help can be formatted
+        # again, e.g. with other colors
         help_text: str | None = typing.cast(str | None, getattr(self, "help", None))
-        if help_text is not None:
-            updated_help_text = RstToAnsiConverter(
-                help_text, self.base_url, self.colors
-            ).convert()
-            setattr(self, "help", updated_help_text)
-        super().format_help(ctx, formatter)  # type: ignore # Call the superclass method
+        text = None
+        # Use click's color setting if it is given, see the "color" parameter
+        # of click.Context. Otherwise, we check if the output supports colors
+        color = ctx.color if ctx.color is not None else colors_enabled()
+        # The width from the context or the terminal, see terminal.py
+        width = help_width(ctx)
+        if self.help_file is not None:
+            # None if the file cannot be read, the help attribute is then used
+            text = self.convert_help_file(self.help_file, not color, width)
+        if text is None and help_text is not None:
+            # Like click, truncate the help text to the first form feed
+            help_text = help_text.partition("\f")[0]
+            # Use the precomputed help text from the artifact if there is one
+            converted = self.lookup_artifact(ctx, help_text, not color, width)
+            text = (
+                converted
+                if converted is not None
+                else self.cached_convert_help(help_text, not color, width)
+            )
+        self.write_help_text(formatter, text or "")
+
+    def write_help_text(self, formatter: click.HelpFormatter, text: str) -> None:
+        # Write the converted help text, indented like click's help text
+        if getattr(self, "deprecated", False):
+            text = f"(Deprecated) {text}"
+        if text:
+            formatter.write_paragraph()
+            with formatter.indentation():
+                indent = " " * formatter.current_indent
+                formatter.write(
+                    "".join(
+                        f"{indent}{line}\n" if line else "\n"
+                        for line in text.splitlines()
+                    )
+                )
+
+    def get_short_help_str(self, limit: int = 45) -> str:
+        # Used for the list of commands in the help of a group. Click creates it from
+        # the help attribute, which is None if the help is read from a file
+        if self.help_file is not None and not getattr(self, "short_help", None):
+            help_text = self.help_file.read()
+            if help_text is not None:
+                help_text = help_text.partition("\f")[0]
+                return click.utils.make_default_short_help(help_text.strip(), limit)
+        return typing.cast(str, super().get_short_help_str(limit))  # type: ignore
+
+
+def show_help_section(ctx: click.Context, param: click.Parameter, value: str) -> None:
+    # Callback of the --help-section option, see make_rst_to_ansi_formatter()
+    if value is None or ctx.resilient_parsing:
+        return
+    cmd = typing.cast(FormatHelpMixin, ctx.command)
+    click.echo(cmd.format_help_section(ctx, value), color=ctx.color)
+    ctx.exit()
 
 
 # Factory function that creates a custom formatter class with a base URL
 def make_rst_to_ansi_formatter(
-    base_url: str, colors: ColorDict | None = None, group: bool = False
+    base_url: str,
+    colors: ColorDict | None = None,
+    group: bool = False,
+    inventory: str | os.PathLike[str] | None = None,
+    cache_dir: str | os.PathLike[str] | None = None,
+    highlight: bool = False,
+    highlight_theme: str = "dark",
+    artifact: str | os.PathLike[str] | None = None,
+    help_section: bool = False,
+    help_search: bool = False,
+    help_file: HelpSource | None = None,
 ) -> "CustomRstToAnsiFormatter":  # type: ignore  # noqa: F821
     """
     Create a reST to ANSI text formatter class.
@@ -393,20 +977,64 @@ def make_rst_to_ansi_formatter(
     :type base_url: str
     :param dict[str, dict] colors: The colors to use when translating reST formatting codes. If not provided, default colors will be used. The dictionary should have keys "heading", "url", and "code" with values that are dictionaries with keys "fg" and "style" that specify the foreground color and style to use. The default value is: ``{ "heading": {"fg": Fore.GREEN, "style": Style.BRIGHT}, "url": {"fg": Fore.CYAN, "style": Style.BRIGHT}, "code": {"fg": Fore.CYAN, "style": Style.DIM}, }``. For more information about the "fg" and "style" values, see the `colorama documentation <https://pypi.org/project/colorama/>`_.
     :param bool group: If True, a ``click.Group`` will be returned, otherwise a ``click.Command`` will be returned. The default is False.
+    :param inventory: Path to a Sphinx ``objects.inv`` inventory for the documentation at ``base_url``. If given, the Sphinx roles ``:ref:``, ``:func:``, ``:class:``, ``:option:`` etc. are resolved to URLs using the inventory. The inventory is only read when a role needs to be looked up. If not given, these roles are rendered without URLs.
+    :type inventory: str | os.PathLike | None
+    :param cache_dir: Directory where cached data, like the index of the inventory, is stored. The default is the user's cache directory, for example ``~/.cache/sphinx-click-rst-to-ansi-formatter`` on Linux.
+    :type cache_dir: str | os.PathLike | None
+    :param bool highlight: If True, code blocks with a language, e.g. ``.. code-block:: python``, are syntax highlighted with `Pygments <https://pygments.org/>`_ if it is installed. Pygments is only imported when a code block is highlighted, and the result is cached in memory and in ``cache_dir``. The default is False.
+    :param str highlight_theme: The terminal background for the syntax highlighting, ``"dark"`` or ``"light"``. The default is ``"dark"``.
+    :param artifact: Path to a help artifact created with ``build_help_artifact()`` from ``sphinx_click.rst_to_ansi_formatter.artifact``. The artifact contains the converted help text of every command, and is memory-mapped such that only the help text of the requested command is read. If the artifact is missing, or does not contain the help text for the command and terminal width, the help text is converted as usual.
+    :type artifact: str | os.PathLike | None
+    :param bool help_section: If True, the command gets a ``--help-section NAME`` option that shows only the section of the help text with the title ``NAME`` (case-insensitive), e.g. ``--help-section examples``. Only that section is converted. The default is False.
+    :param bool help_search: If True and ``group`` is True, the group gets a ``help-search QUERY`` subcommand that searches the help text of all commands. The search index is built the first time it is needed and is stored in ``cache_dir``. The default is False.
+    :param help_file: A reST file with the help text of the command, used instead of the docstring or the ``help`` argument. Either a path, or a resource like ``importlib.resources.files("my_package") / "help" / "command.rst"``. The file is only read when the help is shown, and the converted help text is stored in ``cache_dir``, such that the file is not read or converted again unless its modification time or size changes. If the file cannot be read, e.g. because it was deleted, the ``help`` argument is used instead.
+    :type help_file: str | os.PathLike | importlib.resources.abc.Traversable | None
 
     :rtype: ``CustomRstToAnsiFormatter``
     :return: Returns a sub class of ``click.Command`` that can be used to convert help text from reST to ANSI terminal color encoded text
     """
     base_cls = click.Group if group else click.Command
+    # The settings shared by all commands of the class, see context.py
+    render_context = get_render_context(
+        base_url, colors, inventory, cache_dir, highlight, highlight_theme
+    )
 
     # NOTE: It is important to have the FormatHelpMixin as the first base class
-    #      such that when click calls self.format_help() it will call format_help()
+    #      such that when click calls self.format_help_text() it will call
+    #      format_help_text()
     #      in the FormatHelpMixin class and not the one in the base_cls.
     class CustomRstToAnsiFormatter(FormatHelpMixin, base_cls):  # type: ignore
         def __init__(self, *args: Any, **kwargs: Any) -> None:
             # Initialize FormatHelpMixin with specific arguments
-            FormatHelpMixin.__init__(self, base_url=base_url, colors=colors)
+            FormatHelpMixin.__init__(
+                self,
+                base_url=base_url,
+                colors=colors,
+                inventory=inventory,
+                cache_dir=cache_dir,
+                highlight=highlight,
+                highlight_theme=highlight_theme,
+                artifact=artifact,
+                help_file=help_file,
+                render_context=render_context,
+            )
             # Pass all positional and keyword arguments to the base class initializer
             base_cls.__init__(self, *args, **kwargs)  # type: ignore
+            if help_section:
+                self.params.append(
+                    click.Option(
+                        ["--help-section"],
+                        metavar="NAME",
+                        expose_value=False,
+                        is_eager=True,
+                        callback=show_help_section,
+                        help="Show only the section NAME of the help text and exit.",
+                    )
+                )
+            if help_search and group:
+                # Import here to avoid a circular import, search.py uses this module
+                from .search import help_search as help_search_command
+
+                self.add_command(help_search_command)
 
     return CustomRstToAnsiFormatter
@@ -0,0 +1,64 @@
+import os
+import sys
+from pathlib import Path
+
+if sys.version_info >= (3, 11):
+    from importlib.resources.abc import Traversable
+else:  # pragma: no cover
+    # importlib.resources.abc was added in Python 3.11
+    from importlib.abc import Traversable
+
+# A help file is either a path, or a resource from importlib.resources, e.g.
+# importlib.resources.files("my_package") / "help" / "command.rst"
+HelpSource = str | os.PathLike[str] | Traversable
+
+
+class HelpFile:
+    """The help text of a command, read from a reST file when it is first needed.
+
+    The text is read again only if the modification time or the size of the file has
+    changed. Resources that are not files, e.g. in a zip archive, are read once. If the
+    file cannot be read, read() returns None and the error is kept in ``error``.
+    """
+
+    def __init__(self, source: HelpSource) -> None:
+        self.path: Path | None = None
+        self.resource: Traversable | None = None
+        # Note that a pathlib.Path is both os.PathLike and Traversable
+        if isinstance(source, (str, os.PathLike)):
+            self.path = Path(source)
+        else:
+            self.resource = source
+        self.text: str | None = None
+        self.text_stamp: tuple[int, int] | None = None
+        # The error of the last read(), e.g. if the file was deleted
+        self.error: OSError | None = None
+
+    def stamp(self) -> tuple[int, int] | None:
+        """Return the (modification time, size) of the file, None for resources.
+
+        Raises OSError if the file does not exist.
+        """
+        if self.path is None:
+            return None
+        stat = self.path.stat()
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def read(self) -> str | None:
+        """Return the text of the file, None if it cannot be read."""
+        try:
+            stamp = self.stamp()
+            if self.text is None or stamp != self.text_stamp:
+                if self.path is not None:
+                    self.text = self.path.read_text(encoding="utf-8")
+                else:
+                    assert self.resource is not None
+                    self.text = self.resource.read_text(encoding="utf-8")
+                self.text_stamp = stamp
+        except OSError as error:
+            # A missing help file should not break the help output, like a missing
+            # inventory or artifact. The command then falls back to its help attribute
+            self.error = error
+            return None
+        self.error = None
+        return self.text
@@ -0,0 +1,47 @@
+from .cache import HelpCache, distribution_version
+
+
+def pygments_highlight(code: str, language: str, theme: str) -> str | None:
+    # Pygments is imported here, and not at the top of the module, such that we only
+    # pay for the import when a literal block actually needs to be highlighted
+    try:
+        import pygments  # type: ignore[import-untyped]
+        import pygments.formatters  # type: ignore[import-untyped]
+        import pygments.lexers  # type: ignore[import-untyped]
+        import pygments.util  # type: ignore[import-untyped]
+    except ImportError:
+        return None
+    try:
+        lexer = pygments.lexers.get_lexer_by_name(language)
+    except pygments.util.ClassNotFound:
+        return None
+    formatter = pygments.formatters.TerminalFormatter(bg=theme)
+    result: str = pygments.highlight(code, lexer, formatter)
+    return result.rstrip("\n")
+
+
+class Highlighter:
+    """Syntax highlighting of literal blocks with Pygments.
+
+    :param str theme: The terminal background, ``"dark"`` or ``"light"``.
+    :param HelpCache cache: The highlighted code is cached per (code, language, theme)
+        and Pygments version.
+    """
+
+    def __init__(self, theme: str, cache: HelpCache) -> None:
+        self.theme = theme
+        self.cache = cache
+
+    def highlight(self, code: str, language: str) -> str | None:
+        """Return the highlighted code, or None if it could not be highlighted."""
+        # The Pygments version is read from the package metadata, such that a cache
+        # hit does not import Pygments
+        key = HelpCache.make_key(
+            "highlight", distribution_version("pygments"), language, self.theme, code
+        )
+        result = self.cache.get(key)
+        if result is None:
+            result = pygments_highlight(code, language, self.theme)
+            if result is not None:
+                self.cache.set(key, result)
+        return result
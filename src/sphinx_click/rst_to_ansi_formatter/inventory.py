@@ -0,0 +1,149 @@
+import hashlib
+import mmap
+import os
+import re
+import zlib
+from pathlib import Path
+
+from .cache import default_cache_dir, write_atomic
+
+# Regular expression for a line in a Sphinx objects.inv inventory (version 2). This is
+# the same expression that Sphinx uses when it reads inventories. It handles names with
+# embedded spaces.
+INVENTORY_LINE_RE = re.compile(r"(.+?)\s+(\S+)\s+(-?\d+)\s+?(\S*)\s+(.*)")
+
+
+def read_inventory(data: bytes) -> list[tuple[str, str, str, str]]:
+    """Parse the contents of a Sphinx ``objects.inv`` file.
+
+    :return: A list of ``(type, name, uri, dispname)`` tuples, where type is of the
+        form ``domain:objtype``, for example ``py:function``.
+    """
+    lines = data.split(b"\n", 4)
+    if len(lines) < 5 or not lines[0].startswith(b"# Sphinx inventory version 2"):
+        raise ValueError("Not a Sphinx inventory version 2 file.")
+    if b"zlib" not in lines[3]:
+        raise ValueError("Invalid inventory header (not compressed).")
+    body = zlib.decompress(lines[4]).decode("utf-8")
+    entries = []
+    for line in body.splitlines():
+        m = INVENTORY_LINE_RE.match(line.rstrip())
+        if not m:
+            continue
+        name, objtype, _priority, uri, dispname = m.groups()
+        if ":" not in objtype:
+            continue
+        if uri.endswith("$"):
+            uri = uri[:-1] + name
+        if dispname == "-":
+            dispname = name
+        entries.append((objtype, name, uri, dispname))
+    return entries
+
+
+def build_index(entries: list[tuple[str, str, str, str]]) -> bytes:
+    """Return a compact index of the inventory entries.
+
+    The index has one line ``type<TAB>name<TAB>uri<TAB>dispname`` per entry, sorted by
+    ``type<TAB>name`` such that an entry can be found with a binary search without
+    reading the whole index.
+    """
+    lines: dict[bytes, bytes] = {}
+    for objtype, name, uri, dispname in entries:
+        key = f"{objtype}\t{name}".encode("utf-8")
+        # Keep the first entry for a given key, like Sphinx does for modules
+        if key not in lines:
+            lines[key] = key + f"\t{uri}\t{dispname}\n".encode("utf-8")
+    return b"".join(lines[key] for key in sorted(lines))
+
+
+def write_index(index: bytes, index_path: Path) -> None:
+    """Write an index created with build_index() to ``index_path``."""
+    write_atomic(index_path, index)
+
+
+class Inventory:
+    """Lookup of Sphinx cross-reference targets in an ``objects.inv`` file.
+
+    The inventory is decompressed once into a sorted index file in the cache directory.
+    Nothing is read until the first call to :meth:`lookup`, and then the index file is
+    memory-mapped and searched with a binary search. If the cache directory is not
+    writable, the index is kept in memory.
+    """
+
+    def __init__(
+        self, path: str | os.PathLike[str], cache_dir: str | os.PathLike[str] | None
+    ) -> None:
+        self.path = Path(path)
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+        self.index: mmap.mmap | bytes | None = None
+
+    def index_path(self) -> Path:
+        # The name of the index depends on the path, size and modification time of the
+        # inventory. So if the inventory changes, a new index is created
+        stat = self.path.stat()
+        key = f"{self.path.resolve()}:{stat.st_size}:{stat.st_mtime_ns}"
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+        return self.cache_dir / f"inventory-{digest}.idx"
+
+    def load_index(self) -> mmap.mmap | bytes:
+        try:
+            index_path = self.index_path()
+            if not index_path.exists():
+                index = build_index(read_inventory(self.path.read_bytes()))
+                try:
+                    write_index(index, index_path)
+                except OSError:
+                    # The cache directory is not writable, the index is then kept in
+                    # memory and built again by the next process
+                    return index
+            with open(index_path, "rb") as fh:
+                if os.fstat(fh.fileno()).st_size == 0:
+                    return b""
+                return mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError, zlib.error):
+            # A missing or broken inventory should not break the help output. The roles
+            # are then rendered as if the targets were not found
+            return b""
+
+    def lookup(self, objtype: str, name: str) -> tuple[str, str] | None:
+        """Find an object in the inventory.
+
+        :param str objtype: The object type, for example ``py:function``.
+        :param str name: The name of the object.
+        :return: A ``(uri, dispname)`` tuple or None if the object was not found.
+        """
+        if self.index is None:
+            self.index = self.load_index()
+        index = self.index
+        key = f"{objtype}\t{name}".encode("utf-8")
+        # Binary search over the lines of the index. Invariant: lo and hi are always at
+        # the start of a line (or at the end of the index)
+        lo, hi = 0, len(index)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = index.rfind(b"\n", 0, mid) + 1
+            end = index.find(b"\n", start)
+            fields = index[start:end].split(b"\t", 3)
+            line_key = fields[0] + b"\t" + fields[1]
+            if line_key == key:
+                return fields[2].decode("utf-8"), fields[3].decode("utf-8")
+            if line_key < key:
+                lo = end + 1
+            else:
+                hi = start
+        return None
+
+
+# Inventories are shared by all commands in the process, such that each index is
+# opened at most once
+_inventories: dict[tuple[Path, Path | None], Inventory] = {}
+
+
+def get_inventory(
+    path: str | os.PathLike[str], cache_dir: str | os.PathLike[str] | None = None
+) -> Inventory:
+    key = (Path(path), Path(cache_dir) if cache_dir else None)
+    if key not in _inventories:
+        _inventories[key] = Inventory(path, cache_dir)
+    return _inventories[key]
@@ -0,0 +1,118 @@
+"""Check the reST help text of all commands of a CLI.
+
+When the help text is shown, problems with the reST markup are not reported, see
+PARSER_SETTINGS in formatter.py. Run this module, e.g. in CI, to find them::
+
+    python -m sphinx_click.rst_to_ansi_formatter.lint my_package.cli:main
+"""
+
+import importlib
+import typing
+
+import click
+import docutils.nodes
+
+from .commands import iter_commands
+from .formatter import FormatHelpMixin
+
+# Names of docutils' system message levels
+LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "SEVERE")
+
+
+class Diagnostic(typing.NamedTuple):
+    command_path: str
+    # The line number in the help text, if docutils knows it
+    line: int | None
+    level: int
+    message: str
+
+    def __str__(self) -> str:
+        line = f":{self.line}" if self.line is not None else ""
+        return f"{self.command_path}{line}: {LEVELS[self.level]}: {self.message}"
+
+
+def lint_command(
+    command_path: str, cmd: click.Command, report_level: int = 2
+) -> list[Diagnostic]:
+    """Parse the help text of cmd and return the messages at or above report_level."""
+    if not isinstance(cmd, FormatHelpMixin):
+        # Plain click commands do not use reST help text
+        return []
+    diagnostics = []
+    help_text = cmd.get_help_source()
+    if cmd.help_file is not None and cmd.help_file.error is not None:
+        # The help is then shown without the help file, see get_help_source()
+        diagnostics.append(
+            Diagnostic(
+                command_path,
+                None,
+                LEVELS.index("ERROR"),
+                f"Cannot read the help file: {cmd.help_file.error}",
+            )
+        )
+    if help_text is None:
+        return diagnostics
+    doctree = cmd.make_converter(help_text, monochrome=True).parse(report_level)
+    return diagnostics + [
+        Diagnostic(
+            command_path,
+            node.get("line"),
+            node["level"],
+            # The first child is a paragraph with the message, it can be followed by
+            # a literal block with the offending markup
+            node.children[0].astext().replace("\n", " "),
+        )
+        for node in doctree.findall(docutils.nodes.system_message)
+        # The parser adds some messages to the document tree regardless of the level
+        if node["level"] >= report_level
+    ]
+
+
+def lint(cli: click.Command, report_level: int = 2) -> list[Diagnostic]:
+    """Parse the help text of cli and all its subcommands and return the messages."""
+    diagnostics = []
+    for command_path, cmd in iter_commands(cli):
+        diagnostics.extend(lint_command(command_path, cmd, report_level))
+    return diagnostics
+
+
+def load_command(spec: str) -> click.Command:
+    """Import a command given as ``"package.module:attribute"``."""
+    module_name, _, attribute = spec.partition(":")
+    if not attribute:
+        raise click.BadParameter(f"Expected MODULE:ATTRIBUTE, got {spec!r}.")
+    try:
+        obj: object = importlib.import_module(module_name)
+        for name in attribute.split("."):
+            obj = getattr(obj, name)
+    except (ImportError, AttributeError) as exc:
+        raise click.BadParameter(f"Cannot import {spec!r}: {exc}") from exc
+    if not isinstance(obj, click.Command):
+        raise click.BadParameter(f"{spec!r} is not a click command.")
+    return obj
+
+
+@click.command()
+@click.argument("cli", metavar="MODULE:ATTRIBUTE")
+@click.option(
+    "--level",
+    type=click.Choice([level.lower() for level in LEVELS[1:]]),
+    default="warning",
+    show_default=True,
+    help="Report messages at or above this level.",
+)
+@click.pass_context
+def main(ctx: click.Context, cli: str, level: str) -> None:
+    """Check the reST help text of the click command CLI and its subcommands.
+
+    Exits with status 1 if any problems were found.
+    """
+    diagnostics = lint(load_command(cli), LEVELS.index(level.upper()))
+    for diagnostic in diagnostics:
+        click.echo(str(diagnostic))
+    if diagnostics:
+        ctx.exit(1)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
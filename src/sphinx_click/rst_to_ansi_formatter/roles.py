@@ -0,0 +1,120 @@
+import re
+
+from .inventory import Inventory
+
+# This pattern matches an interpreted text role with an optional domain, for example
+# :doc:`path`, :func:`text <target>` or :py:class:`~module.Class`. It captures the
+# "domain", the "role" and the "content" between the backticks.
+ROLE_RE = re.compile(r":(?:(?P<domain>[a-z]+):)?(?P<role>[a-z]+):`(?P<content>[^`]+)`")
+
+# This pattern splits the role content "text <target>" into "text" and "target"
+TITLE_TARGET_RE = re.compile(r"^(.+?)\s*<([^<>]+)>$", re.DOTALL)
+
+# The Sphinx roles we resolve, and the inventory object types they can refer to
+ROLE_OBJECT_TYPES: dict[str, tuple[str, ...]] = {
+    "doc": ("std:doc",),
+    "ref": ("std:label",),
+    "term": ("std:term",),
+    "option": ("std:cmdoption",),
+    "envvar": ("std:envvar",),
+    "func": ("py:function",),
+    "meth": ("py:method", "py:classmethod", "py:staticmethod"),
+    "class": ("py:class", "py:exception"),
+    "mod": ("py:module",),
+    "attr": ("py:attribute", "py:property"),
+    "exc": ("py:exception", "py:class"),
+    "data": ("py:data",),
+    "obj": (
+        "py:function",
+        "py:class",
+        "py:method",
+        "py:attribute",
+        "py:property",
+        "py:data",
+        "py:module",
+        "py:exception",
+    ),
+}
+
+# Roles that refer to code, these are shown as inline literals if they have no title
+CODE_ROLES = {
+    "option",
+    "envvar",
+    "func",
+    "meth",
+    "class",
+    "mod",
+    "attr",
+    "exc",
+    "data",
+    "obj",
+}
+
+
+class RoleResolver:
+    """Replace Sphinx roles in a docstring with plain reST.
+
+    The :doc: role is resolved relative to ``base_url``. The other roles are looked up
+    in the Sphinx inventory, if one is given, and replaced with the title of the target
+    followed by the URL. Roles that cannot be resolved are replaced by their title, such
+    that docutils does not report them as unknown roles. All roles are handled in a
+    single pass over the docstring.
+    """
+
+    def __init__(self, base_url: str | None, inventory: Inventory | None = None):
+        self.base_url = base_url or ""
+        self.inventory = inventory
+
+    def lookup(self, role: str, target: str) -> tuple[str, str] | None:
+        if self.inventory is None:
+            return None
+        if role in ("ref", "term"):
+            # Sphinx stores labels and glossary terms in lower case
+            target = target.lower()
+        elif role == "option":
+            # Sphinx stores options as "program.--option"
+            target = target.replace(" ", ".")
+        for objtype in ROLE_OBJECT_TYPES[role]:
+            entry = self.inventory.lookup(objtype, target)
+            if entry is not None:
+                return entry
+        return None
+
+    def replace_role(self, match: re.Match[str]) -> str:
+        domain, role, content = match.group("domain", "role", "content")
+        if domain not in (None, "py", "std") or role not in ROLE_OBJECT_TYPES:
+            # Not a role that we know about, leave it to docutils
+            return match.group(0)
+        m = TITLE_TARGET_RE.match(content)
+        title, target = (m.group(1).strip(), m.group(2)) if m else (None, content)
+        # A target starting with "!" should not be linked
+        no_link = target.startswith("!")
+        target = target.lstrip("!")
+        if role == "doc":
+            return self.replace_doc_role(title, target)
+        # A target starting with "~" is displayed with only its last component
+        shorten = target.startswith("~")
+        target = target.lstrip("~")
+        entry = None if no_link else self.lookup(role, target)
+        url = self.base_url + entry[0] if entry else None
+        if title:
+            return f'"{title}" *{url}*' if url else title
+        if role in CODE_ROLES:
+            display = target.rsplit(".", 1)[-1] if shorten else target
+            if role in ("func", "meth") and not display.endswith(")"):
+                display += "()"
+            display = f"``{display}``"
+        else:
+            display = f'"{entry[1]}"' if entry else target
+        return f"{display} *{url}*" if url else display
+
+    def replace_doc_role(self, title: str | None, path: str) -> str:
+        # Construct the URL for the documentation page, leading slash removed
+        doc_url = self.base_url + path.lstrip("/") + ".html"
+        # If there was descriptive text, insert it in double quotes
+        display_text = f'"{title}" ' if title else ""
+        # Return formatted string with "text" followed by the URL in emphasis
+        return f"{display_text}*{doc_url}*"
+
+    def resolve(self, docstring: str) -> str:
+        return ROLE_RE.sub(self.replace_role, docstring)
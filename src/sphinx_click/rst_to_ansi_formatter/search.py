@@ -0,0 +1,195 @@
+"""Full-text search in the help text of all commands of a CLI.
+
+The index maps each term to the sections of the help text that contain it, see
+SearchIndex. It is built from the converted, monochrome help text the first time it is
+needed, and is stored in the help cache (see cache.py), such that later searches only
+need to load it. The key of the index is a hash of the help text of all commands, so
+the index is rebuilt when a help text changes.
+"""
+
+import bisect
+import json
+import re
+import textwrap
+import typing
+
+import click
+
+from .cache import HelpCache, get_cache
+from .colors import Colors, MonochromeColors, colors_enabled
+from .commands import iter_commands
+from .formatter import FormatHelpMixin, RstToAnsiConverter
+from .sections import split_sections
+from .types import ColorDict
+
+# Change this when the format of the index changes
+SEARCH_INDEX_VERSION = "1"
+# The help text is converted for this terminal width before it is indexed
+SEARCH_WIDTH = 80
+# Regular expression to split text into terms
+TERM_RE = re.compile(r"\w+")
+
+
+class SearchHit(typing.NamedTuple):
+    command_path: str
+    # The title of the section with the match, "" for the text before the first title
+    section: str
+    score: int
+    # The lines of the section that contain a match
+    lines: list[str]
+
+
+class SearchIndex:
+    def __init__(
+        self,
+        sections: list[tuple[str, str, str]],
+        postings: dict[str, list[tuple[int, int]]],
+    ) -> None:
+        # (command path, section title, plain text) of each indexed section
+        self.sections = sections
+        # Term -> list of (index into self.sections, number of occurrences)
+        self.postings = postings
+        # Sorted terms, used to find the terms that start with a query term
+        self.terms = sorted(postings)
+
+    @classmethod
+    def build(cls, cli: click.Command) -> "SearchIndex":
+        sections: list[tuple[str, str, str]] = []
+        postings: dict[str, list[tuple[int, int]]] = {}
+        for command_path, cmd in iter_commands(cli):
+            if not isinstance(cmd, FormatHelpMixin):
+                continue
+            help_text = cmd.get_help_source()
+            if help_text is None:
+                continue
+            help_text = textwrap.dedent(
+                RstToAnsiConverter.fix_first_line_indentation(
+                    help_text.partition("\f")[0]
+                )
+            )
+            for title, section in split_sections(help_text):
+                text = cmd.convert_help(section, True, SEARCH_WIDTH)
+                counts: dict[str, int] = {}
+                for term in TERM_RE.findall(text.lower()):
+                    counts[term] = counts.get(term, 0) + 1
+                for term, count in counts.items():
+                    postings.setdefault(term, []).append((len(sections), count))
+                sections.append((command_path, title, text))
+        return cls(sections, postings)
+
+    def to_json(self) -> str:
+        return json.dumps({"sections": self.sections, "postings": self.postings})
+
+    @classmethod
+    def from_json(cls, data: str) -> "SearchIndex":
+        obj = json.loads(data)
+        return cls(
+            [typing.cast(tuple[str, str, str], tuple(s)) for s in obj["sections"]],
+            {
+                term: [(idx, count) for idx, count in postings]
+                for term, postings in obj["postings"].items()
+            },
+        )
+
+    def match_counts(self, term: str) -> dict[int, int]:
+        # Find the sections with a term that starts with term, e.g. "edit" matches
+        # "editor" too
+        counts: dict[int, int] = {}
+        idx = bisect.bisect_left(self.terms, term)
+        while idx < len(self.terms) and self.terms[idx].startswith(term):
+            for section_idx, count in self.postings[self.terms[idx]]:
+                counts[section_idx] = counts.get(section_idx, 0) + count
+            idx += 1
+        return counts
+
+    def search(self, query: str, limit: int = 10) -> list[SearchHit]:
+        """Return the sections that contain all terms of the query, best first."""
+        terms = TERM_RE.findall(query.lower())
+        if not terms:
+            return []
+        scores: dict[int, int] | None = None
+        for term in terms:
+            counts = self.match_counts(term)
+            if scores is None:
+                scores = counts
+            else:
+                scores = {
+                    idx: score + counts[idx]
+                    for idx, score in scores.items()
+                    if idx in counts
+                }
+        assert scores is not None
+        pattern = match_pattern(terms)
+        hits = []
+        for idx, score in sorted(scores.items(), key=lambda item: (-item[1], item[0])):
+            command_path, title, text = self.sections[idx]
+            lines = [line.strip() for line in text.splitlines() if pattern.search(line)]
+            hits.append(SearchHit(command_path, title, score, lines))
+            if len(hits) == limit:
+                break
+        return hits
+
+
+def match_pattern(terms: list[str]) -> re.Pattern[str]:
+    # Matches the words that start with one of the terms
+    alternatives = "|".join(re.escape(term) for term in terms)
+    return re.compile(rf"\b(?:{alternatives})\w*", re.IGNORECASE)
+
+
+def index_key(cli: click.Command) -> str:
+    parts = [SEARCH_INDEX_VERSION, str(SEARCH_WIDTH)]
+    for command_path, cmd in iter_commands(cli):
+        if isinstance(cmd, FormatHelpMixin):
+            parts += [command_path, cmd.get_help_source() or ""]
+    return HelpCache.make_key("search-index", *parts)
+
+
+def get_search_index(cli: click.Command) -> SearchIndex:
+    """Load the search index of cli from the help cache, or build and store it.
+
+    Call this e.g. when the application is installed, to build the index in advance.
+    The cache directory of cli is used, see the ``cache_dir`` argument of
+    ``make_rst_to_ansi_formatter()``.
+    """
+    cache = get_cache(getattr(cli, "cache_dir", None))
+    key = index_key(cli)
+    data = cache.get(key)
+    if data is not None:
+        return SearchIndex.from_json(data)
+    index = SearchIndex.build(cli)
+    cache.set(key, index.to_json())
+    return index
+
+
+def format_hits(
+    hits: list[SearchHit], query: str, colors: Colors, max_lines: int = 3
+) -> str:
+    pattern = match_pattern(TERM_RE.findall(query.lower()))
+    parts = []
+    for hit in hits:
+        heading = hit.command_path + (f" ({hit.section})" if hit.section else "")
+        parts.append(colors.color_heading(heading))
+        for line in hit.lines[:max_lines]:
+            highlighted = pattern.sub(lambda m: colors.color_url(m.group(0)), line)
+            parts.append(f"  {highlighted}")
+    return "\n".join(parts)
+
+
+@click.command("help-search")
+@click.argument("query", nargs=-1, required=True)
+@click.option(
+    "--limit", type=int, default=10, show_default=True, help="Show at most LIMIT hits."
+)
+@click.pass_context
+def help_search(ctx: click.Context, query: tuple[str, ...], limit: int) -> None:
+    """Search the help text of all commands."""
+    cli = ctx.find_root().command
+    query_text = " ".join(query)
+    hits = get_search_index(cli).search(query_text, limit)
+    if not hits:
+        click.echo(f"No help text matches {query_text!r}.")
+        return
+    color = ctx.color if ctx.color is not None else colors_enabled()
+    color_dict: ColorDict | None = getattr(cli, "colors", None)
+    colors = Colors(color_dict) if color else MonochromeColors()
+    click.echo(format_hits(hits, query_text, colors), color=ctx.color)
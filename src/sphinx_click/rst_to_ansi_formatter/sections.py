@@ -0,0 +1,100 @@
+"""Find a section of reST help text without parsing the whole document.
+
+Section titles are found by scanning the lines for a title followed by an underline
+(and optionally preceded by an overline) of a single punctuation character, like
+docutils does. The level of a section is given by the order in which the title styles
+first appear. A section ends at the next title with the same or a higher level.
+
+The functions expect dedented text, e.g. as ``RstToAnsiConverter.docstring``.
+"""
+
+import string
+import typing
+
+# The characters that can be used for title adornments in reST
+ADORNMENT_CHARS = frozenset(string.punctuation)
+
+
+class SectionTitle(typing.NamedTuple):
+    title: str
+    # The adornment character, and if the title has an overline
+    style: tuple[str, bool]
+    # Index of the first line of the title, i.e. the overline if there is one
+    start: int
+
+
+def is_adornment(line: str) -> bool:
+    line = line.rstrip()
+    return len(line) > 1 and line[0] in ADORNMENT_CHARS and line == line[0] * len(line)
+
+
+def iter_titles(lines: list[str]) -> typing.Iterator[SectionTitle]:
+    idx = 0
+    while idx < len(lines) - 1:
+        line = lines[idx].rstrip()
+        underline = lines[idx + 1]
+        # Titles are not indented, indented lines are e.g. part of a literal block
+        if (
+            line
+            and not line[0].isspace()
+            and not is_adornment(line)
+            and is_adornment(underline)
+            and len(underline.rstrip()) >= len(line)
+        ):
+            overline = idx > 0 and lines[idx - 1].rstrip() == underline.rstrip()
+            start = idx - 1 if overline else idx
+            # A title must be preceded by an empty line, unless it starts the text
+            if start == 0 or not lines[start - 1].strip():
+                yield SectionTitle(line, (underline[0], overline), start)
+                idx += 2
+                continue
+        idx += 1
+
+
+def section_titles(text: str) -> list[str]:
+    return [title.title for title in iter_titles(text.splitlines())]
+
+
+def find_section(text: str, name: str) -> str | None:
+    """Return the section of text with the title name (case-insensitive).
+
+    The section includes its title and its subsections. Returns None if there is no
+    such section.
+    """
+    lines = text.splitlines()
+    titles = list(iter_titles(lines))
+    styles: list[tuple[str, bool]] = []
+    for title in titles:
+        if title.style not in styles:
+            styles.append(title.style)
+    for idx, title in enumerate(titles):
+        if title.title.lower() == name.lower():
+            level = styles.index(title.style)
+            end = next(
+                (
+                    other.start
+                    for other in titles[idx + 1 :]
+                    if styles.index(other.style) <= level
+                ),
+                len(lines),
+            )
+            return "\n".join(lines[title.start : end]).strip()
+    return None
+
+
+def split_sections(text: str) -> list[tuple[str, str]]:
+    """Split text at every section title and return (title, text) tuples.
+
+    Unlike find_section(), subsections are not included in the text of a section. The
+    text before the first title has the title ``""``.
+    """
+    lines = text.splitlines()
+    titles = list(iter_titles(lines))
+    starts = [0] + [title.start for title in titles] + [len(lines)]
+    names = [""] + [title.title for title in titles]
+    sections = []
+    for name, start, end in zip(names, starts, starts[1:]):
+        section = "\n".join(lines[start:end]).strip()
+        if section:
+            sections.append((name, section))
+    return sections
@@ -0,0 +1,218 @@
+"""Sphinx extension that shows the converted help text of click commands.
+
+Add it to the extensions in ``conf.py``::
+
+    extensions = ["sphinx_click.rst_to_ansi_formatter.sphinxext"]
+
+and use the directive in a document::
+
+    .. click-help-preview:: my_package.cli:main
+       :width: 80
+       :nested:
+
+The parsed help text and the converted help text are stored in the build environment,
+with a hash of the help text and the formatter settings as key. The directive reuses
+them, also across parallel (``-j``) builds, and a document is only read again if the
+help text of one of its commands has changed.
+"""
+
+import typing
+from typing import Any
+
+import click
+import docutils.nodes
+from docutils.parsers.rst import directives
+from sphinx.application import Sphinx
+from sphinx.environment import BuildEnvironment
+from sphinx.util.docutils import SphinxDirective
+
+from .cache import HelpCache
+from .commands import iter_commands
+from .formatter import FormatHelpMixin
+from .lint import load_command
+
+# Change this when the data stored in the environment changes
+ENV_VERSION = 1
+
+
+class PreviewEntry:
+    """The parsed and converted help text of a command, see entry_key()."""
+
+    def __init__(self, doctree: docutils.nodes.document) -> None:
+        # The environment is pickled, e.g. to send it from a parallel reader process
+        # to the main process. Like Sphinx does for its doctrees, remove the parts of
+        # the document that are only used while parsing and cannot be pickled
+        doctree.reporter = None  # type: ignore[assignment]
+        doctree.transformer = None  # type: ignore[assignment]
+        doctree.settings.warning_stream = None
+        self.doctree = doctree
+        # Converted help text by (monochrome, width)
+        self.rendered: dict[tuple[bool, int], str] = {}
+        # The documents that show this help text
+        self.docnames: set[str] = set()
+
+
+# Help text key -> PreviewEntry
+Previews = dict[str, PreviewEntry]
+# Document name -> list of (directive argument, nested option, help text keys)
+PreviewDocs = dict[str, list[tuple[str, bool, list[str]]]]
+
+
+def get_previews(env: BuildEnvironment) -> Previews:
+    if not hasattr(env, "rst_to_ansi_previews"):
+        env.rst_to_ansi_previews = {}  # type: ignore[attr-defined]
+    return typing.cast(Previews, env.rst_to_ansi_previews)  # type: ignore[attr-defined]
+
+
+def get_preview_docs(env: BuildEnvironment) -> PreviewDocs:
+    if not hasattr(env, "rst_to_ansi_preview_docs"):
+        env.rst_to_ansi_preview_docs = {}  # type: ignore[attr-defined]
+    return typing.cast(
+        PreviewDocs,
+        env.rst_to_ansi_preview_docs,  # type: ignore[attr-defined]
+    )
+
+
+def entry_key(cmd: FormatHelpMixin, help_text: str) -> str:
+    # The converted help text depends on the help text and the formatter settings
+    return HelpCache.make_key(
+        "sphinx-preview", help_text, cmd.render_context.cache_key()
+    )
+
+
+def preview_commands(
+    spec: str, nested: bool
+) -> list[tuple[str, FormatHelpMixin, str, str]]:
+    # Return (command path, command, help text, key) for the commands to show
+    cli = load_command(spec)
+    commands = iter_commands(cli) if nested else iter([(cli.name or "", cli)])
+    result: list[tuple[str, FormatHelpMixin, str, str]] = []
+    for command_path, cmd in commands:
+        if not isinstance(cmd, FormatHelpMixin):
+            continue
+        help_text = cmd.get_help_source()
+        if help_text is None:
+            continue
+        help_text = help_text.partition("\f")[0]
+        result.append((command_path, cmd, help_text, entry_key(cmd, help_text)))
+    return result
+
+
+def render_preview(
+    env: BuildEnvironment,
+    cmd: FormatHelpMixin,
+    help_text: str,
+    key: str,
+    monochrome: bool,
+    width: int,
+) -> str:
+    previews = get_previews(env)
+    entry = previews.get(key)
+    if entry is None:
+        entry = previews[key] = PreviewEntry(
+            cmd.make_converter(help_text, monochrome, width).parse()
+        )
+    entry.docnames.add(env.docname)
+    text = entry.rendered.get((monochrome, width))
+    if text is None:
+        converter = cmd.make_converter(help_text, monochrome, width)
+        text = entry.rendered[(monochrome, width)] = converter.render(entry.doctree)
+    return text
+
+
+class ClickHelpPreview(SphinxDirective):
+    required_arguments = 1
+    option_spec = {
+        "width": directives.positive_int,
+        "nested": directives.flag,
+        "ansi": directives.flag,
+    }
+
+    def run(self) -> list[docutils.nodes.Node]:
+        spec = self.arguments[0]
+        nested = "nested" in self.options
+        # Without the ansi option, the help text is shown without ANSI color codes
+        monochrome = "ansi" not in self.options
+        width = self.options.get("width", 80)
+        try:
+            commands = preview_commands(spec, nested)
+        except click.BadParameter as exc:
+            raise self.error(f"Cannot load the click command {spec!r}: {exc}")
+        result: list[docutils.nodes.Node] = []
+        for command_path, cmd, help_text, key in commands:
+            text = render_preview(self.env, cmd, help_text, key, monochrome, width)
+            if nested:
+                result.append(docutils.nodes.rubric(text=command_path))
+            result.append(docutils.nodes.literal_block(text, text))
+        docs = get_preview_docs(self.env)
+        keys = [key for _, _, _, key in commands]
+        docs.setdefault(self.env.docname, []).append((spec, nested, keys))
+        return result
+
+
+def purge_doc(app: Sphinx, env: BuildEnvironment, docname: str) -> None:
+    # The entries are kept, such that they can be reused when the document is read
+    # again. Unused entries are removed in prune_entries()
+    get_preview_docs(env).pop(docname, None)
+    for entry in get_previews(env).values():
+        entry.docnames.discard(docname)
+
+
+def merge_info(
+    app: Sphinx, env: BuildEnvironment, docnames: set[str], other: BuildEnvironment
+) -> None:
+    # Merge the entries created by a parallel reader process into the main process
+    docs = get_preview_docs(env)
+    other_docs = get_preview_docs(other)
+    for docname in docnames:
+        if docname in other_docs:
+            docs[docname] = other_docs[docname]
+    previews = get_previews(env)
+    for key, other_entry in get_previews(other).items():
+        entry = previews.setdefault(key, other_entry)
+        if entry is not other_entry:
+            entry.rendered.update(other_entry.rendered)
+            entry.docnames |= other_entry.docnames
+
+
+def outdated_docs(
+    app: Sphinx,
+    env: BuildEnvironment,
+    added: set[str],
+    changed: set[str],
+    removed: set[str],
+) -> list[str]:
+    # Read a document again if the help text of one of its commands has changed
+    outdated = []
+    for docname, previews in get_preview_docs(env).items():
+        if docname in changed or docname in removed:
+            continue
+        for spec, nested, keys in previews:
+            try:
+                commands = preview_commands(spec, nested)
+            except click.BadParameter:
+                commands = []
+            if [key for _, _, _, key in commands] != keys:
+                outdated.append(docname)
+                break
+    return outdated
+
+
+def prune_entries(app: Sphinx, env: BuildEnvironment) -> None:
+    # Called when all documents have been read, remove the unused entries
+    previews = get_previews(env)
+    for key in [key for key, entry in previews.items() if not entry.docnames]:
+        del previews[key]
+
+
+def setup(app: Sphinx) -> dict[str, Any]:
+    app.add_directive("click-help-preview", ClickHelpPreview)
+    app.connect("env-purge-doc", purge_doc)
+    app.connect("env-merge-info", merge_info)
+    app.connect("env-get-outdated", outdated_docs)
+    app.connect("env-updated", prune_entries)
+    return {
+        "env_version": ENV_VERSION,
+        "parallel_read_safe": True,
+        "parallel_write_safe": True,
+    }
@@ -0,0 +1,79 @@
+"""The terminal width that the help text is converted for.
+
+The size of the terminal is looked up once per process, and again after the terminal
+has been resized, i.e. after a SIGWINCH signal. The width can also be set with click's
+``terminal_width`` and ``max_content_width`` context settings, see help_width().
+"""
+
+import shutil
+import signal
+import threading
+from types import FrameType
+from typing import Any
+
+import click
+
+from .textutils import width_bucket
+
+# The cached width, None if it must be looked up again
+_width: int | None = None
+# True when the SIGWINCH handler has been installed, or could not be installed
+_handler_installed = False
+
+
+def invalidate_terminal_width(*args: Any) -> None:
+    """Look up the terminal width again the next time it is needed."""
+    global _width
+    _width = None
+
+
+def install_resize_handler() -> None:
+    # Invalidate the cached width when the terminal is resized. A handler that was
+    # already installed, e.g. by the application, is still called
+    global _handler_installed
+    sigwinch = getattr(signal, "SIGWINCH", None)
+    if sigwinch is None:  # pragma: no cover
+        # Not available on Windows
+        _handler_installed = True
+        return
+    # Signal handlers can only be installed in the main thread. In other threads the
+    # width is cached until the handler is installed by a call from the main thread
+    if threading.current_thread() is not threading.main_thread():
+        return
+    _handler_installed = True
+    previous = signal.getsignal(sigwinch)
+
+    def handler(signum: int, frame: FrameType | None) -> None:
+        invalidate_terminal_width()
+        if callable(previous):
+            previous(signum, frame)
+
+    signal.signal(sigwinch, handler)
+
+
+def terminal_width() -> int:
+    """Return the number of columns of the terminal, cached per process."""
+    global _width
+    if not _handler_installed:
+        install_resize_handler()
+    if _width is None:
+        _width = shutil.get_terminal_size(fallback=(80, 20)).columns
+    return _width
+
+
+def help_width(ctx: click.Context) -> int:
+    """Return the width to convert the help text of the context's command for.
+
+    Like click's help formatter, ``ctx.terminal_width`` is used if it is set, and the
+    width is limited to ``ctx.max_content_width``, such that the help text is wrapped
+    like the usage and the options. Unlike click, the width is not limited to 80
+    columns by default. Only the width of the terminal is rounded down to a multiple
+    of textutils.WIDTH_BUCKET_SIZE, such that terminals with almost the same width
+    share the converted help text. The widths of the context are used as given.
+    """
+    width = ctx.terminal_width
+    if width is None:
+        width = width_bucket(terminal_width())
+    if ctx.max_content_width is not None:
+        width = min(width, ctx.max_content_width)
+    return width
@@ -1,4 +1,27 @@
 import re
+import unicodedata
+
+# Regular expression to match ANSI escape sequences
+ANSI_ESCAPE_RE = re.compile(r"\x1b\[[0-9;]*m")
+
+# Terminal widths are rounded down to a multiple of this value when rendered help text
+# is cached, such that a small difference in width does not cause a cache miss
+WIDTH_BUCKET_SIZE = 10
+
+# Regular expression to split text without ANSI escape sequences into words and spaces
+WORD_OR_SPACE_RE = re.compile(r"\s+|\S+")
+
+
+def check_fill_args(width: int, subsequent_indent: str) -> None:
+    # Input validation for ansiwrap_fill() and plain_fill()
+    if not isinstance(width, int):
+        raise TypeError("Width must be an integer.")
+    if width <= 0:
+        raise ValueError("Width must be greater than zero.")
+    if not isinstance(subsequent_indent, str):
+        raise TypeError("Subsequent indent must be a string.")
+    if len(subsequent_indent) >= width:
+        raise ValueError("Subsequent indent length must be less than width.")
 
 
 # NOTE: The ansiwrap module on PyPI does not work for Python 3.12+. So this is temporary
@@ -9,24 +32,13 @@ def ansiwrap_fill(text: str, width: int, subsequent_indent: str = "") -> str:
 
     Args:
         text (str): The input text containing ANSI escape sequences.
-        width (int): The maximum line width.
+        width (int): The maximum line width in terminal columns, see display_width().
         subsequent_indent (str): String that will be prepended to all lines of text except the first.
 
     Returns:
         str: The wrapped text.
     """
-    # Input validation
-    if not isinstance(width, int):
-        raise TypeError("Width must be an integer.")
-    if width <= 0:
-        raise ValueError("Width must be greater than zero.")
-    if not isinstance(subsequent_indent, str):
-        raise TypeError("Subsequent indent must be a string.")
-    if len(subsequent_indent) >= width:
-        raise ValueError("Subsequent indent length must be less than width.")
-
-    # Regular expression to match ANSI escape sequences
-    ANSI_ESCAPE_RE = re.compile(r"\x1b\[[0-9;]*m")
+    check_fill_args(width, subsequent_indent)
 
     # Tokenize the text into ANSI codes, words, and spaces
     def tokenize(text: str) -> list[tuple[str, str]]:
@@ -63,6 +75,9 @@ def ansiwrap_fill(text: str, width: int, subsequent_indent: str = "") -> str:
         return tokens
 
     tokens = tokenize(text)
+    # East Asian wide characters use two columns. ASCII text, including the ANSI
+    # escape sequences, is measured with len(), which is faster
+    measure = len if text.isascii() else display_width
 
     lines = []
     line = ""
@@ -97,7 +112,7 @@ def ansiwrap_fill(text: str, width: int, subsequent_indent: str = "") -> str:
         elif token_type == "word":
             # Measure word length without ANSI codes
             word = token_value
-            word_len = len(word)
+            word_len = measure(word)
             if line_len + word_len > current_width and line_len > 0:
                 # Wrap to next line
                 lines.append(indent + line.rstrip())
@@ -113,3 +128,108 @@ def ansiwrap_fill(text: str, width: int, subsequent_indent: str = "") -> str:
         lines.append(indent + line.rstrip(" "))
 
     return "\n".join(lines)
+
+
+def plain_fill(text: str, width: int, subsequent_indent: str = "") -> str:
+    """
+    Wrap text that does not contain ANSI escape sequences.
+
+    This is a faster replacement for ansiwrap_fill() used for monochrome output. For
+    text without ANSI escape sequences it gives the same result as ansiwrap_fill().
+
+    Args:
+        text (str): The input text.
+        width (int): The maximum line width in terminal columns, see display_width().
+        subsequent_indent (str): String that will be prepended to all lines of text except the first.
+
+    Returns:
+        str: The wrapped text.
+    """
+    check_fill_args(width, subsequent_indent)
+
+    measure = len if text.isascii() else display_width
+
+    lines = []
+    line = ""
+    line_width = 0
+    indent = ""
+    current_width = width
+    for token in WORD_OR_SPACE_RE.findall(text):
+        token_width = measure(token)
+        if line and line_width + token_width > current_width:
+            if token[0].isspace():
+                # Wrap to next line and skip the spaces at the wrap point
+                lines.append(indent + line.rstrip(" "))
+                line = ""
+                line_width = 0
+            else:
+                # Wrap to next line and start the new line with the word
+                lines.append(indent + line.rstrip())
+                line = token
+                line_width = token_width
+            indent = subsequent_indent
+            current_width = width - len(indent)
+        else:
+            line += token
+            line_width += token_width
+
+    if line:
+        lines.append(indent + line.rstrip(" "))
+
+    return "\n".join(lines)
+
+
+def display_width(text: str) -> int:
+    """
+    Return the number of terminal columns used by text, ignoring ANSI escape sequences.
+
+    East Asian wide and full-width characters use two columns, combining characters
+    use none.
+    """
+    if "\x1b" in text:
+        text = ANSI_ESCAPE_RE.sub("", text)
+    if text.isascii():
+        return len(text)
+    width = 0
+    for char in text:
+        if unicodedata.combining(char):
+            continue
+        width += 2 if unicodedata.east_asian_width(char) in ("W", "F") else 1
+    return width
+
+
+def fit_column_widths(
+    natural: list[int], minimum: list[int], available: int
+) -> list[int]:
+    """
+    Fit the widths of table columns to the available width.
+
+    Args:
+        natural (list[int]): The width of each column if no cell is wrapped.
+        minimum (list[int]): The smallest width of each column, e.g. the longest word.
+        available (int): The total width available for the columns.
+
+    Returns:
+        list[int]: The column widths. Columns that fit within their fair share of the
+        available width keep their natural width, the remaining width is shared equally
+        by the wider columns. If the minimum widths do not fit, they are returned.
+    """
+    widths = [max(1, min(m, n)) for m, n in zip(minimum, natural)]
+    remaining = available - sum(widths)
+    if remaining <= 0:
+        return widths
+    # Give the extra width to the columns that need the least first, such that the
+    # width left over by narrow columns can be used by the wide columns
+    order = sorted(range(len(widths)), key=lambda col: natural[col] - widths[col])
+    columns_left = len(order)
+    for col in order:
+        extra = min(natural[col] - widths[col], remaining // columns_left)
+        widths[col] += extra
+        remaining -= extra
+        columns_left -= 1
+    return widths
+
+
+def width_bucket(width: int) -> int:
+    """Round a terminal width down to a multiple of WIDTH_BUCKET_SIZE."""
+    return max(WIDTH_BUCKET_SIZE, width - width % WIDTH_BUCKET_SIZE)
@@ -0,0 +1,132 @@
+"""Convert the help text of all commands of a CLI in advance.
+
+In long-running processes, e.g. a REPL or a server, the first ``--help`` of a command
+pays for the conversion of its help text. warm() does the conversions in advance and
+stores the result in each command's in-memory cache, either in a background thread or
+in the calling thread, e.g. before a pre-forking server forks its workers.
+"""
+
+import threading
+import time
+import typing
+from typing import Callable
+
+import click
+
+from .commands import iter_commands
+from .formatter import FormatHelpMixin
+from .terminal import terminal_width
+from .textutils import width_bucket
+
+# Called after each conversion with the number of conversions done, the total number
+# of conversions, and the command path of the converted command
+ProgressCallback = Callable[[int, int, str], None]
+
+
+class WarmJob(typing.NamedTuple):
+    command_path: str
+    cmd: FormatHelpMixin
+    help_text: str
+    monochrome: bool
+    width: int
+
+
+class WarmHandle:
+    """The state of a warm() call. Use cancel() to stop it early."""
+
+    def __init__(self, jobs: list[WarmJob]) -> None:
+        self.jobs = jobs
+        self.total = len(jobs)
+        # The number of conversions done so far
+        self.done = 0
+        self.cancelled = threading.Event()
+        self.thread: threading.Thread | None = None
+
+    def cancel(self) -> None:
+        # The conversion in progress is finished, and no new conversions are started
+        self.cancelled.set()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Wait for the warming to stop, return True if it has stopped."""
+        if self.thread is not None:
+            self.thread.join(timeout)
+            return not self.thread.is_alive()
+        return True
+
+
+def warm_jobs(
+    cli: click.Command, widths: tuple[int, ...], monochrome: tuple[bool, ...]
+) -> list[WarmJob]:
+    jobs = []
+    for command_path, cmd in iter_commands(cli):
+        if not isinstance(cmd, FormatHelpMixin):
+            continue
+        help_text = cmd.get_help_source()
+        if help_text is None:
+            continue
+        # The help text is truncated at the first form feed when it is shown
+        help_text = help_text.partition("\f")[0]
+        for width in widths:
+            for mode in monochrome:
+                jobs.append(WarmJob(command_path, cmd, help_text, mode, width))
+    return jobs
+
+
+def run_jobs(
+    handle: WarmHandle, progress: ProgressCallback | None, budget: float | None
+) -> None:
+    deadline = time.monotonic() + budget if budget is not None else None
+    for job in handle.jobs:
+        if handle.cancelled.is_set():
+            break
+        if deadline is not None and time.monotonic() >= deadline:
+            break
+        job.cmd.cached_convert_help(job.help_text, job.monochrome, job.width)
+        handle.done += 1
+        if progress is not None:
+            progress(handle.done, handle.total, job.command_path)
+        # Let other threads, e.g. one showing the help of a command, run between
+        # the conversions
+        time.sleep(0)
+
+
+def warm(
+    cli: click.Command,
+    widths: tuple[int, ...] | None = None,
+    background: bool = True,
+    monochrome: tuple[bool, ...] = (False, True),
+    progress: ProgressCallback | None = None,
+    budget: float | None = None,
+) -> WarmHandle:
+    """Convert the help text of cli and its subcommands and cache the result.
+
+    :param cli: The root command, only commands created with
+        ``make_rst_to_ansi_formatter()`` are converted.
+    :param widths: The terminal widths to convert the help text for. The default is
+        the width of the current terminal.
+    :param background: If True, convert in a daemon thread and return immediately.
+        If False, convert in the calling thread, e.g. before forking worker processes
+        such that they share the converted help text.
+    :param monochrome: Convert colored (False) and/or monochrome (True) help text.
+    :param progress: Called after each conversion, see ProgressCallback.
+    :param budget: Stop after this many seconds. The conversion in progress is
+        finished first.
+    :return: A handle that can be used to cancel or wait for the warming.
+    """
+    if widths is None:
+        widths = (terminal_width(),)
+    # The help text is converted for the width bucket of the terminal, see
+    # terminal.help_width()
+    widths = tuple(dict.fromkeys(map(width_bucket, widths)))
+    handle = WarmHandle(warm_jobs(cli, widths, monochrome))
+    if background:
+        handle.thread = threading.Thread(
+            target=run_jobs,
+            args=(handle, progress, budget),
+            name="rst-to-ansi-warm",
+            daemon=True,
+        )
+        handle.thread.start()
+    else:
+        run_jobs(handle, progress, budget)
+    return handle
@@ -1,15 +1,53 @@
 # import typing
 import pytest
+import zlib
 from pathlib import Path
 
 from sphinx_click.rst_to_ansi_formatter.colors import Colors
+from sphinx_click.rst_to_ansi_formatter.terminal import invalidate_terminal_width
 
 
 @pytest.fixture(scope="session")
-def tests_assets_path() -> Path:  # pragma: no cover
+def tests_assets_path() -> Path:
     return Path(__file__).parent / "assets"
 
 
+@pytest.fixture
+def columns() -> int:
+    # The terminal width of the tests, test modules override this fixture
+    return 80
+
+
+@pytest.fixture(autouse=True)
+def terminal_width(monkeypatch: pytest.MonkeyPatch, columns: int) -> None:
+    # shutil.get_terminal_size() uses the COLUMNS environment variable if it is set
+    monkeypatch.setenv("COLUMNS", str(columns))
+    # The terminal width is cached per process
+    invalidate_terminal_width()
+
+
 @pytest.fixture(scope="session")
 def colors() -> Colors:
     return Colors()
+
+
+@pytest.fixture
+def inventory_path(tmp_path: Path) -> Path:
+    # A small Sphinx objects.inv inventory with some entries of different types
+    body = (
+        "mypkg.run py:function 1 api.html#$ -\n"
+        "mypkg.Runner py:class 1 api.html#$ -\n"
+        "mypkg.Runner.start py:method 1 api.html#$ -\n"
+        "installation std:label -1 install.html#installation Installing the package\n"
+        "mycli.--verbose std:cmdoption 1 cli.html#cmdoption-mycli-verbose -\n"
+        "index std:doc -1 index.html Welcome\n"
+    )
+    path = tmp_path / "objects.inv"
+    path.write_bytes(
+        b"# Sphinx inventory version 2\n"
+        b"# Project: mypkg\n"
+        b"# Version: 1.0\n"
+        b"# The remainder of this file is compressed using zlib.\n"
+        + zlib.compress(body.encode("utf-8"))
+    )
+    return path
@@ -1,7 +1,13 @@
 # test_ansiwrap.py
 
 import pytest
-from sphinx_click.rst_to_ansi_formatter.textutils import ansiwrap_fill
+from sphinx_click.rst_to_ansi_formatter.textutils import (
+    ANSI_ESCAPE_RE,
+    ansiwrap_fill,
+    display_width,
+    fit_column_widths,
+    plain_fill,
+)
 
 
 def test_simple_text() -> None:
@@ -204,3 +210,66 @@ def test_wrapping_with_leading_spaces() -> None:
     )
     result = ansiwrap_fill(text, width=25, subsequent_indent="  ")
     assert result == expected
+
+
+@pytest.mark.parametrize(
+    "text, width, subsequent_indent",
+    [
+        ("This is a simple text without ANSI codes.", 35, ""),
+        ("ThisIsAnExtremelyLongWordThatExceedsTheWidth", 20, ""),
+        ("This text should be indented on subsequent lines.", 30, "    "),
+        ("", 50, ""),
+        ("Unicode test: 😊 🚀 🌟", 50, ""),
+        ("Line1\nLine2\nLine3", 50, ""),
+        ("This is a test with alongwordthatexceedsthewidth.", 20, ""),
+        ("This    text  has   multiple spaces.", 30, ""),
+        ("This text has non-printable characters: \x07\x08\x0c", 35, ""),
+        ("1 2 3 4 5 6 7 8 9 0", 8, "  "),
+        ("Column1\tColumn2\tColumn3", 50, ""),
+        ("Trailing spaces    ", 20, ""),
+        ("    Leading spaces", 20, ""),
+        ("Word    Word", 5, ""),
+        ("This is a test with  multiple   spaces that will cause wrapping.", 25, "  "),
+        ("Tabs\tat\tthe\twrap\tpoint\tshould\tbe\tstripped", 12, " "),
+        ("日本語 の テキスト を 折り返す", 10, ""),
+    ],
+)
+def test_plain_fill_same_as_ansiwrap_fill(
+    text: str, width: int, subsequent_indent: str
+) -> None:
+    expected = ansiwrap_fill(text, width=width, subsequent_indent=subsequent_indent)
+    result = plain_fill(text, width=width, subsequent_indent=subsequent_indent)
+    assert result == expected
+
+
+def test_wide_characters() -> None:
+    # East Asian wide characters use two columns
+    text = "日本語 \x1b[31mの\x1b[0m テキスト を 折り返す"
+    expected = "日本語 \x1b[31mの\x1b[0m\nテキスト\nを\n折り返す"
+    assert ansiwrap_fill(text, width=10) == expected
+    assert plain_fill(ANSI_ESCAPE_RE.sub("", text), width=10) == (
+        ANSI_ESCAPE_RE.sub("", expected)
+    )
+
+
+def test_plain_fill_zero_width() -> None:
+    with pytest.raises(ValueError):
+        plain_fill("Text with zero width.", width=0)
+
+
+def test_display_width() -> None:
+    assert display_width("plain") == 5
+    assert display_width("\x1b[31mred\x1b[0m") == 3
+    assert display_width("日本") == 4
+    assert display_width("é") == 1
+
+
+def test_fit_column_widths() -> None:
+    # Everything fits
+    assert fit_column_widths([5, 10], [3, 4], 40) == [5, 10]
+    # The narrow column keeps its width, the wide column gets the rest
+    assert fit_column_widths([5, 60], [3, 4], 40) == [5, 35]
+    # Two wide columns share the width that is left after the minimum widths
+    assert fit_column_widths([50, 60], [3, 4], 40) == [19, 21]
+    # The minimum widths do not fit
+    assert fit_column_widths([50, 60], [30, 40], 40) == [30, 40]
@@ -0,0 +1,180 @@
+import typing
+from pathlib import Path
+
+import click
+import pytest
+from click.testing import CliRunner
+from pytest_mock.plugin import MockerFixture
+
+import sphinx_click.rst_to_ansi_formatter.artifact as artifact
+from sphinx_click.rst_to_ansi_formatter import make_rst_to_ansi_formatter
+from sphinx_click.rst_to_ansi_formatter.commands import iter_commands
+from sphinx_click.rst_to_ansi_formatter.formatter import FormatHelpMixin
+
+BASE_URL = "https://example.github.io/example/main/"
+
+
+@pytest.fixture
+def columns() -> int:
+    return 64
+
+
+@pytest.fixture(autouse=True)
+def empty_artifact_registry(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Do not reuse artifacts opened by other tests
+    monkeypatch.setattr(artifact, "_artifacts", {})
+
+
+def make_cli(artifact_path: Path | None = None) -> click.Group:
+    group_cls = make_rst_to_ansi_formatter(BASE_URL, group=True, artifact=artifact_path)
+    command_cls = make_rst_to_ansi_formatter(BASE_URL, artifact=artifact_path)
+    cli = group_cls(name="cli", help="The *main* command.")
+    cli.add_command(command_cls(name="first", help="The ``first`` sub command."))
+    cli.add_command(command_cls(name="no-help"))
+    nested = group_cls(name="nested", help="A nested group.")
+    # A plain click command is not included in the artifact
+    nested.add_command(click.Command(name="plain", help="A plain command."))
+    cli.add_command(nested)
+    return typing.cast(click.Group, cli)
+
+
+class TestArtifactFormat:
+    def test_lookup(self, tmp_path: Path) -> None:
+        path = tmp_path / "help.bin"
+        entries = {f"cli cmd{i}\x0080": f"Help text {i} ✓" for i in range(1000)}
+        artifact.write_help_artifact(path, entries)
+        help_artifact = artifact.HelpArtifact(path)
+        assert help_artifact.entry_count == 1000
+        assert help_artifact.slot_count == 2048
+        for key, value in entries.items():
+            assert help_artifact.lookup(key) == value
+        assert help_artifact.lookup("cli missing\x0080") is None
+
+    def test_empty_artifact(self, tmp_path: Path) -> None:
+        path = tmp_path / "help.bin"
+        artifact.write_help_artifact(path, {})
+        assert artifact.HelpArtifact(path).lookup("cli") is None
+
+    def test_invalid_artifact(self, tmp_path: Path) -> None:
+        path = tmp_path / "help.bin"
+        path.write_bytes(b"x" * 64)
+        with pytest.raises(ValueError):
+            artifact.HelpArtifact(path)
+        assert artifact.get_artifact(path) is None
+        assert artifact.get_artifact(tmp_path / "missing.bin") is None
+        # Short files and empty files are not artifacts either
+        path.write_bytes(b"SCRAHELP")
+        assert artifact.get_artifact(tmp_path / "help.bin") is None
+        (tmp_path / "empty.bin").write_bytes(b"")
+        assert artifact.get_artifact(tmp_path / "empty.bin") is None
+
+    def test_version(self, tmp_path: Path) -> None:
+        path = tmp_path / "help.bin"
+        artifact.write_help_artifact(path, {"key": "value"})
+        data = bytearray(path.read_bytes())
+        artifact.HEADER.pack_into(data, 0, artifact.ARTIFACT_MAGIC, 1, 8, 1)
+        path.write_bytes(data)
+        expected = f"of version 1, expected version {artifact.ARTIFACT_VERSION}"
+        with pytest.raises(ValueError, match=expected):
+            artifact.HelpArtifact(path)
+
+    def test_truncated_artifact(self, tmp_path: Path) -> None:
+        path = tmp_path / "help.bin"
+        entries = {"first": "The first value ✓", "second": "The second value"}
+        artifact.write_help_artifact(path, entries)
+        data = path.read_bytes()
+        # The slots are missing
+        path.write_bytes(data[: artifact.HEADER.size + artifact.SLOT.size])
+        with pytest.raises(ValueError, match="truncated"):
+            artifact.HelpArtifact(path)
+        # The records are cut at different places, lookups return None instead of
+        # raising an exception
+        records_start = artifact.HEADER.size + 8 * artifact.SLOT.size
+        for size in range(records_start, len(data)):
+            path.write_bytes(data[:size])
+            help_artifact = artifact.HelpArtifact(path)
+            for key, value in entries.items():
+                assert help_artifact.lookup(key) in (value, None)
+        # A value that is not valid UTF-8
+        path.write_bytes(data.replace("✓".encode(), b"\xff\xff\xff"))
+        assert artifact.HelpArtifact(path).lookup("first") is None
+
+    def test_full_slot_table(self, tmp_path: Path) -> None:
+        # A corrupt artifact without empty slots, the lookup stops after all slots
+        path = tmp_path / "help.bin"
+        artifact.write_help_artifact(path, {})
+        data = bytearray(path.read_bytes())
+        for slot in range(8):
+            artifact.SLOT.pack_into(
+                data, artifact.HEADER.size + slot * artifact.SLOT.size, 2, 0
+            )
+        path.write_bytes(data)
+        assert artifact.HelpArtifact(path).lookup("key") is None
+
+    def test_key(self) -> None:
+        key = artifact.artifact_key("cli sub", 87, True, "Help")
+        assert key.split("\0")[:3] == ["cli sub", "80", "plain"]
+        assert key == artifact.artifact_key("cli sub", 80, True, "Help")
+        assert key != artifact.artifact_key("cli sub", 80, False, "Help")
+        assert key != artifact.artifact_key("cli sub", 80, True, "Changed help")
+
+
+class TestBuildHelpArtifact:
+    def test_iter_commands(self) -> None:
+        paths = [path for path, _ in iter_commands(make_cli())]
+        assert paths == [
+            "cli",
+            "cli first",
+            "cli nested",
+            "cli nested plain",
+            "cli no-help",
+        ]
+
+    def test_build(self, tmp_path: Path) -> None:
+        path = tmp_path / "help.bin"
+        # Widths in the same bucket are only rendered once
+        count = artifact.build_help_artifact(make_cli(), path, widths=(64, 65, 100))
+        # 3 commands x 2 widths x colored and monochrome
+        assert count == 12
+        help_artifact = artifact.HelpArtifact(path)
+        key = artifact.artifact_key("cli first", 64, True, "The ``first`` sub command.")
+        assert help_artifact.lookup(key) == "The first sub command."
+
+    def test_help_from_artifact(self, tmp_path: Path) -> None:
+        path = tmp_path / "help.bin"
+        key = artifact.artifact_key("cli first", 64, True, "The ``first`` sub command.")
+        artifact.write_help_artifact(path, {key: "Help text from the artifact."})
+        result = CliRunner().invoke(make_cli(path), ["first", "--help"])
+        assert result.exit_code == 0
+        assert "Help text from the artifact." in result.output
+        # Commands that are not in the artifact are converted as usual
+        result = CliRunner().invoke(make_cli(path), ["--help"])
+        assert "The main command." in result.output
+        # The artifact has no help text for a width set in the click context
+        result = CliRunner().invoke(
+            make_cli(path), ["first", "--help"], terminal_width=60
+        )
+        assert "Help text from the artifact." in result.output
+        cli = make_cli(path)
+        cli.context_settings["terminal_width"] = 65
+        result = CliRunner().invoke(cli, ["first", "--help"])
+        assert "The first sub command." in result.output
+
+    def test_form_feed(self, tmp_path: Path, mocker: MockerFixture) -> None:
+        path = tmp_path / "help.bin"
+        cli = make_cli(path)
+        command_cls = make_rst_to_ansi_formatter(BASE_URL, artifact=path)
+        cli.add_command(command_cls(name="hidden", help="Shown x.\f\nHidden."))
+        artifact.build_help_artifact(cli, path, widths=(64,))
+        key = artifact.artifact_key("cli hidden", 64, True, "Shown x.")
+        assert artifact.HelpArtifact(path).lookup(key) == "Shown x."
+        # The help is shown from the artifact
+        convert = mocker.spy(FormatHelpMixin, "convert_help")
+        result = CliRunner().invoke(cli, ["hidden", "--help"], color=False)
+        assert "  Shown x.\n" in result.output and "Hidden" not in result.output
+        convert.assert_not_called()
+
+    def test_missing_artifact(self, tmp_path: Path) -> None:
+        result = CliRunner().invoke(make_cli(tmp_path / "missing.bin"), ["--help"])
+        assert result.exit_code == 0
+        assert "The main command." in result.output
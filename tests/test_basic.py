@@ -1,14 +1,16 @@
 import logging
 import os
+import re
 import sys
 
-# import pytest
+import click
+import pytest
 from _pytest.logging import LogCaptureFixture
 from click.testing import CliRunner
 # from pytest_mock.plugin import MockerFixture
 
 import sphinx_click.rst_to_ansi_formatter.formatter as formatter
-from sphinx_click.rst_to_ansi_formatter.colors import Colors
+from sphinx_click.rst_to_ansi_formatter.colors import Colors, colors_enabled
 
 # Append the parent directory to sys.path to make 'examples' package available
 sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
@@ -158,3 +160,82 @@ class TestEmphasis:
         ansi1 = colors.color_code("emphasized")
         # Check if the emphasized text is correctly colored
         assert ansi1 in converted_text
+
+
+class TestConverter:
+    def test_render_parsed_doctree(self) -> None:
+        docstring = """
+        A paragraph with ``code``.
+
+        * First item.
+        * Second item.
+        """
+        base_url = "https://example.github.io/example/main/"
+        converter = formatter.RstToAnsiConverter(docstring, base_url)
+        doctree = converter.parse()
+        # Rendering the same doctree twice should give the same result as convert()
+        assert converter.render(doctree) == converter.render(doctree)
+        assert converter.render(doctree) == converter.convert()
+
+
+class TestMonochrome:
+    docstring = """
+    See :doc:`Minimal example <minimal>` for more *information*. The ``--template``
+    option is used to specify a template, see https://example.com for an example.
+
+    EXAMPLES
+    ========
+
+    Some examples ::
+
+      $ minimal-example --template mytemplate.txt
+
+    * This is the first ``item`` in the unordered list, it is long enough to be
+      wrapped over several lines in the terminal when the width is small.
+    * An URL link `first link <https://example.com>`_
+    """
+
+    def test_no_ansi_codes(self) -> None:
+        base_url = "https://example.github.io/example/main/"
+        converter = formatter.RstToAnsiConverter(
+            self.docstring, base_url, monochrome=True
+        )
+        assert "\x1b" not in converter.convert()
+
+    def test_same_layout_as_colored(self) -> None:
+        base_url = "https://example.github.io/example/main/"
+        colored = formatter.RstToAnsiConverter(self.docstring, base_url).convert()
+        plain = formatter.RstToAnsiConverter(
+            self.docstring, base_url, monochrome=True
+        ).convert()
+        stripped = re.sub(r"\x1b\[[0-9;]*m", "", colored)
+        assert [line.rstrip() for line in stripped.splitlines()] == [
+            line.rstrip() for line in plain.splitlines()
+        ]
+
+    def test_context_color_setting(self, colors: Colors) -> None:
+        @click.command(cls=formatter.make_rst_to_ansi_formatter("https://x.y/"))
+        def cli() -> None:  # pragma: no cover
+            """Some ``code``."""
+
+        with click.Context(cli, color=True) as ctx:
+            assert colors.color_code("code") in ctx.get_help()
+
+
+class TestColorsEnabled:
+    def test_no_color(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("NO_COLOR", "1")
+        colors_enabled.cache_clear()
+        try:
+            assert not colors_enabled()
+        finally:
+            colors_enabled.cache_clear()
+
+    def test_terminal(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.delenv("NO_COLOR", raising=False)
+        monkeypatch.setattr(sys.stdout, "isatty", lambda: True)
+        colors_enabled.cache_clear()
+        try:
+            assert colors_enabled()
+        finally:
+            colors_enabled.cache_clear()
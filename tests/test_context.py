@@ -0,0 +1,94 @@
+import typing
+from pathlib import Path
+
+import click
+
+import sphinx_click.rst_to_ansi_formatter.formatter as formatter
+from sphinx_click.rst_to_ansi_formatter import make_rst_to_ansi_formatter
+from sphinx_click.rst_to_ansi_formatter.colors import MonochromeColors
+from sphinx_click.rst_to_ansi_formatter.context import get_render_context
+
+BASE_URL = "https://example.github.io/example/main/"
+
+
+class TestRenderContext:
+    def test_shared_by_factory_calls(self) -> None:
+        first = make_rst_to_ansi_formatter(BASE_URL)(name="first")
+        second = make_rst_to_ansi_formatter(BASE_URL)(name="second")
+        group = make_rst_to_ansi_formatter(BASE_URL, group=True)(name="cli")
+        assert first.render_context is second.render_context is group.render_context
+        other = make_rst_to_ansi_formatter(BASE_URL, highlight=True)(name="other")
+        assert other.render_context is not first.render_context
+
+    def test_cache_dir(self, tmp_path: Path) -> None:
+        # The cache directory does not change the output, but the context holds the
+        # highlighter and the inventory that use it
+        context = get_render_context(BASE_URL, cache_dir=tmp_path)
+        assert context is not get_render_context(BASE_URL)
+        assert context.key == get_render_context(BASE_URL).key
+        assert context is get_render_context(BASE_URL, cache_dir=str(tmp_path))
+
+    def test_cache_key(self, inventory_path: Path, tmp_path: Path) -> None:
+        plain = get_render_context(BASE_URL)
+        assert plain.cache_key() == plain.key
+        context = get_render_context(BASE_URL, inventory=inventory_path)
+        key = context.cache_key()
+        assert key.startswith(context.key) and key == context.cache_key()
+        # The key changes when the inventory changes
+        inventory_path.write_bytes(inventory_path.read_bytes() + b"\n")
+        assert context.cache_key() != key
+        inventory_path.unlink()
+        assert context.cache_key() == f"{context.key}\0missing"
+
+    def test_lazy_attributes(self, inventory_path: Path, tmp_path: Path) -> None:
+        context = get_render_context(
+            BASE_URL, inventory=inventory_path, cache_dir=tmp_path, highlight=True
+        )
+        assert "inventory" not in vars(context) and "highlighter" not in vars(context)
+        assert context.inventory is not None and context.highlighter is not None
+        assert context.inventory is context.inventory
+        plain = get_render_context(BASE_URL)
+        assert plain.inventory is None and plain.highlighter is None
+
+    def test_converters_share_context(self) -> None:
+        context = get_render_context(BASE_URL, highlight=True)
+        colored = formatter.RstToAnsiConverter("Text", BASE_URL, highlight=True)
+        mono = formatter.RstToAnsiConverter(
+            "Text", BASE_URL, monochrome=True, highlight=True
+        )
+        assert colored.context is mono.context is context
+        assert colored.colors is context.color_table
+        assert isinstance(mono.colors, MonochromeColors)
+        # Code blocks are not highlighted in monochrome output
+        assert colored.highlighter is context.highlighter
+        assert mono.highlighter is None
+
+    def test_context_argument(self) -> None:
+        # A given context is used instead of the other settings arguments
+        context = get_render_context("https://other.example.org/")
+        converter = formatter.RstToAnsiConverter(
+            ":doc:`usage`", BASE_URL, context=context
+        )
+        assert "https://other.example.org/usage.html" in converter.convert()
+
+    def test_help_unchanged(self) -> None:
+        command_cls = make_rst_to_ansi_formatter(BASE_URL)
+        cmd = typing.cast(click.Command, command_cls(name="cmd", help="The *cmd*."))
+        ctx = click.Context(cmd, info_name="cmd", color=True)
+        assert "The \x1b[" in cmd.get_help(ctx)
+
+
+class TestParserSettings:
+    def test_cached(self) -> None:
+        assert formatter.parser_settings(2) is formatter.parser_settings(2)
+        assert formatter.parser_settings(2).report_level == 2
+        assert formatter.parser_settings(5).report_level == 5
+
+    def test_not_modified_by_parse(self) -> None:
+        settings = vars(formatter.parser_settings(formatter.QUIET_REPORT_LEVEL)).copy()
+        converter = formatter.RstToAnsiConverter("Some *text*.", BASE_URL)
+        doctree = converter.parse()
+        assert doctree.settings is not formatter.parser_settings(
+            formatter.QUIET_REPORT_LEVEL
+        )
+        assert vars(formatter.parser_settings(formatter.QUIET_REPORT_LEVEL)) == settings
@@ -0,0 +1,139 @@
+from pathlib import Path
+
+import click
+import pytest
+from click.testing import CliRunner
+from pytest_mock.plugin import MockerFixture
+
+import sphinx_click.rst_to_ansi_formatter.formatter as formatter
+from sphinx_click.rst_to_ansi_formatter import make_rst_to_ansi_formatter
+from sphinx_click.rst_to_ansi_formatter.export import export, iter_export, main
+
+BASE_URL = "https://example.github.io/example/main/"
+
+group_cls = make_rst_to_ansi_formatter(BASE_URL, group=True)
+command_cls = make_rst_to_ansi_formatter(BASE_URL)
+
+cli = group_cls(
+    name="cli",
+    help="The *main* command.\n\nExamples\n--------\n\n* One\n* Two\n",
+    params=[click.Option(["-v", "--verbose"], is_flag=True, help="Be verbose.")],
+)
+cli.add_command(command_cls(name="run", help="Run the ``thing``.\f\nHidden"))
+cli.add_command(command_cls(name="no-help"))
+cli.add_command(command_cls(name="secret", help="Secret.", hidden=True))
+cli.add_command(click.Command(name="plain", help="A plain click command."))
+
+
+class TestExport:
+    def test_files(self, tmp_path: Path) -> None:
+        paths = export(cli, tmp_path / "out")
+        names = [path.name for path in paths]
+        assert names == [
+            f"{stem}.{suffix}"
+            for stem in ("cli", "cli-no-help", "cli-run", "cli-secret")
+            for suffix in ("1", "txt", "ansi")
+        ]
+        assert all(path.parent == tmp_path / "out" for path in paths)
+
+    def test_text(self, tmp_path: Path) -> None:
+        export(cli, tmp_path, formats=("txt", "ansi"), width=60)
+        text = (tmp_path / "cli.txt").read_text()
+        assert text.startswith("Usage: cli [OPTIONS] COMMAND [ARGS]...\n\n")
+        assert "  The main command.\n" in text
+        assert "  -v, --verbose  Be verbose.\n" in text
+        assert "\x1b[" not in text
+        assert "  The \x1b[" in (tmp_path / "cli.ansi").read_text()
+        run = (tmp_path / "cli-run.txt").read_text()
+        assert run.startswith("Usage: cli run [OPTIONS]\n\n  Run the thing.\n")
+        assert "Hidden" not in run
+        assert not (tmp_path / "cli.1").exists()
+
+    def test_man_page(self, tmp_path: Path) -> None:
+        export(cli, tmp_path, formats=("man",))
+        page = (tmp_path / "cli.1").read_text()
+        assert '.TH "CLI" 1' in page
+        assert ".SH NAME\ncli \\- The main command.\n" in page
+        assert "cli [OPTIONS] COMMAND [ARGS]..." in page
+        assert "The \\fImain\\fP command." in page
+        # The sections of the help text are subsections of the description
+        assert ".SH DESCRIPTION\n" in page and ".SS Examples\n" in page
+        assert ".B \\-v, \\-\\-verbose\nBe verbose.\n" in page
+        assert ".SH COMMANDS\n" in page and ".B run\n" in page
+        assert "secret" not in page
+        no_help = (tmp_path / "cli-no-help.1").read_text()
+        assert "DESCRIPTION" not in no_help and ".SH OPTIONS\n" in no_help
+
+    def test_short_help(self, tmp_path: Path) -> None:
+        cmd = command_cls(name="short", short_help="Short.", help="Long *help*.")
+        export(cmd, tmp_path, formats=("man",))
+        assert ".SH NAME\nshort \\- Short.\n" in (tmp_path / "short.1").read_text()
+
+    def test_commands_short_help(self, tmp_path: Path) -> None:
+        group = group_cls(name="group", help="The group.")
+        group.add_command(command_cls(name="fmt", help="Format the ``code``.\n\nMore."))
+        group.add_command(click.Command(name="plain", help="A *plain* command."))
+        export(group, tmp_path, formats=("man",))
+        page = (tmp_path / "group.1").read_text()
+        # The reST markup of the subcommand's help text is removed, like in NAME
+        assert ".B fmt\nFormat the code.\n" in page
+        assert ".B plain\nA *plain* command.\n" in page
+        assert (
+            "NAME\ngroup-fmt \\- Format the code.\n"
+            in (tmp_path / "group-fmt.1").read_text()
+        )
+
+    def test_one_parse(self, tmp_path: Path, mocker: MockerFixture) -> None:
+        parse = mocker.spy(formatter.RstToAnsiConverter, "parse")
+        export(cli, tmp_path)
+        # cli, run and secret have a help text
+        assert parse.call_count == 3
+
+    def test_workers(self, tmp_path: Path) -> None:
+        paths = export(cli, tmp_path / "workers", workers=2)
+        single = export(cli, tmp_path / "single")
+        # The files are yielded in the same order as without workers
+        assert [path.name for path in paths] == [path.name for path in single]
+        for path in paths:
+            assert path.read_text() == (tmp_path / "single" / path.name).read_text()
+
+    def test_streaming(self, tmp_path: Path) -> None:
+        paths = iter_export(cli, tmp_path, formats=("txt",))
+        first = next(paths)
+        # The first file is written before the other commands are rendered
+        assert first.exists() and list(tmp_path.iterdir()) == [first]
+
+    def test_unknown_format(self, tmp_path: Path) -> None:
+        with pytest.raises(ValueError, match="pdf"):
+            export(cli, tmp_path, formats=("man", "pdf"))
+
+
+class TestMain:
+    def test_main(self, tmp_path: Path) -> None:
+        result = CliRunner().invoke(
+            main,
+            [
+                "tests.test_export:cli",
+                str(tmp_path),
+                "--format",
+                "txt",
+                "--width",
+                "60",
+            ],
+        )
+        assert result.exit_code == 0
+        assert result.output.splitlines() == [
+            str(tmp_path / f"{stem}.txt")
+            for stem in ("cli", "cli-no-help", "cli-run", "cli-secret")
+        ]
+
+    def test_unknown_command(self, tmp_path: Path) -> None:
+        result = CliRunner().invoke(main, ["tests.no_such_module:cli", str(tmp_path)])
+        assert result.exit_code == 2
+        assert "Cannot import 'tests.no_such_module:cli'" in result.output
+        assert list(tmp_path.iterdir()) == []
+
+    def test_all_formats(self, tmp_path: Path) -> None:
+        result = CliRunner().invoke(main, ["tests.test_export:cli", str(tmp_path)])
+        assert result.exit_code == 0
+        assert len(result.output.splitlines()) == 12
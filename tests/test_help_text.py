@@ -0,0 +1,128 @@
+import typing
+
+import click
+import pytest
+from click.testing import CliRunner
+
+import sphinx_click.rst_to_ansi_formatter.formatter as formatter
+
+BASE_URL = "https://example.github.io/example/main/"
+
+DOCSTRINGS = [
+    """
+    A paragraph with *emphasis* and ``code`` that is long enough to be wrapped over
+    more than a single line in the terminal.
+
+    Another paragraph, see :doc:`the history <history>`.
+
+    Heading
+    -------
+
+    * A bullet list item that is long enough to be wrapped over more than one line.
+
+      A second paragraph in the item.
+
+      #. A nested enumerated list
+      #. Second item
+
+    * Last item
+    """,
+    """
+    A definition list:
+
+    term : classifier
+        The definition of the term, with more than enough words to be wrapped.
+
+        A second paragraph of the definition.
+
+    other term
+        Another definition.
+
+    Example::
+
+        $ command --option
+        $ command --help
+    """,
+    """
+    =====  ===========
+    Name   Description
+    =====  ===========
+    a      The first
+    b      The second
+    =====  ===========
+
+    :param x: A field list.
+    :param y: Another field.
+    """,
+]
+
+
+def make_command(help_text: str | None, **kwargs: bool) -> click.Command:
+    command_cls = formatter.make_rst_to_ansi_formatter(BASE_URL)
+    return typing.cast(click.Command, command_cls(name="cli", help=help_text, **kwargs))
+
+
+def rewrapped_by_click(help_text: str) -> list[str]:
+    # The help text as it was shown before format_help_text() was overridden: The
+    # converter output with no-rewrap markers, passed through click's wrap_text()
+    text = formatter.RstToAnsiConverter(help_text, BASE_URL, monochrome=True).convert()
+    wrapped = click.wrap_text(text, 78, "  ", "  ", preserve_paragraphs=True)
+    # The marker lines are shown as empty lines
+    lines: list[str] = []
+    for line in wrapped.splitlines():
+        line = "" if line.strip() in ("", "\b") else line.rstrip()
+        if line or (lines and lines[-1]):
+            lines.append(line)
+    return lines
+
+
+class TestFormatHelpText:
+    @pytest.mark.parametrize("help_text", DOCSTRINGS)
+    def test_same_as_click(self, help_text: str) -> None:
+        with click.Context(make_command(help_text), color=False) as ctx:
+            help_lines = ctx.get_help().splitlines()
+        # Skip the usage line, and the options at the end
+        assert help_lines[2 : help_lines.index("Options:") - 1] == rewrapped_by_click(
+            help_text
+        )
+
+    def test_no_markers(self) -> None:
+        result = CliRunner().invoke(make_command(DOCSTRINGS[0]), ["--help"])
+        assert "\b" not in result.output
+
+    def test_help_is_not_modified(self) -> None:
+        cmd = make_command(DOCSTRINGS[0])
+        first = CliRunner().invoke(cmd, ["--help"]).output
+        assert cmd.help == DOCSTRINGS[0]
+        assert CliRunner().invoke(cmd, ["--help"]).output == first
+
+    def test_code_block_with_empty_line(self) -> None:
+        # The empty line in the code block is kept, and the second line of code
+        # is not rewrapped
+        cmd = make_command("Code::\n\n    first = 1\n\n    second =   2\n")
+        output = CliRunner().invoke(cmd, ["--help"]).output
+        assert "  first = 1\n\n  second =   2\n" in output
+
+    def test_code_block_with_empty_lines(self) -> None:
+        # Runs of empty lines are collapsed between blocks, but not in code blocks
+        help_text = (
+            "Code::\n\n    import os\n\n\n    def main():\n        pass\n\n"
+            "Text::\n\n    a\n\n\n\n    b\n"
+        )
+        for color in (False, True):
+            with click.Context(make_command(help_text), color=color) as ctx:
+                output = ctx.get_help()
+            assert "import os\n\n\n  def main():" in output
+            assert "a\n\n\n\n  b" in output
+            assert "\0" not in output
+            assert "\n\n\n  Text:" not in output
+
+    def test_form_feed_and_deprecated(self) -> None:
+        cmd = make_command("Shown text.\f\nHidden text.", deprecated=True)
+        output = CliRunner().invoke(cmd, ["--help"]).output
+        assert "  (Deprecated) Shown text.\n" in output
+        assert "Hidden" not in output
+
+    def test_no_help(self) -> None:
+        output = CliRunner().invoke(make_command(None), ["--help"]).output
+        assert output.startswith("Usage: ") and "Options:" in output
@@ -0,0 +1,177 @@
+import os
+import typing
+import zipfile
+from pathlib import Path
+
+import click
+import pytest
+from click.testing import CliRunner
+from pytest_mock.plugin import MockerFixture
+
+import sphinx_click.rst_to_ansi_formatter.cache as cache
+from sphinx_click.rst_to_ansi_formatter import make_rst_to_ansi_formatter
+from sphinx_click.rst_to_ansi_formatter.artifact import build_help_artifact
+from sphinx_click.rst_to_ansi_formatter.helpfile import HelpFile, HelpSource
+from sphinx_click.rst_to_ansi_formatter.lint import lint
+
+BASE_URL = "https://example.github.io/example/main/"
+
+HELP_TEXT = """Edit the ``config`` file.
+
+EXAMPLES
+========
+
+Some examples::
+
+  $ tool edit
+\f
+Hidden text.
+"""
+
+
+@pytest.fixture
+def columns() -> int:
+    return 60
+
+
+@pytest.fixture(autouse=True)
+def empty_cache_registry(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(cache, "_caches", {})
+
+
+def make_cli(help_file: HelpSource, cache_dir: Path) -> click.Group:
+    group_cls = make_rst_to_ansi_formatter(BASE_URL, group=True, cache_dir=cache_dir)
+    command_cls = make_rst_to_ansi_formatter(
+        BASE_URL, cache_dir=cache_dir, help_file=help_file, help_section=True
+    )
+    cli = group_cls(name="tool", help="The tool.")
+    cli.add_command(command_cls(name="edit"))
+    return typing.cast(click.Group, cli)
+
+
+class TestHelpFile:
+    def test_read(self, tmp_path: Path, mocker: MockerFixture) -> None:
+        path = tmp_path / "help.rst"
+        path.write_text("First version.")
+        help_file = HelpFile(path)
+        read_text = mocker.spy(Path, "read_text")
+        assert help_file.read() == "First version."
+        assert help_file.read() == "First version."
+        assert read_text.call_count == 1
+        # The file is read again when its size changes
+        path.write_text("Second version.")
+        assert help_file.read() == "Second version."
+        assert read_text.call_count == 2
+
+    def test_missing(self, tmp_path: Path) -> None:
+        help_file = HelpFile(tmp_path / "missing.rst")
+        assert help_file.read() is None
+        assert isinstance(help_file.error, FileNotFoundError)
+
+    def test_resource(self, tmp_path: Path) -> None:
+        archive = tmp_path / "package.zip"
+        with zipfile.ZipFile(archive, "w") as zf:
+            zf.writestr("help/edit.rst", "Help from a *zip* file.")
+        help_file = HelpFile(zipfile.Path(archive, "help/edit.rst"))
+        assert help_file.stamp() is None
+        assert help_file.read() == "Help from a *zip* file."
+
+
+class TestHelpFileCommand:
+    def test_lazy(self, tmp_path: Path) -> None:
+        path = tmp_path / "edit.rst"
+        # The file does not need to exist before the help is shown
+        cli = make_cli(str(path), tmp_path / "cache")
+        path.write_text(HELP_TEXT)
+        result = CliRunner().invoke(cli, ["edit", "--help"])
+        assert result.exit_code == 0
+        assert "  Edit the config file.\n\n  EXAMPLES\n" in result.output
+        assert "Hidden" not in result.output
+
+    def test_cached(self, tmp_path: Path, mocker: MockerFixture) -> None:
+        path = tmp_path / "edit.rst"
+        path.write_text(HELP_TEXT)
+        first = CliRunner().invoke(make_cli(path, tmp_path), ["edit", "--help"])
+        # A new process only needs to stat the file
+        cache._caches.clear()
+        read = mocker.spy(HelpFile, "read")
+        result = CliRunner().invoke(make_cli(path, tmp_path), ["edit", "--help"])
+        assert result.output == first.output
+        assert read.call_count == 0
+        # The file is read and converted again when it changes
+        path.write_text(HELP_TEXT.replace("config", "settings"))
+        os.utime(path, ns=(0, 0))
+        result = CliRunner().invoke(make_cli(path, tmp_path), ["edit", "--help"])
+        assert "Edit the settings file." in result.output
+
+    def test_resource(self, tmp_path: Path) -> None:
+        archive = tmp_path / "package.zip"
+        with zipfile.ZipFile(archive, "w") as zf:
+            zf.writestr("help/edit.rst", HELP_TEXT)
+        cli = make_cli(zipfile.Path(archive, "help/edit.rst"), tmp_path)
+        result = CliRunner().invoke(cli, ["edit", "--help"])
+        assert "Edit the config file." in result.output
+
+    def test_short_help(self, tmp_path: Path) -> None:
+        path = tmp_path / "edit.rst"
+        path.write_text(HELP_TEXT)
+        result = CliRunner().invoke(make_cli(path, tmp_path), ["--help"])
+        assert "  edit  Edit the ``config`` file.\n" in result.output
+
+    def test_section(self, tmp_path: Path) -> None:
+        path = tmp_path / "edit.rst"
+        path.write_text(HELP_TEXT)
+        cli = make_cli(path, tmp_path)
+        result = CliRunner().invoke(cli, ["edit", "--help-section", "examples"])
+        assert result.output == "EXAMPLES\n\nSome examples:\n\n$ tool edit\n"
+
+    def test_missing_file(self, tmp_path: Path) -> None:
+        path = tmp_path / "edit.rst"
+        path.write_text(HELP_TEXT)
+        cli = make_cli(path, tmp_path)
+        assert CliRunner().invoke(cli, ["edit", "--help"]).exit_code == 0
+        path.unlink()
+        # The help is shown without the help text of the file
+        result = CliRunner().invoke(cli, ["edit", "--help"])
+        assert result.exit_code == 0
+        assert result.output.startswith("Usage: tool edit [OPTIONS]\n\nOptions:\n")
+        result = CliRunner().invoke(cli, ["--help"])
+        assert result.exit_code == 0
+        assert "  edit\n" in result.output
+        # Or with the help attribute, if the command has one
+        cli.commands["edit"].help = "The *fallback* help."
+        result = CliRunner().invoke(cli, ["edit", "--help"])
+        assert "  The fallback help.\n" in result.output
+        result = CliRunner().invoke(cli, ["--help"])
+        assert "  edit  The *fallback* help.\n" in result.output
+        (diagnostic,) = lint(cli)
+        assert diagnostic.command_path == "tool edit"
+        assert diagnostic.message.startswith("Cannot read the help file: [Errno 2]")
+
+    def test_unreadable_file(self, tmp_path: Path) -> None:
+        # A directory has a modification time and size, but cannot be read
+        path = tmp_path / "edit.rst"
+        path.mkdir()
+        result = CliRunner().invoke(make_cli(path, tmp_path), ["edit", "--help"])
+        assert result.exit_code == 0
+        assert result.output.startswith("Usage: tool edit [OPTIONS]\n\nOptions:\n")
+
+    def test_missing_resource(self, tmp_path: Path) -> None:
+        archive = tmp_path / "package.zip"
+        with zipfile.ZipFile(archive, "w") as zf:
+            zf.writestr("help/other.rst", HELP_TEXT)
+        cli = make_cli(zipfile.Path(archive, "help/edit.rst"), tmp_path)
+        result = CliRunner().invoke(cli, ["edit", "--help"])
+        assert result.exit_code == 0
+        assert "Edit" not in result.output
+
+    def test_lint_and_artifact(self, tmp_path: Path) -> None:
+        path = tmp_path / "edit.rst"
+        path.write_text("* Item\nNo blank line\n")
+        cli = make_cli(path, tmp_path)
+        assert [d.command_path for d in lint(cli)] == ["tool edit"]
+        # The help file is not included in the artifact, it has its own cache
+        assert build_help_artifact(cli, tmp_path / "help.bin", widths=(60,)) == 2
+        # Commands without help text are not linted
+        no_help = make_rst_to_ansi_formatter(BASE_URL)(name="no-help")
+        assert lint(typing.cast(click.Command, no_help)) == []
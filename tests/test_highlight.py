@@ -0,0 +1,161 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from pytest_mock.plugin import MockerFixture
+
+import sphinx_click.rst_to_ansi_formatter.formatter as formatter
+import sphinx_click.rst_to_ansi_formatter.cache as cache
+from sphinx_click.rst_to_ansi_formatter.cache import HelpCache, get_cache
+from sphinx_click.rst_to_ansi_formatter.colors import Colors
+from sphinx_click.rst_to_ansi_formatter.highlight import Highlighter
+
+BASE_URL = "https://example.github.io/example/main/"
+CODE = 'def hello():\n    print("Hello, world!")'
+
+
+class TestHelpCache:
+    def test_memory_and_disk(self, tmp_path: Path) -> None:
+        cache = HelpCache(tmp_path)
+        key = HelpCache.make_key("a", "b")
+        assert cache.get(key) is None
+        cache.set(key, "value")
+        assert cache.get(key) == "value"
+        # A new cache with the same directory finds the value on disk
+        assert HelpCache(tmp_path).get(key) == "value"
+
+    def test_package_version(self, mocker: MockerFixture) -> None:
+        key = HelpCache.make_key("a", "b")
+        mocker.patch.object(cache, "package_version", return_value="99.0")
+        # Values cached by another version of this package are not used
+        assert HelpCache.make_key("a", "b") != key
+
+    def test_distribution_version(self) -> None:
+        assert cache.distribution_version("pytest") == pytest.__version__
+        assert cache.distribution_version("no-such-distribution") == "unknown"
+
+    def test_memory_only(self) -> None:
+        cache = HelpCache(None)
+        cache.set("key", "value")
+        assert cache.get("key") == "value"
+        assert cache.get("other") is None
+
+    def test_eviction(self) -> None:
+        cache = HelpCache(None, max_entries=2)
+        for key in ("a", "b", "c"):
+            cache.set(key, key)
+        assert list(cache.memory) == ["b", "c"]
+
+    def test_eviction_from_threads(self) -> None:
+        cache = HelpCache(None, max_entries=8)
+
+        def fill(thread: int) -> None:
+            for i in range(1000):
+                cache.set(f"{thread}-{i}", "value")
+
+        with ThreadPoolExecutor(4) as executor:
+            list(executor.map(fill, range(4)))
+        assert len(cache.memory) == 8
+
+    def test_unwritable_directory(self, tmp_path: Path) -> None:
+        not_a_directory = tmp_path / "file"
+        not_a_directory.write_text("")
+        cache = HelpCache(not_a_directory)
+        cache.set("key", "value")
+        assert cache.get("key") == "value"
+
+    def test_failed_write_removes_temporary_file(
+        self, tmp_path: Path, mocker: MockerFixture
+    ) -> None:
+        mocker.patch("os.replace", side_effect=OSError("replace failed"))
+        cache = HelpCache(tmp_path)
+        cache.set("key", "value")
+        assert cache.get("key") == "value"
+        assert list(tmp_path.iterdir()) == []
+
+    def test_failed_write_reraises(self, tmp_path: Path, mocker: MockerFixture) -> None:
+        mocker.patch("os.replace", side_effect=OSError("replace failed"))
+        mocker.patch("os.unlink", side_effect=OSError("unlink failed"))
+        with pytest.raises(OSError, match="replace failed"):
+            cache.write_atomic(tmp_path / "key", b"value")
+
+    def test_get_cache_shared(self, tmp_path: Path) -> None:
+        assert get_cache(tmp_path) is get_cache(tmp_path)
+        assert get_cache(tmp_path).directory == tmp_path / "help"
+
+
+class TestHighlighter:
+    def test_highlight_cached(self, tmp_path: Path) -> None:
+        highlighter = Highlighter("dark", HelpCache(tmp_path))
+        result = highlighter.highlight(CODE, "python")
+        assert result is not None
+        assert "\x1b[" in result
+        key = HelpCache.make_key(
+            "highlight", cache.distribution_version("pygments"), "python", "dark", CODE
+        )
+        assert HelpCache(tmp_path).get(key) == result
+
+    def test_pygments_version(self, tmp_path: Path, mocker: MockerFixture) -> None:
+        highlighter = Highlighter("dark", HelpCache(tmp_path))
+        highlighter.cache.set(
+            HelpCache.make_key(
+                "highlight",
+                cache.distribution_version("pygments"),
+                "python",
+                "dark",
+                CODE,
+            ),
+            "stale",
+        )
+        assert highlighter.highlight(CODE, "python") == "stale"
+        mocker.patch(
+            "sphinx_click.rst_to_ansi_formatter.highlight.distribution_version",
+            return_value="0.0",
+        )
+        assert highlighter.highlight(CODE, "python") != "stale"
+
+    def test_unknown_language(self) -> None:
+        highlighter = Highlighter("dark", HelpCache(None))
+        assert highlighter.highlight(CODE, "no-such-language") is None
+
+    def test_pygments_not_installed(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setitem(sys.modules, "pygments", None)
+        highlighter = Highlighter("dark", HelpCache(None))
+        assert highlighter.highlight(CODE, "python") is None
+
+
+class TestHighlightedLiteralBlocks:
+    docstring = f"""
+    Example code block:
+
+    .. code-block:: python
+
+        {CODE.replace(chr(10), chr(10) + 8 * " ")}
+
+    Shell example::
+
+        $ hello
+    """
+
+    def test_highlight(self, colors: Colors, tmp_path: Path) -> None:
+        converter = formatter.RstToAnsiConverter(
+            self.docstring, BASE_URL, highlight=True, cache_dir=tmp_path
+        )
+        converted_text = converter.convert()
+        expected = Highlighter("dark", HelpCache(None)).highlight(CODE, "python")
+        assert expected is not None
+        assert expected in converted_text
+        # Literal blocks without a language still use the code color
+        assert colors.color_code("$ hello") in converted_text
+
+    def test_no_highlight_when_monochrome(self, tmp_path: Path) -> None:
+        converter = formatter.RstToAnsiConverter(
+            self.docstring,
+            BASE_URL,
+            monochrome=True,
+            highlight=True,
+            cache_dir=tmp_path,
+        )
+        assert converter.highlighter is None
+        assert "\x1b" not in converter.convert()
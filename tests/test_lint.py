@@ -0,0 +1,88 @@
+import click
+import pytest
+from click.testing import CliRunner
+
+import sphinx_click.rst_to_ansi_formatter.formatter as formatter
+from sphinx_click.rst_to_ansi_formatter import make_rst_to_ansi_formatter
+from sphinx_click.rst_to_ansi_formatter.lint import Diagnostic, lint, load_command, main
+
+BASE_URL = "https://example.github.io/example/main/"
+
+group_cls = make_rst_to_ansi_formatter(BASE_URL, group=True)
+command_cls = make_rst_to_ansi_formatter(BASE_URL)
+
+bad_cli = group_cls(name="cli", help="A list:\n\n3. Starts at three\n4. Four\n")
+bad_cli.add_command(
+    command_cls(name="sub", help="Some text\n\n* Item\nNo blank line\n")
+)
+bad_cli.add_command(click.Command(name="plain", help="* Not reST\nat all"))
+good_cli = command_cls(name="good", help="A *valid* help text.")
+not_a_command = "A string"
+
+
+class TestLint:
+    def test_lint(self) -> None:
+        assert lint(bad_cli) == [
+            Diagnostic(
+                "cli sub",
+                4,
+                2,
+                "Bullet list ends without a blank line; unexpected unindent.",
+            )
+        ]
+        diagnostics = lint(bad_cli, report_level=1)
+        assert [str(diagnostic) for diagnostic in diagnostics] == [
+            'cli:3: INFO: Enumerated list start value not ordinal-1: "3" (ordinal 3)',
+            "cli sub:4: WARNING: Bullet list ends without a blank line; "
+            "unexpected unindent.",
+        ]
+
+    def test_help_is_quiet(self, capsys: pytest.CaptureFixture[str]) -> None:
+        # The help text does not contain the messages, and nothing is written to stderr
+        converter = formatter.RstToAnsiConverter(
+            "3. Three\n4. Four\n\n* Item\nText\n", BASE_URL, monochrome=True
+        )
+        assert "ordinal" not in converter.convert()
+        assert capsys.readouterr().err == ""
+
+    def test_system_message_is_skipped(self) -> None:
+        converter = formatter.RstToAnsiConverter(
+            "* Item\nText\n", BASE_URL, monochrome=True
+        )
+        # Messages at or above the report level are included in the document tree,
+        # but are not rendered
+        doctree = converter.parse(report_level=1)
+        assert "unexpected unindent" in doctree.astext()
+        assert "unexpected unindent" not in converter.render(doctree)
+
+    def test_load_command(self) -> None:
+        assert load_command("tests.test_lint:good_cli") is good_cli
+        with pytest.raises(click.BadParameter, match="MODULE:ATTRIBUTE"):
+            load_command("tests.test_lint")
+        with pytest.raises(click.BadParameter, match="not a click command"):
+            load_command("tests.test_lint:not_a_command")
+        with pytest.raises(click.BadParameter, match="No module named"):
+            load_command("tests.no_such_module:cli")
+        with pytest.raises(click.BadParameter, match="has no attribute"):
+            load_command("tests.test_lint:no_such_cli")
+
+
+class TestLintCommand:
+    def test_problems(self) -> None:
+        result = CliRunner().invoke(main, ["tests.test_lint:bad_cli"])
+        assert result.exit_code == 1
+        assert result.output.startswith("cli sub:4: WARNING: Bullet list ends")
+        result = CliRunner().invoke(
+            main, ["--level", "info", "tests.test_lint:bad_cli"]
+        )
+        assert len(result.output.splitlines()) == 2
+
+    def test_unknown_command(self) -> None:
+        result = CliRunner().invoke(main, ["tests.test_lint:no_such_cli"])
+        assert result.exit_code == 2
+        assert "Cannot import 'tests.test_lint:no_such_cli'" in result.output
+
+    def test_no_problems(self) -> None:
+        result = CliRunner().invoke(main, ["tests.test_lint:good_cli"])
+        assert result.exit_code == 0
+        assert result.output == ""
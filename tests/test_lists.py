@@ -0,0 +1,101 @@
+from pathlib import Path
+
+import pytest
+
+import sphinx_click.rst_to_ansi_formatter.formatter as formatter
+
+BASE_URL = "https://example.github.io/example/main/"
+
+
+@pytest.fixture
+def columns() -> int:
+    return 50
+
+
+def convert(docstring: str) -> str:
+    converter = formatter.RstToAnsiConverter(docstring, BASE_URL, monochrome=True)
+    return converter.convert()
+
+
+class TestNestedLists:
+    def test_nested_lists(self) -> None:
+        docstring = """
+        * First item with a fairly long text that will be wrapped.
+
+          Second paragraph of the first item.
+
+          * Nested item with a long text that will be wrapped too.
+          * Nested item
+
+            #. Enumerated
+            #. Enumerated
+
+        * Last item.
+        """
+        assert convert(docstring) == (
+            "\b\n"
+            "• First item with a fairly long text that will\n"
+            "  be wrapped.\n"
+            "\n"
+            "\b\n"
+            "  Second paragraph of the first item.\n"
+            "  ◦ Nested item with a long text that will be\n"
+            "    wrapped too.\n"
+            "  ◦ Nested item\n"
+            "    1. Enumerated\n"
+            "    2. Enumerated\n"
+            "• Last item."
+        )
+
+    def test_item_without_paragraph(self) -> None:
+        docstring = """
+        *
+          ::
+
+            code
+        """
+        assert convert(docstring) == "\b\n•\n\n\n\b\n  code"
+
+    def test_deep_nesting(self) -> None:
+        # The indentation of deeply nested lists may be wider than the terminal
+        docstring = "\n" + "\n".join(f"{' ' * 2 * i}* level {i}\n" for i in range(40))
+        lines = convert(docstring).splitlines()
+        assert lines[-1] == " " * 78 + "• level 39"
+
+
+class TestStoredOutput:
+    @pytest.mark.parametrize("monochrome, suffix", [(True, ".txt"), (False, ".ansi")])
+    def test_nested_lists(
+        self, tests_assets_path: Path, monochrome: bool, suffix: str
+    ) -> None:
+        # Changes to the visitor must not change the output, see bench_lists.py
+        docstring = (tests_assets_path / "nested_lists.rst").read_text(encoding="utf-8")
+        converter = formatter.RstToAnsiConverter(
+            docstring, BASE_URL, monochrome=monochrome
+        )
+        expected = (tests_assets_path / f"nested_lists{suffix}").read_text(
+            encoding="utf-8"
+        )
+        assert converter.convert() + "\n" == expected
+
+
+class TestEnumeratedLists:
+    @pytest.mark.parametrize(
+        "docstring, expected",
+        [
+            ("1. one\n2. two", "1. one\n2. two"),
+            ("(a) one\n(b) two", "(a) one\n(b) two"),
+            ("A) one\nB) two", "A) one\nB) two"),
+            ("i. one\nii. two", "i.  one\nii. two"),
+            ("IV. four\nV. five", "IV. four\nV.  five"),
+            ("9. nine\n10. ten", "9.  nine\n10. ten"),
+        ],
+    )
+    def test_enumerators(self, docstring: str, expected: str) -> None:
+        # Skip the info message about the start value of the list
+        assert convert(docstring).startswith("\b\n" + expected)
+
+    def test_format_enumerator(self) -> None:
+        assert formatter.format_enumerator(1994, "upperroman") == "MCMXCIV"
+        assert formatter.format_enumerator(27, "loweralpha") == "27"
+        assert formatter.format_enumerator(3, "arabic") == "3"
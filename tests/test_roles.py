@@ -0,0 +1,171 @@
+import os
+import zlib
+from pathlib import Path
+
+import pytest
+
+import sphinx_click.rst_to_ansi_formatter.formatter as formatter
+from sphinx_click.rst_to_ansi_formatter.cache import default_cache_dir
+from sphinx_click.rst_to_ansi_formatter.inventory import (
+    Inventory,
+    get_inventory,
+    read_inventory,
+)
+from sphinx_click.rst_to_ansi_formatter.roles import RoleResolver
+
+BASE_URL = "https://example.github.io/example/main/"
+
+
+@pytest.fixture
+def resolver(inventory_path: Path, tmp_path: Path) -> RoleResolver:
+    return RoleResolver(BASE_URL, Inventory(inventory_path, tmp_path / "cache"))
+
+
+class TestRoleResolver:
+    def test_python_roles(self, resolver: RoleResolver) -> None:
+        result = resolver.resolve(
+            "Call :func:`mypkg.run` or :meth:`~mypkg.Runner.start` on :class:`mypkg.Runner`."
+        )
+        assert result == (
+            f"Call ``mypkg.run()`` *{BASE_URL}api.html#mypkg.run* or "
+            f"``start()`` *{BASE_URL}api.html#mypkg.Runner.start* on "
+            f"``mypkg.Runner`` *{BASE_URL}api.html#mypkg.Runner*."
+        )
+
+    def test_ref_role(self, resolver: RoleResolver) -> None:
+        result = resolver.resolve(
+            "See :ref:`installation` and :ref:`here <Installation>`."
+        )
+        assert result == (
+            f'See "Installing the package" *{BASE_URL}install.html#installation* and '
+            f'"here" *{BASE_URL}install.html#installation*.'
+        )
+
+    def test_option_role(self, resolver: RoleResolver) -> None:
+        result = resolver.resolve(":option:`mycli --verbose`")
+        assert (
+            result
+            == f"``mycli --verbose`` *{BASE_URL}cli.html#cmdoption-mycli-verbose*"
+        )
+
+    def test_doc_role(self, resolver: RoleResolver) -> None:
+        result = resolver.resolve(":doc:`/usage` and :doc:`the guide <guide>`")
+        assert (
+            result == f'*{BASE_URL}usage.html* and "the guide" *{BASE_URL}guide.html*'
+        )
+
+    def test_unresolved_roles(self, resolver: RoleResolver) -> None:
+        result = resolver.resolve(
+            ":func:`missing` :ref:`no-label` :class:`!mypkg.Runner` :ref:`text <x>`"
+        )
+        assert result == "``missing()`` no-label ``mypkg.Runner`` text"
+
+    def test_unknown_roles_untouched(self, resolver: RoleResolver) -> None:
+        docstring = ":c:func:`printf` and :emphasis:`text` and :sub:`2`"
+        assert resolver.resolve(docstring) == docstring
+
+    def test_without_inventory(self) -> None:
+        resolver = RoleResolver(BASE_URL)
+        assert resolver.resolve(":py:func:`mypkg.run`") == "``mypkg.run()``"
+
+
+class TestInventory:
+    def test_index_created_lazily(self, inventory_path: Path, tmp_path: Path) -> None:
+        cache_dir = tmp_path / "cache"
+        inventory = Inventory(inventory_path, cache_dir)
+        assert not cache_dir.exists()
+        assert inventory.lookup("std:doc", "index") == ("index.html", "Welcome")
+        assert inventory.index_path().exists()
+
+    def test_index_reused(self, inventory_path: Path, tmp_path: Path) -> None:
+        cache_dir = tmp_path / "cache"
+        Inventory(inventory_path, cache_dir).lookup("std:doc", "index")
+        index_path = Inventory(inventory_path, cache_dir).index_path()
+        mtime = index_path.stat().st_mtime_ns
+        inventory = Inventory(inventory_path, cache_dir)
+        assert inventory.lookup("py:function", "mypkg.run") is not None
+        assert index_path.stat().st_mtime_ns == mtime
+
+    def test_index_rebuilt_on_change(
+        self, inventory_path: Path, tmp_path: Path
+    ) -> None:
+        cache_dir = tmp_path / "cache"
+        old_index_path = Inventory(inventory_path, cache_dir).index_path()
+        data = inventory_path.read_bytes()
+        inventory_path.write_bytes(data)
+        stat = inventory_path.stat()
+        os.utime(inventory_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert Inventory(inventory_path, cache_dir).index_path() != old_index_path
+
+    def test_unwritable_cache_dir(self, inventory_path: Path, tmp_path: Path) -> None:
+        not_a_directory = tmp_path / "file"
+        not_a_directory.write_text("")
+        inventory = Inventory(inventory_path, not_a_directory)
+        assert inventory.lookup("std:doc", "index") == ("index.html", "Welcome")
+        assert isinstance(inventory.index, bytes)
+
+    def test_lookup_all_entries(self, inventory_path: Path, tmp_path: Path) -> None:
+        inventory = Inventory(inventory_path, tmp_path / "cache")
+        for objtype, name, uri, dispname in read_inventory(inventory_path.read_bytes()):
+            assert inventory.lookup(objtype, name) == (uri, dispname)
+        assert inventory.lookup("py:function", "aaa") is None
+        assert inventory.lookup("py:function", "zzz") is None
+
+    def test_missing_inventory(self, tmp_path: Path) -> None:
+        inventory = Inventory(tmp_path / "missing.inv", tmp_path / "cache")
+        assert inventory.lookup("std:doc", "index") is None
+
+    def test_invalid_inventory(self, tmp_path: Path) -> None:
+        path = tmp_path / "objects.inv"
+        path.write_bytes(b"# Sphinx inventory version 1\n")
+        with pytest.raises(ValueError):
+            read_inventory(path.read_bytes())
+        path.write_bytes(b"# Sphinx inventory version 2\n#\n#\n# plain text\nx\n")
+        with pytest.raises(ValueError):
+            read_inventory(path.read_bytes())
+        assert Inventory(path, tmp_path / "cache").lookup("std:doc", "index") is None
+
+    def test_invalid_lines_skipped(self, tmp_path: Path) -> None:
+        header = b"# Sphinx inventory version 2\n#\n#\n# zlib\n"
+        body = b"no-match\nname nodomain 1 a.html -\nempty std:doc 1 e.html -\n"
+        path = tmp_path / "objects.inv"
+        path.write_bytes(header + zlib.compress(body))
+        assert read_inventory(path.read_bytes()) == [
+            ("std:doc", "empty", "e.html", "empty")
+        ]
+
+    def test_empty_inventory(self, tmp_path: Path) -> None:
+        path = tmp_path / "objects.inv"
+        path.write_bytes(
+            b"# Sphinx inventory version 2\n#\n#\n# zlib\n" + zlib.compress(b"")
+        )
+        assert Inventory(path, tmp_path / "cache").lookup("std:doc", "index") is None
+
+    def test_get_inventory_shared(self, inventory_path: Path) -> None:
+        assert get_inventory(inventory_path) is get_inventory(inventory_path)
+
+    def test_default_cache_dir(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+        assert default_cache_dir().parent == tmp_path
+        assert Inventory(tmp_path / "objects.inv", None).cache_dir.parent == tmp_path
+
+
+class TestConverterRoles:
+    def test_roles_in_help(self, inventory_path: Path, tmp_path: Path) -> None:
+        docstring = """
+        Use :func:`mypkg.run` to start, see :ref:`installation`.
+        """
+        converter = formatter.RstToAnsiConverter(
+            docstring,
+            BASE_URL,
+            monochrome=True,
+            inventory=inventory_path,
+            cache_dir=tmp_path / "cache",
+        )
+        converted_text = converter.convert()
+        assert 'Use mypkg.run() [1] to start, see "Installing the package" [2].' in (
+            converted_text
+        )
+        assert f"2. {BASE_URL}install.html#installation" in converted_text
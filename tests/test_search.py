@@ -0,0 +1,131 @@
+import typing
+from pathlib import Path
+
+import click
+import pytest
+from click.testing import CliRunner
+from pytest_mock.plugin import MockerFixture
+
+import sphinx_click.rst_to_ansi_formatter.cache as cache
+from sphinx_click.rst_to_ansi_formatter import make_rst_to_ansi_formatter
+from sphinx_click.rst_to_ansi_formatter.colors import Colors
+from sphinx_click.rst_to_ansi_formatter.search import (
+    SearchIndex,
+    format_hits,
+    get_search_index,
+)
+from sphinx_click.rst_to_ansi_formatter.sections import split_sections
+
+BASE_URL = "https://example.github.io/example/main/"
+
+
+@pytest.fixture(autouse=True)
+def empty_cache_registry(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(cache, "_caches", {})
+
+
+def make_cli(cache_dir: Path, help_search: bool = True) -> click.Group:
+    group_cls = make_rst_to_ansi_formatter(
+        BASE_URL, group=True, cache_dir=cache_dir, help_search=help_search
+    )
+    command_cls = make_rst_to_ansi_formatter(BASE_URL, cache_dir=cache_dir)
+    cli = group_cls(
+        name="cli",
+        help="Main tool.\n\nEXAMPLES\n========\n\nRun ``cli edit`` to open the editor.\n",
+    )
+    cli.add_command(
+        command_cls(
+            name="edit",
+            help="Edit files in your *editor*.\n\n"
+            "ENVIRONMENT\n===========\n\nEDITOR\n    The editor to use.\n"
+            "\f\nHidden text\n",
+        )
+    )
+    cli.add_command(command_cls(name="no-help"))
+    cli.add_command(click.Command(name="plain", help="A plain editor command."))
+    return typing.cast(click.Group, cli)
+
+
+class TestSplitSections:
+    def test_split_sections(self) -> None:
+        text = "Intro.\n\nAA\n==\n\na text\n\nBB\n--\n\nb text\n"
+        assert split_sections(text) == [
+            ("", "Intro."),
+            ("AA", "AA\n==\n\na text"),
+            ("BB", "BB\n--\n\nb text"),
+        ]
+        assert split_sections("AA\n==\n\ntext") == [("AA", "AA\n==\n\ntext")]
+
+
+class TestSearchIndex:
+    def test_search(self, tmp_path: Path) -> None:
+        index = SearchIndex.build(make_cli(tmp_path))
+        hits = index.search("edit")
+        # "edit" also matches "editor" and "Edit"
+        assert [(hit.command_path, hit.section) for hit in hits] == [
+            ("cli", "EXAMPLES"),
+            ("cli edit", ""),
+            ("cli edit", "ENVIRONMENT"),
+        ]
+        assert hits[0].score == 2
+        assert hits[0].lines == ["Run cli edit to open the editor."]
+        # All terms must match
+        assert [hit.section for hit in index.search("editor use")] == ["ENVIRONMENT"]
+        assert index.search("editor missing") == []
+        assert index.search("hidden") == []
+        assert index.search("  ") == []
+        assert len(index.search("edit", limit=1)) == 1
+
+    def test_json(self, tmp_path: Path) -> None:
+        index = SearchIndex.build(make_cli(tmp_path))
+        loaded = SearchIndex.from_json(index.to_json())
+        assert loaded.sections == index.sections
+        assert loaded.postings == index.postings
+        assert loaded.search("editor") == index.search("editor")
+
+    def test_persisted(self, tmp_path: Path, mocker: MockerFixture) -> None:
+        index = get_search_index(make_cli(tmp_path))
+        # A new process only loads the index from the cache directory
+        cache._caches.clear()
+        build = mocker.patch.object(SearchIndex, "build")
+        assert get_search_index(make_cli(tmp_path)).sections == index.sections
+        build.assert_not_called()
+
+    def test_format_hits(self, tmp_path: Path, colors: Colors) -> None:
+        hits = SearchIndex.build(make_cli(tmp_path)).search("open")
+        assert format_hits(hits, "open", colors) == (
+            colors.color_heading("cli (EXAMPLES)")
+            + "\n  Run cli edit to "
+            + colors.color_url("open")
+            + " the editor."
+        )
+
+
+class TestHelpSearchCommand:
+    def test_search(self, tmp_path: Path) -> None:
+        result = CliRunner().invoke(
+            make_cli(tmp_path), ["help-search", "editor", "use"]
+        )
+        assert result.exit_code == 0
+        assert (
+            result.output == "cli edit (ENVIRONMENT)\n  EDITOR\n  The editor to use.\n"
+        )
+
+    def test_no_hits(self, tmp_path: Path) -> None:
+        result = CliRunner().invoke(make_cli(tmp_path), ["help-search", "missing"])
+        assert result.output == "No help text matches 'missing'.\n"
+
+    def test_colors(
+        self, tmp_path: Path, colors: Colors, mocker: MockerFixture
+    ) -> None:
+        mocker.patch(
+            "sphinx_click.rst_to_ansi_formatter.search.colors_enabled",
+            return_value=True,
+        )
+        result = CliRunner().invoke(
+            make_cli(tmp_path), ["help-search", "use"], color=True
+        )
+        assert colors.color_url("use") in result.output
+
+    def test_not_added(self, tmp_path: Path) -> None:
+        assert "help-search" not in make_cli(tmp_path, help_search=False).commands
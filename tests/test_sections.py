@@ -0,0 +1,117 @@
+import typing
+
+import click
+import pytest
+from click.testing import CliRunner
+from pytest_mock.plugin import MockerFixture
+
+from sphinx_click.rst_to_ansi_formatter import make_rst_to_ansi_formatter
+from sphinx_click.rst_to_ansi_formatter.formatter import FormatHelpMixin
+from sphinx_click.rst_to_ansi_formatter.sections import find_section, section_titles
+
+BASE_URL = "https://example.github.io/example/main/"
+
+HELP_TEXT = """``tool`` does things.
+
+    EXAMPLES
+    ========
+
+    Some examples, see :doc:`usage` ::
+
+      $ tool --help
+      -------------
+
+    Advanced
+    --------
+
+    More examples.
+
+    ENVIRONMENT
+    ===========
+
+    TOOL_HOME
+        The home directory.
+    """
+
+
+@pytest.fixture
+def columns() -> int:
+    return 60
+
+
+def make_command(help_section: bool = True) -> click.Command:
+    command_cls = make_rst_to_ansi_formatter(BASE_URL, help_section=help_section)
+    return typing.cast(click.Command, command_cls(name="tool", help=HELP_TEXT))
+
+
+class TestFindSection:
+    text = (
+        "Intro.\n\nFIRST\n=====\n\ntext\n"
+        "Not a title\n-----------\n\n"
+        "Sub\n---\n\nsub text\n\n"
+        "=====\nOVER\n=====\n\nover text\n\n"
+        "SECOND\n======\n\nlast\n"
+    )
+
+    def test_section_titles(self) -> None:
+        assert section_titles(self.text) == ["FIRST", "Sub", "OVER", "SECOND"]
+
+    def test_find_section(self) -> None:
+        assert find_section(self.text, "second") == "SECOND\n======\n\nlast"
+        # The overlined title is a different style, i.e. a subsection of "Sub"
+        sub = typing.cast(str, find_section(self.text, "Sub"))
+        assert sub.startswith("Sub\n---\n") and sub.endswith("over text")
+        first = typing.cast(str, find_section(self.text, "FIRST"))
+        assert "Not a title" in first and "SECOND" not in first
+        assert find_section(self.text, "missing") is None
+
+
+class TestHelpSectionOption:
+    def test_show_section(self, mocker: MockerFixture) -> None:
+        convert = mocker.spy(FormatHelpMixin, "convert_help")
+        result = CliRunner().invoke(make_command(), ["--help-section", "examples"])
+        assert result.exit_code == 0
+        assert result.output == (
+            "EXAMPLES\n"
+            "\n"
+            "Some examples, see [1]\n"
+            "\n"
+            "$ tool --help\n"
+            "-------------\n"
+            "\n"
+            "Advanced\n"
+            "\n"
+            "More examples.\n"
+            "\n"
+            "Referenced URLs:\n"
+            "\n"
+            "1. https://example.github.io/example/main/usage.html\n"
+        )
+        # Only the section was converted
+        assert "ENVIRONMENT" not in convert.call_args.args[1]
+
+    def test_missing_section(self) -> None:
+        result = CliRunner().invoke(make_command(), ["--help-section", "files"])
+        assert result.exit_code == 2
+        assert "Sections: EXAMPLES, Advanced, ENVIRONMENT." in result.output
+
+    def test_no_sections(self) -> None:
+        command_cls = make_rst_to_ansi_formatter(BASE_URL, help_section=True)
+        cmd = typing.cast(click.Command, command_cls(name="tool"))
+        result = CliRunner().invoke(cmd, ["--help-section", "files"])
+        assert "Sections: none." in result.output
+
+    def test_help_lists_option(self) -> None:
+        result = CliRunner().invoke(make_command(), ["--help"])
+        assert "--help-section NAME" in result.output
+        assert "TOOL_HOME" in result.output
+        result = CliRunner().invoke(make_command(help_section=False), ["--help"])
+        assert "--help-section" not in result.output
+
+    def test_resilient_parsing(self) -> None:
+        # E.g. shell completion, the option must not show the section and exit
+        cmd = make_command()
+        ctx = cmd.make_context(
+            "tool", ["--help-section", "examples"], resilient_parsing=True
+        )
+        assert ctx.command is cmd
@@ -0,0 +1,172 @@
+import io
+import os
+import time
+import typing
+from pathlib import Path
+
+import click
+import pytest
+from pytest_mock.plugin import MockerFixture
+from sphinx.application import Sphinx
+from sphinx.util.docutils import docutils_namespace
+
+from sphinx_click.rst_to_ansi_formatter import make_rst_to_ansi_formatter
+from sphinx_click.rst_to_ansi_formatter.formatter import FormatHelpMixin
+from sphinx_click.rst_to_ansi_formatter.sphinxext import (
+    PreviewEntry,
+    get_preview_docs,
+    get_previews,
+    merge_info,
+)
+
+BASE_URL = "https://example.github.io/example/main/"
+
+group_cls = make_rst_to_ansi_formatter(BASE_URL, group=True)
+command_cls = make_rst_to_ansi_formatter(BASE_URL)
+cli = typing.cast(
+    click.Group, group_cls(name="cli", help="The *main* command, see :doc:`usage`.")
+)
+cli.add_command(command_cls(name="sub", help="The ``sub`` command."))
+cli.add_command(command_cls(name="no-help"))
+cli.add_command(click.Command(name="plain", help="A plain command."))
+not_a_command = "A string"
+
+
+def build(src: Path, parallel: int = 0) -> tuple[Sphinx, str]:
+    warnings = io.StringIO()
+    # Each build registers the Sphinx nodes and directives with docutils again, the
+    # namespace removes them after the build
+    with docutils_namespace():
+        app = Sphinx(
+            str(src),
+            str(src),
+            str(src / "_build" / "text"),
+            str(src / "_build" / "doctrees"),
+            "text",
+            status=None,
+            warning=warnings,
+            parallel=parallel,
+        )
+        app.build()
+    return app, warnings.getvalue()
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    (tmp_path / "conf.py").write_text(
+        'extensions = ["sphinx_click.rst_to_ansi_formatter.sphinxext"]\n'
+    )
+    (tmp_path / "index.rst").write_text(
+        "Index\n=====\n\n"
+        ".. click-help-preview:: tests.test_sphinxext:cli\n"
+        "   :width: 40\n\n"
+        ".. click-help-preview:: tests.test_sphinxext:cli\n"
+        "   :nested:\n"
+    )
+    return tmp_path
+
+
+def read_output(project: Path, docname: str = "index") -> str:
+    return (project / "_build" / "text" / f"{docname}.txt").read_text()
+
+
+class TestClickHelpPreview:
+    def test_build(self, project: Path) -> None:
+        app, warnings = build(project)
+        assert warnings == ""
+        output = read_output(project)
+        assert "The main command, see [1]." in output
+        assert "Referenced URLs:" in output
+        assert "cli sub" in output and "The sub command." in output
+        assert "plain" not in output
+        # The help text of cli is parsed once, and converted for both widths
+        previews = get_previews(app.env)
+        assert len(previews) == 2
+        assert all(entry.docnames == {"index"} for entry in previews.values())
+        assert sorted(len(entry.rendered) for entry in previews.values()) == [1, 2]
+
+    def test_ansi(self, project: Path) -> None:
+        (project / "index.rst").write_text(
+            ".. click-help-preview:: tests.test_sphinxext:cli\n   :ansi:\n"
+        )
+        build(project)
+        assert "\x1b[" in read_output(project)
+
+    def test_bad_command(self, project: Path) -> None:
+        (project / "index.rst").write_text(
+            ".. click-help-preview:: tests.test_sphinxext:not_a_command\n\n"
+            ".. click-help-preview:: tests.test_sphinxext:missing\n"
+        )
+        _, warnings = build(project)
+        assert "not a click command" in warnings
+        assert "has no attribute 'missing'" in warnings
+
+    def test_incremental(self, project: Path, mocker: MockerFixture) -> None:
+        build(project)
+        # A changed document is read again by Sphinx anyway
+        index = project / "index.rst"
+        index.write_text(index.read_text() + "\nChanged.\n")
+        os.utime(index, (time.time() + 10, time.time() + 10))
+        build(project)
+        assert "Changed." in read_output(project)
+        # Nothing has changed, so no documents are read and nothing is converted
+        parse = mocker.spy(FormatHelpMixin, "make_converter")
+        app, _ = build(project)
+        assert parse.call_count == 0
+        # When the help text of a command changes, the documents that show it are
+        # read again, and only the changed help text is converted
+        sub_cmd = cli.commands["sub"]
+        old_help = sub_cmd.help
+        sub_cmd.help = "The changed ``sub`` command."
+        try:
+            app, _ = build(project)
+        finally:
+            sub_cmd.help = old_help
+        assert "The changed sub command." in read_output(project)
+        assert parse.call_count == 2
+        # The entry of the old help text is removed
+        assert len(get_previews(app.env)) == 2
+
+    def test_removed_command(self, project: Path, mocker: MockerFixture) -> None:
+        build(project)
+        (project / "other.rst").write_text("Other\n=====\n")
+        mocker.patch(
+            "sphinx_click.rst_to_ansi_formatter.sphinxext.load_command",
+            side_effect=click.BadParameter("No module"),
+        )
+        # The document is read again, and now reports the missing command
+        _, warnings = build(project)
+        assert "Cannot load the click command" in warnings
+
+    def test_parallel(self, project: Path) -> None:
+        for i in range(8):
+            (project / f"doc{i}.rst").write_text(
+                f":orphan:\n\nDoc {i}\n=====\n\n"
+                ".. click-help-preview:: tests.test_sphinxext:cli\n"
+            )
+        app, warnings = build(project, parallel=2)
+        assert warnings == ""
+        assert "The main command" in read_output(project, "doc7")
+        docnames = set().union(*(e.docnames for e in get_previews(app.env).values()))
+        assert {f"doc{i}" for i in range(8)} <= docnames
+
+
+class TestMergeInfo:
+    def test_merge(self, project: Path) -> None:
+        app, _ = build(project)
+        env = app.env
+        other = typing.cast(typing.Any, type("Env", (), {})())
+        key = next(iter(get_previews(env)))
+        entry = PreviewEntry(get_previews(env)[key].doctree)
+        entry.rendered[(True, 100)] = "Wide"
+        entry.docnames = {"other"}
+        new_entry = PreviewEntry(get_previews(env)[key].doctree)
+        new_entry.docnames = {"other"}
+        get_previews(other).update({key: entry, "new": new_entry})
+        get_preview_docs(other)["other"] = [("tests.test_sphinxext:cli", False, [key])]
+        merge_info(app, env, {"other", "unrelated"}, other)
+        assert get_previews(env)[key].rendered[(True, 100)] == "Wide"
+        assert "other" in get_previews(env)[key].docnames
+        assert get_previews(env)["new"] is new_entry
+        assert "other" in get_preview_docs(env)
+        assert "unrelated" not in get_preview_docs(env)
@@ -0,0 +1,184 @@
+import pytest
+
+import sphinx_click.rst_to_ansi_formatter.formatter as formatter
+from sphinx_click.rst_to_ansi_formatter.colors import Colors
+
+BASE_URL = "https://example.github.io/example/main/"
+
+
+@pytest.fixture
+def columns() -> int:
+    return 50
+
+
+def convert(docstring: str, monochrome: bool = True) -> str:
+    converter = formatter.RstToAnsiConverter(docstring, BASE_URL, monochrome=monochrome)
+    return converter.convert()
+
+
+class TestTables:
+    def test_simple_table(self) -> None:
+        docstring = """
+        =====  ====================================================
+        Name   Description
+        =====  ====================================================
+        foo    The foo value, which has a long description that is
+               wrapped in the column.
+        bar    ``bar``
+        =====  ====================================================
+        """
+        assert convert(docstring) == (
+            "\b\n"
+            "Name  Description\n"
+            "----  ------------------------------------------\n"
+            "foo   The foo value, which has a long\n"
+            "      description that is wrapped in the column.\n"
+            "bar   bar"
+        )
+
+    def test_header_colors(self, colors: Colors) -> None:
+        docstring = """
+        ===  =======
+        \\    Heading
+        ===  =======
+        a    b
+        ===  =======
+        """
+        converted_text = convert(docstring, monochrome=False)
+        assert colors.color_heading("Heading") in converted_text
+        assert colors.color_heading("") not in converted_text
+
+    def test_grid_table_with_spans(self) -> None:
+        docstring = """
+        .. table:: The title
+
+           +------------+------------+
+           | Header 1   | Header 2   |
+           +============+============+
+           | spans both columns and  |
+           | is long enough to wrap  |
+           +------------+------------+
+           | row span   | a          |
+           |            +------------+
+           |            | b          |
+           +------------+------------+
+        """
+        assert convert(docstring) == (
+            "\b\n"
+            "The title\n"
+            "\n"
+            "\b\n"
+            "Header 1  Header 2\n"
+            "--------  --------\n"
+            "spans both columns\n"
+            "and is long enough\n"
+            "to wrap\n"
+            "row span  a\n"
+            "          b"
+        )
+
+    def test_block_content_in_cells(self) -> None:
+        docstring = """
+        +------------+-------------+
+        | Paragraph  | * item 1    |
+        |            | * item 2    |
+        | Another    |             |
+        +------------+-------------+
+        | ::         | text        |
+        |            |             |
+        |   code     |             |
+        +------------+-------------+
+        """
+        assert convert(docstring) == (
+            "\b\nParagraph Another  • item 1 • item 2\ncode               text"
+        )
+
+    def test_many_rows(self) -> None:
+        rows = "\n".join(f"        {'row' + str(i):<6}  value {i}" for i in range(1000))
+        docstring = f"""
+        ======  ==========
+        {rows.lstrip()}
+        ======  ==========
+        """
+        lines = convert(docstring).splitlines()
+        assert len(lines) == 1001
+        assert lines[-1] == "row999  value 999"
+
+    def test_wide_characters(self) -> None:
+        # East Asian wide characters use two columns, also when the cell is wrapped
+        docstring = """
+        =====  ==========================================
+        Name   Description
+        =====  ==========================================
+        foo    日本語 の 説明 は 一 行 に 収まらない ので 折り返す 必要 が あります
+        bar    短い
+        =====  ==========================================
+        """
+        converter = formatter.RstToAnsiConverter(
+            docstring, BASE_URL, monochrome=True, width=40
+        )
+        assert converter.convert() == (
+            "\b\n"
+            "Name  Description\n"
+            "----  --------------------------------\n"
+            "foo   日本語 の 説明 は 一 行 に\n"
+            "      収まらない ので 折り返す 必要 が\n"
+            "      あります\n"
+            "bar   短い"
+        )
+
+
+class TestDefinitionLists:
+    def test_definition_list(self) -> None:
+        docstring = """
+        term 1
+            Definition of *term* 1, which is a long paragraph that is wrapped.
+
+            Second paragraph.
+        term 2 : classifier
+            Definition 2.
+
+            * a list item
+
+            ::
+
+                code
+        """
+        assert convert(docstring) == (
+            "\b\n"
+            "term 1\n"
+            "    Definition of term 1, which is a long\n"
+            "    paragraph that is wrapped.\n"
+            "\n"
+            "\b\n"
+            "    Second paragraph.\n"
+            "term 2 : classifier\n"
+            "    Definition 2.\n"
+            "\n"
+            "\n"
+            "\b\n"
+            "    • a list item\n"
+            "\n"
+            "\n"
+            "\b\n"
+            "    code"
+        )
+
+
+class TestFieldLists:
+    def test_field_list(self) -> None:
+        docstring = """
+        Some fields:
+
+        :param x: The x value.
+        :returns: Something that is fairly long to describe, so it wraps.
+        """
+        assert convert(docstring) == (
+            "\b\n"
+            "Some fields:\n"
+            "\n"
+            "\b\n"
+            "param x:  The x value.\n"
+            "returns:  Something that is fairly long to\n"
+            "          describe, so it wraps."
+        )
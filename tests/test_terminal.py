@@ -0,0 +1,137 @@
+import os
+import signal
+import threading
+import typing
+from collections.abc import Iterator
+
+import click
+import pytest
+from click.testing import CliRunner
+from pytest_mock.plugin import MockerFixture
+
+import sphinx_click.rst_to_ansi_formatter.terminal as terminal
+from sphinx_click.rst_to_ansi_formatter import make_rst_to_ansi_formatter
+from sphinx_click.rst_to_ansi_formatter.formatter import FormatHelpMixin
+from sphinx_click.rst_to_ansi_formatter.terminal import help_width, terminal_width
+from sphinx_click.rst_to_ansi_formatter.warm import warm
+
+BASE_URL = "https://example.github.io/example/main/"
+HELP = " ".join(f"word{i}" for i in range(40))
+
+command_cls = make_rst_to_ansi_formatter(BASE_URL)
+
+
+@pytest.fixture
+def sigwinch_handler(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    # Install the handler again in the test, and restore the original handler after
+    monkeypatch.setattr(terminal, "_handler_installed", False)
+    original = signal.getsignal(signal.SIGWINCH)
+    yield
+    signal.signal(signal.SIGWINCH, original)
+
+
+def line_lengths(text: str) -> list[int]:
+    return [len(line) for line in text.splitlines()]
+
+
+class TestTerminalWidth:
+    def test_cached(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("COLUMNS", "90")
+        assert terminal_width() == 90
+        monkeypatch.setenv("COLUMNS", "120")
+        assert terminal_width() == 90
+        terminal.invalidate_terminal_width()
+        assert terminal_width() == 120
+
+    @pytest.mark.usefixtures("sigwinch_handler")
+    def test_resize(
+        self, monkeypatch: pytest.MonkeyPatch, mocker: MockerFixture
+    ) -> None:
+        previous = mocker.Mock()
+        signal.signal(signal.SIGWINCH, previous)
+        monkeypatch.setenv("COLUMNS", "90")
+        assert terminal_width() == 90
+        monkeypatch.setenv("COLUMNS", "100")
+        os.kill(os.getpid(), signal.SIGWINCH)
+        assert terminal_width() == 100
+        # The handler that was installed before is still called
+        previous.assert_called_once()
+
+    @pytest.mark.usefixtures("sigwinch_handler")
+    def test_other_thread(self) -> None:
+        thread = threading.Thread(target=terminal_width)
+        thread.start()
+        thread.join()
+        # The handler can only be installed by the main thread
+        assert not terminal._handler_installed
+        terminal_width()
+        assert terminal._handler_installed
+
+
+class TestHelpWidth:
+    def make_context(self, **settings: typing.Any) -> click.Context:
+        return click.Context(command_cls(name="cmd"), **settings)
+
+    def test_terminal(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("COLUMNS", "87")
+        # The width of the terminal is rounded down to the width bucket
+        assert help_width(self.make_context()) == 80
+        # The width of the context is used as given, like by click
+        assert help_width(self.make_context(max_content_width=65)) == 65
+        assert help_width(self.make_context(max_content_width=100)) == 80
+
+    def test_context(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("COLUMNS", "87")
+        assert help_width(self.make_context(terminal_width=120)) == 120
+        assert help_width(self.make_context(terminal_width=59)) == 59
+        assert (
+            help_width(self.make_context(terminal_width=120, max_content_width=70))
+            == 70
+        )
+        # The settings are inherited from the parent context
+        parent = self.make_context(terminal_width=45)
+        assert help_width(click.Context(command_cls(name="sub"), parent=parent)) == 45
+
+    def test_help_text(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("COLUMNS", "200")
+        cmd = command_cls(
+            name="cmd", help=HELP, context_settings={"max_content_width": 50}
+        )
+        result = CliRunner().invoke(cmd, ["--help"])
+        help_text = result.output.split("\n\n")[1]
+        assert max(line_lengths(help_text)) <= 50
+        assert max(line_lengths(help_text)) > 40
+
+    def test_same_width_as_click(self) -> None:
+        # The help text is wrapped at the width of the context, like the options
+        cmd = command_cls(
+            name="cmd",
+            help=HELP,
+            params=[click.Option(["--opt"], help=HELP)],
+            context_settings={"terminal_width": 59},
+        )
+        result = CliRunner().invoke(cmd, ["--help"])
+        help_text, options = result.output.split("\n\n")[1:3]
+        # Rounded down to the width bucket, the lines would be at most 50 columns
+        assert 50 < max(line_lengths(help_text)) <= 59
+        assert 50 < max(line_lengths(options)) <= 59
+
+    def test_one_column_difference(
+        self, monkeypatch: pytest.MonkeyPatch, mocker: MockerFixture
+    ) -> None:
+        cmd = typing.cast(click.Command, command_cls(name="cmd", help=HELP))
+        convert = mocker.spy(FormatHelpMixin, "convert_help")
+        for columns in ("81", "82", "89", "80"):
+            monkeypatch.setenv("COLUMNS", columns)
+            terminal.invalidate_terminal_width()
+            cmd.get_help(click.Context(cmd, color=False))
+        convert.assert_called_once()
+
+    def test_warm(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("COLUMNS", "87")
+        cmd = command_cls(name="cmd", help=HELP)
+        handle = warm(cmd, widths=(64, 66, 90), monochrome=(True,), background=False)
+        assert handle.total == 2
+        assert sorted(width for _, _, width in cmd.converted) == [60, 90]
+        warm(cmd, monochrome=(True,), background=False)
+        assert sorted(width for _, _, width in cmd.converted) == [60, 80, 90]
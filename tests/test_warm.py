@@ -0,0 +1,94 @@
+import threading
+import typing
+
+import click
+import pytest
+from click.testing import CliRunner
+from pytest_mock.plugin import MockerFixture
+
+from sphinx_click.rst_to_ansi_formatter import make_rst_to_ansi_formatter
+from sphinx_click.rst_to_ansi_formatter.formatter import FormatHelpMixin
+from sphinx_click.rst_to_ansi_formatter.warm import warm
+
+BASE_URL = "https://example.github.io/example/main/"
+
+
+@pytest.fixture
+def columns() -> int:
+    return 70
+
+
+def make_cli() -> click.Group:
+    group_cls = make_rst_to_ansi_formatter(BASE_URL, group=True)
+    command_cls = make_rst_to_ansi_formatter(BASE_URL)
+    cli = group_cls(name="cli", help="The *main* command.")
+    cli.add_command(command_cls(name="first", help="The ``first`` command.\f\nHidden"))
+    cli.add_command(command_cls(name="second", help="The ``second`` command."))
+    cli.add_command(command_cls(name="no-help"))
+    cli.add_command(click.Command(name="plain", help="A plain click command."))
+    return typing.cast(click.Group, cli)
+
+
+def cache_size(cli: click.Group) -> int:
+    commands = [cli, *cli.commands.values()]
+    return sum(
+        len(cmd.converted) for cmd in commands if isinstance(cmd, FormatHelpMixin)
+    )
+
+
+class TestWarm:
+    def test_foreground(self, mocker: MockerFixture) -> None:
+        cli = make_cli()
+        progress = mocker.Mock()
+        handle = warm(cli, background=False, progress=progress)
+        assert handle.wait()
+        # 3 commands with help, colored and monochrome, for the terminal width
+        assert handle.done == handle.total == 6
+        assert cache_size(cli) == 6
+        assert progress.call_args_list[0] == mocker.call(1, 6, "cli")
+        assert progress.call_args_list[-1] == mocker.call(6, 6, "cli second")
+
+    def test_help_uses_cache(self, mocker: MockerFixture) -> None:
+        cli = make_cli()
+        warm(cli, widths=(70,), monochrome=(True,), background=False)
+        convert = mocker.patch.object(FormatHelpMixin, "convert_help")
+        result = CliRunner().invoke(cli, ["first", "--help"])
+        assert "  The first command.\n" in result.output
+        convert.assert_not_called()
+
+    def test_background(self) -> None:
+        cli = make_cli()
+        handle = warm(cli, widths=(60, 80))
+        assert handle.thread is not None and handle.thread.daemon
+        assert handle.wait(timeout=30)
+        assert handle.done == 12
+        assert cache_size(cli) == 12
+
+    def test_cancel(self) -> None:
+        cli = make_cli()
+        started = threading.Event()
+        resume = threading.Event()
+
+        def progress(done: int, total: int, command_path: str) -> None:
+            started.set()
+            resume.wait(timeout=30)
+
+        handle = warm(cli, progress=progress)
+        assert started.wait(timeout=30)
+        handle.cancel()
+        resume.set()
+        assert handle.wait(timeout=30)
+        assert handle.done == 1
+
+    def test_budget(self) -> None:
+        handle = warm(make_cli(), background=False, budget=0)
+        assert handle.done == 0
+
+    def test_bounded(self) -> None:
+        cmd = make_rst_to_ansi_formatter(BASE_URL)(name="cmd", help="The *help*.")
+        widths = tuple(range(10, 400, 10))
+        warm(cmd, widths=widths, monochrome=(True,), background=False)
+        # The converted help text of the first widths was evicted
+        assert [width for _, _, width in cmd.converted] == list(
+            widths[-FormatHelpMixin.MAX_CONVERTED :]
+        )